@@ -0,0 +1,307 @@
+# VSCode MultiData by Adam Natad
+# Benchmarks for the config / model / launch-argv hot paths and the profile table refresh.
+# Plain timeit, no extra packages; results go to JSON so runs can be compared across commits:
+#   python bench/bench.py --out before.json
+#   python bench/bench.py --out after.json --compare before.json
+# A stub "code" executable stands in for VS Code. The GUI benchmarks need a display: DISPLAY,
+# or Xvfb on PATH (started on a free display number for the run); otherwise they are skipped.
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core import (  # noqa: E402
+    ConfigManager,
+    Profile,
+    build_launch_args,
+    spawn_vscode,
+    split_args,
+    vscode_candidates,
+)
+
+DEFAULT_SIZES = (10, 1000, 10000)
+REPEATS = 5
+GROUPS = ("config", "args", "launch", "gui")
+
+
+# --- Fixtures ---
+
+def write_stub_code(folder: str) -> str:
+    """Executable that exits at once, in place of VS Code."""
+    if platform.system() == "Windows":
+        path = os.path.join(folder, "code.cmd")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("@exit /b 0\r\n")
+    else:
+        path = os.path.join(folder, "code")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("#!/bin/sh\nexit 0\n")
+        os.chmod(path, 0o755)
+    return path
+
+
+def write_config(path: str, base_dir: str, vscode: str, n: int) -> None:
+    """config.ini with n profiles laid out like Auto-Fill (a few pinned to the stub)."""
+    lines = [
+        "[app]",
+        f"vscode_path = {vscode}",
+        f"base_dir = {base_dir}",
+        "open_new_window = 1",
+        "reuse_existing_window = 0",
+        "extra_args = --disable-gpu --log=warn",
+        "theme = Dark",
+        "ui_scale = Auto",
+        "",
+        "[profiles]",
+    ]
+    for i in range(n):
+        folder = os.path.join(base_dir, f"Code{i}")
+        value = f"{os.path.join(folder, 'user-data')}|{os.path.join(folder, 'extensions')}"
+        if i % 10 == 0:
+            value += f"|{vscode}"
+        lines.append(f"code{i} = {value}")
+    lines += ["", "[launch_sets]", "first = code0, code1", ""]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+# --- Timing ---
+
+def measure(fn, repeats: int = REPEATS) -> dict:
+    """Per-call seconds: min / median over `repeats` runs of an autoranged loop (>= 0.2 s each)."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    runs = [t / loops for t in timer.repeat(repeat=repeats, number=loops)]
+    return {"loops": loops, "min_s": min(runs), "median_s": statistics.median(runs)}
+
+
+class Bench:
+    def __init__(self, repeats: int):
+        self.repeats = repeats
+        self.results: dict[str, dict] = {}
+
+    def run(self, name: str, fn) -> None:
+        r = measure(fn, repeats=self.repeats)
+        self.results[name] = r
+        print(f"{name:<40} {r['median_s'] * 1e6:>12.1f} us  (min {r['min_s'] * 1e6:.1f}, x{r['loops']})", flush=True)
+
+    def skip(self, name: str, reason: str) -> None:
+        self.results[name] = {"skipped": reason}
+        print(f"{name:<40} skipped: {reason}", flush=True)
+
+
+# --- Groups ---
+
+def bench_config(b: Bench, tmp: str, vscode: str, sizes) -> None:
+    for n in sizes:
+        path = os.path.join(tmp, f"config-{n}.ini")
+        write_config(path, os.path.join(tmp, "base"), vscode, n)
+        cm = ConfigManager(path)
+        cm.load(detect=False)
+        b.run(f"config.load[{n}]", lambda: ConfigManager(path).load(detect=False))
+
+        def save() -> None:
+            cm.dirty = True  # save() is a no-op otherwise
+            cm.save()
+
+        b.run(f"config.save[{n}]", save)
+        b.run(f"config.save_unchanged[{n}]", cm.save)
+        b.run(f"config.get_profiles[{n}]", cm.get_profiles)
+        last = f"code{n - 1}"
+        b.run(f"config.get_profile[{n}]", lambda: cm.get_profile(last))
+        toggle = [False]
+
+        def upsert() -> None:
+            p = cm.get_profile(last)
+            toggle[0] = not toggle[0]
+            cm.upsert_profile(Profile(p.name, p.user_data, p.extensions, vscode if toggle[0] else ""))
+
+        b.run(f"config.upsert_profile[{n}]", upsert)
+
+
+def bench_args(b: Bench) -> None:
+    b.run("split_args.empty", lambda: split_args(""))
+    b.run("split_args.short", lambda: split_args("--disable-gpu --log=warn"))
+    long = " ".join(f'--flag{i}="value {i}"' for i in range(50))
+    b.run("split_args.long", lambda: split_args(long))
+    b.run("vscode_candidates", vscode_candidates)
+
+
+def bench_launch(b: Bench, tmp: str, vscode: str) -> None:
+    base = os.path.join(tmp, "launch")
+    p = Profile("code1", os.path.join(base, "user-data"), os.path.join(base, "extensions"))
+    extra = "--disable-gpu --log=warn"
+    b.run("launch.build_args", lambda: build_launch_args(vscode, p, True, False, extra))
+    b.run("launch.build_args.folder", lambda: build_launch_args(vscode, p, True, False, extra, folder=tmp))
+    b.run("launch.build_args.running", lambda: build_launch_args(vscode, p, True, False, extra, running=True))
+    argv = build_launch_args(vscode, p, True, False, extra)
+    b.run("launch.spawn_stub", lambda: spawn_vscode(argv).wait())
+
+
+def _start_display() -> tuple[subprocess.Popen | None, str]:
+    """A display for Tk: the current one, or a private Xvfb. Returns (process to stop, reason if none)."""
+    if platform.system() != "Linux" or os.environ.get("DISPLAY"):
+        return None, ""
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        return None, "no DISPLAY and Xvfb not on PATH"
+    for num in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{num}"):
+            continue
+        proc = subprocess.Popen([xvfb, f":{num}", "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{num}"):
+                os.environ["DISPLAY"] = f":{num}"
+                return proc, ""
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+        proc.kill()
+    return None, "could not start Xvfb"
+
+
+def bench_gui(b: Bench, tmp: str, vscode: str, sizes) -> None:
+    names = [f"gui.refresh_list.{kind}[{n}]" for n in sizes for kind in ("full", "noop", "one_edit")]
+    xvfb, reason = _start_display()
+    if reason:
+        for name in names:
+            b.skip(name, reason)
+        return
+    try:
+        import gui
+        # keep the App away from the real config next to the sources
+        boot = os.path.join(tmp, "gui-config.ini")
+        write_config(boot, os.path.join(tmp, "base"), vscode, 1)
+        gui.config_path = lambda: boot
+        app = gui.App()
+        app.withdraw()  # never mapped: no deferred startup (install scan, disk usage, watchers)
+        try:
+            for n in sizes:
+                path = os.path.join(tmp, f"gui-{n}.ini")
+                write_config(path, os.path.join(tmp, "base"), vscode, n)
+                app.cm = ConfigManager(path)
+                app.cm.load(detect=False)
+
+                def drain() -> None:
+                    while app._fill_job:
+                        app.update()
+                    app.update_idletasks()
+
+                def full() -> None:
+                    children = app.tree.get_children()
+                    if children:
+                        app.tree.delete(*children)
+                    app._refresh_list()
+                    drain()
+
+                def noop() -> None:
+                    app._refresh_list()
+                    drain()
+
+                last = app.cm.get_profiles()[-1]
+                toggle = [False]
+
+                def one_edit() -> None:
+                    toggle[0] = not toggle[0]
+                    app.cm.upsert_profile(Profile(last.name, last.user_data, last.extensions, vscode if toggle[0] else ""))
+                    app._refresh_list()
+                    drain()
+
+                b.run(f"gui.refresh_list.full[{n}]", full)
+                b.run(f"gui.refresh_list.noop[{n}]", noop)
+                b.run(f"gui.refresh_list.one_edit[{n}]", one_edit)
+        finally:
+            app.tasks.shutdown()
+            app.destroy()
+    except Exception as e:  # no usable Tk (e.g. display refused): record it instead of failing the run
+        for name in names:
+            if name not in b.results:
+                b.skip(name, f"{type(e).__name__}: {e}")
+    finally:
+        if xvfb is not None:
+            xvfb.kill()
+
+
+# --- Output ---
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        old = json.load(f).get("results", {})
+    print(f"\nvs {baseline_path} (median, new / old):")
+    for name, r in results.items():
+        o = old.get(name)
+        if "median_s" in r and o and "median_s" in o and o["median_s"] > 0:
+            ratio = r["median_s"] / o["median_s"]
+            flag = "  slower" if ratio > 1.1 else ("  faster" if ratio < 0.9 else "")
+            print(f"{name:<40} {ratio:>6.2f}x{flag}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="VSCode MultiData benchmarks")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", metavar="JSON", help="print ratios against an earlier results file")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="profile counts (default 10,1000,10000)")
+    ap.add_argument("--only", default=",".join(GROUPS), help=f"groups to run: {','.join(GROUPS)}")
+    ap.add_argument("--repeat", type=int, default=REPEATS, help=f"timing runs per benchmark (default {REPEATS})")
+    args = ap.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    groups = {g.strip() for g in args.only.split(",") if g.strip()}
+    unknown = groups - set(GROUPS)
+    if unknown:
+        ap.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+
+    b = Bench(max(1, args.repeat))
+    with tempfile.TemporaryDirectory(prefix="vscodemd-bench-") as tmp:
+        vscode = write_stub_code(tmp)
+        if "config" in groups:
+            bench_config(b, tmp, vscode, sizes)
+        if "args" in groups:
+            bench_args(b)
+        if "launch" in groups:
+            bench_launch(b, tmp, vscode)
+        if "gui" in groups:
+            bench_gui(b, tmp, vscode, sizes)
+
+    doc = {
+        "commit": git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "results": b.results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        compare(b.results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# VSCode MultiData by Adam Natad
+# Extension activation cost: which installed extensions are likely to slow a profile's startup.
+# Built on the extension inventory (activationEvents, main, contributes from package.json) plus
+# the main bundle's size and the extension's file count, measured on a thread pool and cached
+# per extension folder (installed folders are versioned, so the package.json stat is the key).
+# The estimate is a rough relative figure for ranking, not a measurement. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import Profile, cache_dir, human_bytes, load_json, save_json
+from inventory import ExtensionInfo, Inventory, ProfileInventory
+
+MEASURE_WORKERS = 8
+CACHE_VERSION = 1
+MAX_COUNT = 50_000            # stop counting files past this (the extension is unbundled either way)
+UNBUNDLED_FILES = 1000        # more files than this: shipped without a bundler (node_modules, out/**)
+
+# Startup weight of an activation event: "*" activates before the window is usable,
+# onStartupFinished right after it, workspaceContains during startup when the folder matches.
+WEIGHTS = {"*": 1.0, "onStartupFinished": 0.5}
+WORKSPACE_WEIGHT = 0.25
+PARSE_BYTES_PER_MS = 20_000   # loading + compiling the main bundle (~20 MB/s)
+REQUIRE_MS_PER_FILE = 0.05    # resolving and reading each module of an unbundled extension
+MANIFEST_MS = 0.5             # every extension's manifest is read and validated at startup
+CONTRIBUTION_MS = 0.1         # per contribution point (commands, views, grammars, ...)
+
+
+def cache_path() -> str:
+    return os.path.join(cache_dir(), "extension-costs.json")
+
+
+def _resolve_main(ext_dir: str, main: str) -> str | None:
+    """The file Node would load for "main" (extension optional, directory -> index.js)."""
+    if not main:
+        return None
+    base = os.path.normpath(os.path.join(ext_dir, main))
+    for cand in (base, base + ".js", os.path.join(base, "index.js")):
+        if os.path.isfile(cand):
+            return cand
+    return None
+
+
+def _pkg_key(ext_dir: str) -> list[int] | None:
+    try:
+        st = os.stat(os.path.join(ext_dir, "package.json"))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def measure(ext_dir: str, main: str) -> dict:
+    """main bundle bytes (-1: missing), total files and .js files under the extension folder."""
+    path = _resolve_main(ext_dir, main)
+    try:
+        main_bytes = os.path.getsize(path) if path else (-1 if main else 0)
+    except OSError:
+        main_bytes = -1
+    files = js_files = 0
+    stack = [ext_dir]
+    while stack and files < MAX_COUNT:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            stack.append(e.path)
+                        elif e.is_file(follow_symlinks=False):
+                            files += 1
+                            if e.name.endswith((".js", ".cjs", ".mjs")):
+                                js_files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return {"main_bytes": main_bytes, "files": files, "js_files": js_files}
+
+
+class ExtensionCost:
+    def __init__(self, info: ExtensionInfo, m: dict):
+        self.id = info.id
+        self.version = info.version
+        self.main_bytes: int = m["main_bytes"]
+        self.files: int = m["files"]
+        self.js_files: int = m["js_files"]
+        self.contributes = len(info.contributes)
+        self.unbundled = self.files > UNBUNDLED_FILES
+        self.trigger, self.weight = self._activation(info)
+        self.cost_ms = self._estimate()
+
+    @staticmethod
+    def _activation(info: ExtensionInfo) -> tuple[str, float]:
+        """(label, weight). No main / browser: declarative (themes, grammars, snippets), never activated."""
+        if not info.main and not info.browser:
+            return "declarative", 0.0
+        best, label = 0.0, "on demand"
+        for ev in info.activation_events:
+            w = WEIGHTS.get(ev, WORKSPACE_WEIGHT if ev.startswith("workspaceContains:") else 0.0)
+            if w > best:
+                best, label = w, ev
+        return label, best
+
+    def _estimate(self) -> float:
+        ms = MANIFEST_MS + CONTRIBUTION_MS * self.contributes
+        if self.weight:
+            load = max(self.main_bytes, 0) / PARSE_BYTES_PER_MS
+            if self.unbundled:
+                load += REQUIRE_MS_PER_FILE * self.js_files
+            ms += self.weight * load
+        return ms
+
+    def flags(self) -> list[str]:
+        out = []
+        if self.trigger == "*":
+            out.append("activates on *")
+        elif self.trigger == "onStartupFinished":
+            out.append("activates on startup finished")
+        if self.unbundled:
+            out.append(f"unbundled ({self.files}{'+' if self.files >= MAX_COUNT else ''} files)")
+        if self.main_bytes < 0:
+            out.append("main missing")
+        return out
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.id, "version": self.version, "activation": self.trigger, "weight": self.weight,
+            "main_bytes": self.main_bytes, "files": self.files, "js_files": self.js_files,
+            "contributes": self.contributes, "cost_ms": round(self.cost_ms, 1), "flags": self.flags(),
+        }
+
+    def describe(self) -> str:
+        size = human_bytes(self.main_bytes) if self.main_bytes > 0 else "-"
+        flags = self.flags()
+        return f"{self.id} {self.version}: ~{self.cost_ms:.0f} ms (main {size})" + (f", {', '.join(flags)}" if flags else "")
+
+
+class ProfileCost:
+    def __init__(self, name: str, costs: list[ExtensionCost]):
+        self.name = name
+        self.extensions = sorted(costs, key=lambda c: c.cost_ms, reverse=True)
+        self.total_ms = sum(c.cost_ms for c in costs)
+        self.eager = sum(1 for c in costs if c.trigger == "*")
+        self.startup_finished = sum(1 for c in costs if c.trigger == "onStartupFinished")
+        self.unbundled = sum(1 for c in costs if c.unbundled)
+
+    def label(self) -> str:
+        """Table cell: estimate plus the count of '*' activators."""
+        if not self.extensions:
+            return ""
+        return f"~{self.total_ms:.0f} ms" + (f" · {self.eager} eager" if self.eager else "")
+
+    def to_json(self) -> dict:
+        return {
+            "profile": self.name, "cost_ms": round(self.total_ms, 1), "eager": self.eager,
+            "startup_finished": self.startup_finished, "unbundled": self.unbundled,
+            "extensions": [c.to_json() for c in self.extensions],
+        }
+
+    def describe(self) -> str:
+        return (f"{self.name}: ~{self.total_ms:.0f} ms across {len(self.extensions)} extensions "
+                f"({self.eager} on *, {self.startup_finished} on startup finished, {self.unbundled} unbundled)")
+
+    def lines(self, top: int = 10) -> list[str]:
+        out = [self.describe()]
+        out += [f"  {c.describe()}" for c in self.extensions[:top] if c.weight or c.unbundled]
+        return out
+
+
+class CostAnalyzer:
+    """Per-extension measurements cached by package.json stat; the inventory supplies the metadata."""
+
+    def __init__(self, inventory: Inventory | None = None, path: str | None = None):
+        self.inventory = inventory or Inventory()
+        self.path = path or cache_path()
+        data = load_json(self.path, {})
+        ok = isinstance(data, dict) and data.get("version") == CACHE_VERSION
+        self.dirs: dict[str, dict] = data.get("dirs", {}) if ok else {}
+        self._lock = threading.Lock()
+        self.elapsed = 0.0
+
+    def analyze(
+        self,
+        profiles: list[Profile],
+        on_result: Callable[[ProfileCost], None] | None = None,
+        refresh: bool = False,
+    ) -> list[ProfileCost]:
+        """ProfileCost per profile (input order). on_result fires on this thread as each completes."""
+        t0 = time.perf_counter()
+        inventories = self.inventory.scan(profiles, refresh=refresh)
+        jobs: dict[str, tuple[str, list[int] | None]] = {}
+        keys: dict[str, list[int] | None] = {}
+        for inv in inventories:
+            for e in inv.extensions:
+                d = os.path.join(inv.root, e.dir)
+                if d in keys:
+                    continue
+                keys[d] = _pkg_key(d)
+                hit = None if refresh else self.dirs.get(d)
+                if not hit or hit.get("k") != keys[d]:
+                    jobs[d] = (e.main, keys[d])
+        fresh: dict[str, dict] = {}
+
+        def one(d: str) -> None:
+            main, k = jobs[d]
+            m = measure(d, main)
+            m["k"] = k
+            with self._lock:
+                fresh[d] = m
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=MEASURE_WORKERS, thread_name_prefix="vscodemd-activation") as pool:
+                list(pool.map(one, jobs))
+        with self._lock:
+            roots = {inv.root for inv in inventories}
+            kept = {d: m for d, m in self.dirs.items() if d in keys or os.path.dirname(d) not in roots}
+            changed = bool(fresh) or len(kept) != len(self.dirs)  # measured, or removed extensions dropped
+            self.dirs = {**kept, **fresh}
+            data = {"version": CACHE_VERSION, "dirs": dict(self.dirs)}
+        if changed:
+            try:
+                save_json(self.path, data)
+            except OSError:
+                pass  # cache only
+        results = []
+        for inv in inventories:
+            pc = self._profile_cost(inv)
+            results.append(pc)
+            if on_result:
+                on_result(pc)
+        self.elapsed = time.perf_counter() - t0
+        return results
+
+    def _profile_cost(self, inv: ProfileInventory) -> ProfileCost:
+        costs = []
+        for e in inv.extensions:
+            m = self.dirs.get(os.path.join(inv.root, e.dir))
+            if m:
+                costs.append(ExtensionCost(e, m))
+        return ProfileCost(inv.name, costs)
+
+
+def ranking(results: list[ProfileCost]) -> list[ProfileCost]:
+    """Slowest estimated startup first."""
+    return sorted(results, key=lambda r: r.total_ms, reverse=True)
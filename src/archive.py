@@ -0,0 +1,483 @@
+# VSCode MultiData by Adam Natad
+# Profile export / import: one streamable archive with a profile's user-data and extensions
+# (caches and lock files left out). Files are read in 1 MB blocks and compressed in worker
+# processes a few segments ahead of the writer, so memory stays bounded whatever the file
+# sizes; every file carries a SHA-256 that import checks while writing, and a trailing
+# manifest lists them all. No tkinter here.
+#
+# Layout: MAGIC, then frames of kind (1 byte) + payload length (uint32 BE) + payload:
+#   H  header JSON (profile, source paths, file count, bytes)
+#   F  file JSON {"p": "ud/..." | "ex/...", "s": size, "m": mtime_ns, "x": mode}
+#   Z  zlib block / R stored block (incompressible)
+#   E  end of file: sha256 digest (32 bytes) + size (uint64 BE)
+#   M  manifest JSON {"files": [[path, size, sha256], ...], "bytes": total}; last frame
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import platform
+import shutil
+import struct
+import time
+import zlib
+from collections import deque
+from typing import BinaryIO, Callable
+
+from core import Profile, ensure_dir, human_bytes, is_instance_lock
+from dedup import iter_files
+from readiness import instance_alive
+from snapshots import scan_user_data, worker_pool
+
+MAGIC = b"VSCMDA\x00\x01"
+ARCHIVE_SUFFIX = ".vscmd"
+FORMAT_VERSION = 1
+BLOCK = 1024 * 1024
+SEGMENT_BYTES = 4 * 1024 * 1024   # raw bytes per worker job (small files are batched together)
+WORKERS = max(1, min(8, os.cpu_count() or 1))
+UNREADABLE = 2 ** 64 - 1          # E-frame size of a file that failed mid-read at export
+DEFAULT_LEVEL = 1                 # zlib level: throughput first; 6 packs extensions ~15% smaller
+MAX_FRAME = 2 * BLOCK             # data frames (F / Z / R / E) are never larger than one block
+MAX_META_FRAME = 256 * 1024 * 1024  # header and manifest (JSON listing every file)
+
+
+class ArchiveError(ValueError):
+    """Not an archive, truncated, or a checksum does not match."""
+
+
+# --- Frames ---
+
+def _frame(out: BinaryIO, kind: bytes, payload: bytes) -> int:
+    out.write(kind + struct.pack(">I", len(payload)))
+    out.write(payload)
+    return 5 + len(payload)
+
+def _read_exact(f: BinaryIO, n: int) -> bytes:
+    parts = []
+    while n:
+        b = f.read(n)
+        if not b:
+            raise ArchiveError("archive is truncated")
+        parts.append(b)
+        n -= len(b)
+    return b"".join(parts)
+
+def _read_frame(f: BinaryIO) -> tuple[bytes, bytes]:
+    """(kind, payload); the length is checked before anything is allocated for it."""
+    head = _read_exact(f, 5)
+    kind = head[:1]
+    (n,) = struct.unpack(">I", head[1:])
+    if n > (MAX_META_FRAME if kind in (b"H", b"M") else MAX_FRAME):
+        raise ArchiveError(f"frame {kind!r} of {n} bytes is larger than allowed (corrupt archive)")
+    return kind, _read_exact(f, n)
+
+def _compress_blocks(level: int, blocks: list[bytes]) -> list[tuple[bytes, bytes]]:
+    """Worker: (frame kind, payload) per block; blocks that do not shrink are stored."""
+    out = []
+    for b in blocks:
+        z = zlib.compress(b, level)
+        out.append((b"Z", z) if len(z) < len(b) else (b"R", b))
+    return out
+
+def _inflate_blocks(blocks: list[bytes]) -> list[bytes]:
+    """Worker: each block inflated to at most BLOCK bytes; anything bigger is an ArchiveError."""
+    out = []
+    for b in blocks:
+        d = zlib.decompressobj()
+        try:
+            raw = d.decompress(b, BLOCK + 1)
+        except zlib.error as e:
+            raise ArchiveError(f"corrupt block: {e}") from None
+        if len(raw) > BLOCK or d.unconsumed_tail:
+            raise ArchiveError(f"block inflates past {BLOCK} bytes (corrupt archive)")
+        if not d.eof:
+            raise ArchiveError("corrupt block: incomplete zlib stream")
+        out.append(raw)
+    return out
+
+def read_header(f: BinaryIO) -> dict:
+    """Check the magic and return the header; f is left at the first file frame."""
+    if _read_exact(f, len(MAGIC)) != MAGIC:
+        raise ArchiveError("not a VSCode MultiData profile archive")
+    kind, payload = _read_frame(f)
+    if kind != b"H":
+        raise ArchiveError("archive header missing")
+    header = json.loads(payload)
+    if header.get("version") != FORMAT_VERSION:
+        raise ArchiveError(f"unsupported archive version {header.get('version')}")
+    return header
+
+
+# --- Export ---
+
+class ExportReport:
+    def __init__(self, name: str):
+        self.name = name
+        self.files = 0
+        self.bytes = 0
+        self.archive_bytes = 0
+        self.live = False
+        self.cancelled = False
+        self.elapsed = 0.0
+        self.errors: list[str] = []
+
+    def throughput(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def lines(self) -> list[str]:
+        ratio = self.archive_bytes / self.bytes if self.bytes else 1.0
+        out = [
+            f"{self.name}: {self.files} files, {human_bytes(self.bytes)} in {self.elapsed:.1f} s ({human_bytes(self.throughput())}/s)",
+            f"archive {human_bytes(self.archive_bytes)} ({ratio:.0%} of the original)",
+        ]
+        if self.live:
+            out.append("exported while VS Code was running: open databases may be mid-write")
+        if self.cancelled:
+            out.append("cancelled: archive not written")
+        return out + [f"error: {e}" for e in self.errors[:20]]
+
+
+def profile_files(p: Profile) -> list[tuple[str, str, os.stat_result]]:
+    """(archive path, local path, stat): user-data without caches, extensions without lock files."""
+    files = [(f"ud/{rel}", os.path.join(p.user_data, *rel.split("/")), st) for rel, st in scan_user_data(p.user_data).items()]
+    root = os.path.abspath(p.extensions)
+    for path, st in iter_files(root):
+        if not is_instance_lock(os.path.basename(path)):
+            files.append(("ex/" + os.path.relpath(path, root).replace(os.sep, "/"), path, st))
+    return files
+
+
+def export_profile(
+    p: Profile,
+    out: BinaryIO,
+    level: int = DEFAULT_LEVEL,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> ExportReport:
+    """Stream p into out. on_progress(bytes_read, bytes_total) is called from this thread.
+    Once cancelled() turns true the archive is left without a manifest (import rejects it)."""
+    report = ExportReport(p.name)
+    t0 = time.perf_counter()
+    report.live = instance_alive(p.user_data)
+    files = profile_files(p)
+    total = sum(st.st_size for _a, _l, st in files)
+    manifest: list[list] = []
+    window = WORKERS * 2
+    pending: deque[tuple[list, object]] = deque()
+    ops: list[tuple[bytes, bytes | None]] = []  # F / D (data block, filled by the worker) / E
+    blocks: list[bytes] = []
+    seg = [0]
+    done = [0]
+
+    out.write(MAGIC)
+    report.archive_bytes += len(MAGIC)
+    report.archive_bytes += _frame(out, b"H", json.dumps({
+        "version": FORMAT_VERSION,
+        "profile": p.name,
+        "vscode": p.vscode,
+        "user_data": p.user_data,
+        "extensions": p.extensions,
+        "host": platform.node(),
+        "created": time.time(),
+        "files": len(files),
+        "bytes": total,
+    }).encode("utf-8"))
+
+    def drain(keep: int) -> None:
+        while len(pending) > keep:
+            seg_ops, fut = pending.popleft()
+            payloads = iter(fut.result())
+            for kind, value in seg_ops:
+                if kind == b"D":
+                    kind, value = next(payloads)
+                report.archive_bytes += _frame(out, kind, value)
+
+    def flush(pool) -> None:
+        nonlocal ops, blocks
+        if ops:
+            pending.append((ops, pool.submit(_compress_blocks, level, blocks)))
+            ops, blocks = [], []
+            seg[0] = 0
+            drain(window)
+
+    with worker_pool(WORKERS) as pool:
+        for arc, path, st in files:
+            if cancelled is not None and cancelled():
+                report.cancelled = True
+                break
+            h = hashlib.sha256()
+            size = 0
+            try:
+                f = open(path, "rb")
+            except OSError as e:
+                report.errors.append(f"{arc}: {e}")
+                continue
+            with f:
+                ops.append((b"F", json.dumps({"p": arc, "s": st.st_size, "m": st.st_mtime_ns, "x": st.st_mode & 0o777}).encode("utf-8")))
+                try:
+                    while True:
+                        b = f.read(BLOCK)
+                        if not b:
+                            break
+                        h.update(b)
+                        size += len(b)
+                        ops.append((b"D", None))
+                        blocks.append(b)
+                        seg[0] += len(b)
+                        if seg[0] >= SEGMENT_BYTES:
+                            flush(pool)
+                except OSError as e:
+                    # blocks already queued: close the entry as unreadable so import drops it
+                    report.errors.append(f"{arc}: {e}")
+                    ops.append((b"E", b"\0" * 32 + struct.pack(">Q", UNREADABLE)))
+                    continue
+            ops.append((b"E", h.digest() + struct.pack(">Q", size)))
+            manifest.append([arc, size, h.hexdigest()])
+            report.files += 1
+            report.bytes += size
+            done[0] += st.st_size
+            if on_progress:
+                on_progress(done[0], total)
+        flush(pool)
+        drain(0)
+    if not report.cancelled:
+        report.archive_bytes += _frame(out, b"M", json.dumps({"files": manifest, "bytes": report.bytes}).encode("utf-8"))
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def export_to_path(p: Profile, path: str, level: int = DEFAULT_LEVEL,
+                   on_progress: Callable[[int, int], None] | None = None,
+                   cancelled: Callable[[], bool] | None = None) -> ExportReport:
+    """export_profile into a temp file beside path, renamed once complete."""
+    ensure_dir(os.path.dirname(os.path.abspath(path)))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            report = export_profile(p, f, level, on_progress, cancelled)
+        if report.cancelled:
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return report
+
+
+# --- Import ---
+
+class ImportReport:
+    def __init__(self, name: str):
+        self.name = name
+        self.files = 0
+        self.bytes = 0
+        self.skipped = 0       # entries the exporter could not read
+        self.elapsed = 0.0
+
+    def throughput(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def lines(self) -> list[str]:
+        out = [f"{self.name}: {self.files} files, {human_bytes(self.bytes)} in {self.elapsed:.1f} s ({human_bytes(self.throughput())}/s), checksums verified"]
+        if self.skipped:
+            out.append(f"{self.skipped} files were unreadable at export and are missing")
+        return out
+
+
+def _target(dst: Profile, arc: str) -> str:
+    """Local path for an archive path; anything escaping the profile folders is rejected."""
+    root, _, rel = arc.partition("/")
+    parts = rel.split("/")
+    if root not in ("ud", "ex") or not rel or any(part in ("", ".", "..") or "\\" in part or ":" in part for part in parts):
+        raise ArchiveError(f"bad path in archive: {arc!r}")
+    return os.path.join(dst.user_data if root == "ud" else dst.extensions, *parts)
+
+
+def relocate_extensions_json(path: str, extensions_dir: str) -> None:
+    """Point extensions.json entries (absolute locations) at the imported extensions folder."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(entries, list):
+        return
+    for e in entries:
+        rel = e.get("relativeLocation") if isinstance(e, dict) else None
+        loc = e.get("location") if isinstance(e, dict) else None
+        if not rel or not isinstance(loc, dict) or loc.get("scheme", "file") != "file":
+            continue
+        new = os.path.abspath(os.path.join(extensions_dir, rel))
+        uri = pathlib.Path(new).as_uri()
+        loc["fsPath"] = new
+        loc["path"] = uri[len("file://"):]
+        loc.pop("_sep", None)
+        if "external" in loc:
+            loc["external"] = uri
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+    os.replace(tmp, path)
+
+
+def _created_root(path: str) -> str | None:
+    """Topmost missing folder on the way to path: what ensure_dir(path) is about to create."""
+    path = os.path.abspath(path)
+    top = None
+    while not os.path.exists(path):
+        top = path
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return top
+
+
+def _discard_import(dst: Profile, created: list[str | None]) -> None:
+    """Undo a failed import: remove the folders it created and empty the ones that were empty."""
+    for root in created:
+        if root:
+            shutil.rmtree(root, ignore_errors=True)
+    for d in (dst.user_data, dst.extensions):
+        if not os.path.isdir(d):
+            continue
+        for e in os.scandir(d):
+            if e.is_dir(follow_symlinks=False):
+                shutil.rmtree(e.path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(e.path)
+                except OSError:
+                    pass
+
+
+def import_profile(
+    src: BinaryIO,
+    dst: Profile,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> ImportReport:
+    """Unpack an archive (src positioned at its start) into dst's folders, which must be missing
+    or empty. Each file is written to a temp name and renamed only after its checksum matched;
+    ArchiveError on any mismatch, a truncated archive or cancel. A failed import leaves nothing
+    behind (folders it created are removed, empty ones emptied again), so it can be retried.
+    Raises ValueError for a non-empty destination."""
+    for d in (dst.user_data, dst.extensions):
+        if os.path.isdir(d) and os.listdir(d):
+            raise ValueError(f"Destination is not empty: {d}")
+    report = ImportReport(dst.name)
+    t0 = time.perf_counter()
+    header = read_header(src)
+    created = [_created_root(d) for d in (dst.user_data, dst.extensions)]
+    try:
+        _unpack(src, dst, header, report, on_progress, cancelled)
+    except BaseException:
+        _discard_import(dst, created)
+        raise
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def _unpack(src: BinaryIO, dst: Profile, header: dict, report: ImportReport,
+            on_progress: Callable[[int, int], None] | None, cancelled: Callable[[], bool] | None) -> None:
+    total = header.get("bytes", 0)
+    dst.ensure_folders()
+    seen: dict[str, tuple[int, str]] = {}
+    state: dict = {"f": None}
+    window = WORKERS * 2
+    pending: deque[tuple[list, object]] = deque()
+    ops: list[tuple[bytes, bytes | None]] = []
+    blocks: list[bytes] = []
+    seg = [0]
+
+    def apply(kind: bytes, value: bytes) -> None:
+        if kind == b"F":
+            meta = json.loads(value)
+            path = _target(dst, meta["p"])
+            ensure_dir(os.path.dirname(path))
+            tmp = f"{path}.vscodemd-import"
+            state.update(f=open(tmp, "wb"), meta=meta, path=path, tmp=tmp, h=hashlib.sha256(), n=0)
+        elif kind == b"E":
+            f = state["f"]
+            if f is None:
+                raise ArchiveError("file data outside a file entry")
+            f.close()
+            state["f"] = None
+            digest, (size,) = value[:32], struct.unpack(">Q", value[32:])
+            meta = state["meta"]
+            if size == UNREADABLE:
+                os.remove(state["tmp"])
+                report.skipped += 1
+                return
+            if digest != state["h"].digest() or size != state["n"]:
+                os.remove(state["tmp"])
+                raise ArchiveError(f"checksum mismatch: {meta['p']}")
+            if os.name != "nt":
+                os.chmod(state["tmp"], meta.get("x", 0o644))
+            os.utime(state["tmp"], ns=(meta["m"], meta["m"]))
+            os.replace(state["tmp"], state["path"])
+            seen[meta["p"]] = (size, digest.hex())
+            report.files += 1
+            report.bytes += size
+            if on_progress:
+                on_progress(report.bytes, total)
+        else:
+            f = state["f"]
+            if f is None:
+                raise ArchiveError("file data outside a file entry")
+            f.write(value)
+            state["h"].update(value)
+            state["n"] += len(value)
+
+    def drain(keep: int) -> None:
+        while len(pending) > keep:
+            seg_ops, fut = pending.popleft()
+            inflated = iter(fut.result())
+            for kind, value in seg_ops:
+                apply(kind, next(inflated) if kind == b"Z" else value)
+
+    def flush(pool) -> None:
+        nonlocal ops, blocks
+        if ops:
+            pending.append((ops, pool.submit(_inflate_blocks, blocks)))
+            ops, blocks = [], []
+            seg[0] = 0
+            drain(window)
+
+    try:
+        with worker_pool(WORKERS) as pool:
+            while True:
+                if cancelled is not None and cancelled():
+                    raise ArchiveError("import cancelled")
+                kind, payload = _read_frame(src)
+                if kind == b"M":
+                    flush(pool)
+                    drain(0)
+                    manifest = json.loads(payload)
+                    break
+                if kind == b"Z":
+                    ops.append((kind, None))
+                    blocks.append(payload)
+                    seg[0] += len(payload)
+                elif kind in (b"F", b"R", b"E"):
+                    ops.append((kind, payload))
+                    seg[0] += len(payload)
+                else:
+                    raise ArchiveError(f"unknown frame {kind!r}")
+                if seg[0] >= SEGMENT_BYTES:
+                    flush(pool)
+    finally:
+        if state["f"] is not None:
+            state["f"].close()
+            os.remove(state["tmp"])
+    expected = {arc: (size, digest) for arc, size, digest in manifest.get("files", [])}
+    if expected != seen:
+        missing = sorted(set(expected) - set(seen))
+        raise ArchiveError(f"manifest does not match the archive ({len(missing)} files missing, first: {missing[:1]})")
+    ext_json = os.path.join(dst.extensions, "extensions.json")
+    if "ex/extensions.json" in seen and os.path.normcase(os.path.abspath(header.get("extensions", ""))) != os.path.normcase(os.path.abspath(dst.extensions)):
+        relocate_extensions_json(ext_json, dst.extensions)
@@ -0,0 +1,712 @@
+# VSCode MultiData by Adam Natad
+# Headless command line: launch / list / check without starting Tk.
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+import events
+from core import (
+    APP_NAME,
+    ConfigManager,
+    attach_console,
+    Profile,
+    config_path,
+    default_profile_dirs,
+    human_bytes,
+    is_executable_path,
+    norm,
+    spawn_vscode,
+)
+
+# Feature modules are imported inside the cmd_* functions: each command only pays for its own.
+
+
+def _out(msg: str = "") -> None:
+    if sys.stdout is not None:
+        print(msg)
+
+def _err(msg: str) -> None:
+    stream = sys.stderr or sys.stdout
+    if stream is not None:
+        print(msg, file=stream)
+
+
+def _load() -> ConfigManager:
+    cm = ConfigManager(config_path())
+    cm.load()
+    return cm
+
+def _save(cm: ConfigManager) -> bool:
+    """Write config.ini; False (after an error message) when the change did not reach the file."""
+    try:
+        if cm.save():
+            return True
+        _err(f"Config not written: {cm.path}")
+    except OSError as e:
+        _err(f"Could not save config: {e}")
+    return False
+
+def _resolve_profiles(cm: ConfigManager, names: list[str] | None) -> list[Profile] | None:
+    """The named profiles, or every profile when names is empty; None (after an error) on an unknown name."""
+    if not names:
+        return cm.get_profiles()
+    out = []
+    for name in names:
+        p = cm.get_profile(name)
+        if not p:
+            _err(f"Unknown profile: {name}")
+            return None
+        out.append(p)
+    return out
+
+# --- Commands ---
+
+def cmd_list(_args: argparse.Namespace) -> int:
+    from processes import ProcessTracker
+    profiles = _load().get_profiles()
+    tracker = ProcessTracker()
+    tracker.poll()
+    width = max([len(p.name) for p in profiles] + [7])
+    for p in profiles:
+        pids = tracker.pids(p.user_data)
+        _out(f"{p.name:<{width}}  {p.user_data}  {p.extensions}" + (f"  [{p.vscode}]" if p.vscode else "") + (f"  (running, {len(pids)} pids)" if pids else ""))
+    return 0
+
+def _report(reply: dict) -> int:
+    msg = reply.get("message") or ""
+    if reply.get("ok"):
+        if msg:
+            _out(msg)
+        return 0
+    _err(msg or "Request failed.")
+    return 1
+
+def cmd_launch(args: argparse.Namespace) -> int:
+    import ipc
+    from latency import LatencyLog, launch_context
+    from readiness import instance_alive
+    folder = os.path.abspath(norm(args.folder)) if args.folder else None
+    if not args.no_forward:
+        # a running GUI owns the config (and any unsaved edits): let it launch
+        reply = ipc.forward({"cmd": "launch", "profile": args.profile, "folder": folder})
+        if reply is not None:
+            return _report(reply)
+
+    cm = _load()
+    p = cm.get_profile(args.profile)
+    if not p:
+        _err(f"Unknown profile: {args.profile}")
+        return 1
+
+    running = instance_alive(p.user_data)  # one folder probe, not a full process scan
+    argv = cm.launch_args(p, folder, running)
+    if not is_executable_path(argv[0]):
+        _err(f"VS Code path is invalid: {argv[0] or '(empty)'}")
+        return 1
+
+    p.ensure_folders()
+    context = launch_context(p)
+    since = time.time()
+    try:
+        spawn_vscode(argv)
+    except Exception as e:
+        _err(f"Launch failed: {e}")
+        return 1
+    _out(f"Handed {p.name} to its running instance" if running else f"Launched {p.name}")
+    events.emit("launch", profile=p.name, handoff=running, folder=bool(folder), source="cli")
+    if args.wait and not running:
+        stats = LatencyLog().measure(p, since, context, cm.get_int("launch_ready_timeout"))
+        s = stats.last.get("s") if stats.last else None
+        if s is None:
+            _err(f"{p.name} not ready within {cm.get_int('launch_ready_timeout')} s")
+            return 1
+        _out(f"Ready in {s:.2f} s (p50 {stats.p50:.2f} s, p95 {stats.p95:.2f} s)")
+    return 0
+
+def cmd_launch_set(args: argparse.Namespace) -> int:
+    """Launch a [launch_sets] entry through the scheduler; no name lists the sets."""
+    from latency import LatencyLog
+    from launchsets import LaunchScheduler, summary
+    cm = _load()
+    sets = cm.get_launch_sets()
+    if not args.name:
+        for name, members in sorted(sets.items()):
+            _out(f"{name}: {', '.join(members)}")
+        return 0
+    members = sets.get(args.name.lower())  # configparser keys are lower-case
+    if members is None:
+        _err(f"Unknown launch set: {args.name}")
+        return 1
+
+    jobs = []
+    for name in members:
+        p = cm.get_profile(name)
+        if not p:
+            _err(f"skipping unknown profile: {name}")
+            continue
+        argv = cm.launch_args(p)
+        if not is_executable_path(argv[0]):
+            _err(f"skipping {p.name}: VS Code path is invalid: {argv[0] or '(empty)'}")
+            continue
+        jobs.append((p, argv))
+
+    sched = LaunchScheduler(
+        args.max_in_flight or cm.get_int("launch_max_in_flight"),
+        args.stagger if args.stagger is not None else cm.get_int("launch_stagger_ms"),
+        args.timeout or cm.get_int("launch_ready_timeout"),
+        latency=LatencyLog(load=False),
+    )
+    t0 = time.perf_counter()
+    results = sched.run(jobs, lambda r, phase: _out(f"[{time.perf_counter() - t0:6.1f}s] {phase:<8} {r.name}"))
+    events.emit("launch_set", name=args.name, profiles=len(results), ready=sum(1 for r in results if r.ready_s is not None),
+                failed=sum(1 for r in results if r.error), ms=round((time.perf_counter() - t0) * 1000.0, 1), source="cli")
+    for line in summary(results, time.perf_counter() - t0):
+        _out(line)
+    return 0 if results and all(r.ready_s is not None for r in results) else 1
+
+def cmd_check(_args: argparse.Namespace) -> int:
+    """Validate VS Code path and profile folders; non-zero exit when something is wrong."""
+    cm = _load()
+    problems = 0
+    vscode = norm(cm.get_app().get("vscode_path", ""))
+    if is_executable_path(vscode):
+        _out(f"OK       vscode_path  {vscode}")
+    else:
+        _out(f"INVALID  vscode_path  {vscode or '(empty)'}")
+        problems += 1
+    for p in cm.get_profiles():
+        if p.vscode and not is_executable_path(p.vscode):
+            _out(f"INVALID  {p.name}  pinned VS Code {p.vscode}")
+            problems += 1
+            continue
+        missing = [d for d in (p.user_data, p.extensions) if not os.path.isdir(d)]
+        if missing:
+            # folders are created on first launch, so this is informational
+            _out(f"MISSING  {p.name}  " + "  ".join(missing))
+        else:
+            _out(f"OK       {p.name}")
+    return 1 if problems else 0
+
+def cmd_stop(_args: argparse.Namespace) -> int:
+    import ipc
+    reply = ipc.forward({"cmd": "stop"})
+    if reply is None:
+        _err("No running instance.")
+        return 1
+    return _report(reply)
+
+def cmd_dedup(args: argparse.Namespace) -> int:
+    """Report (default) or apply hardlink dedup of extension files across profiles."""
+    from dedup import dedup_extensions
+    cm = _load()
+    base_dir = cm.get_app().get("base_dir", "")
+    report = dedup_extensions(cm.get_profiles(), base_dir, apply=args.apply)
+    for line in report.lines(args.apply):
+        _out(line)
+    if not args.apply and (report.reclaimable or report.orphans):
+        _out("dry run: re-run with --apply to link duplicates and sweep the store")
+    return 1 if report.errors else 0
+
+def cmd_installs(args: argparse.Namespace) -> int:
+    """List indexed VS Code installs; --refresh rescans PATH and well-known locations."""
+    from installs import InstallIndex
+    cm = _load()
+    extra = [cm.get_app().get("vscode_path", "")] + [p.vscode for p in cm.get_profiles() if p.vscode]
+    idx = InstallIndex.load(extra)
+    if args.refresh:
+        idx.discover(extra)
+    default = idx.default_exe()
+    for inst in idx.installs:
+        _out(("* " if inst.exe == default else "  ") + inst.label())
+    return 0 if idx.installs else 1
+
+def cmd_clone(args: argparse.Namespace) -> int:
+    """Clone a profile's data into a new profile and register it in config.ini."""
+    from clone import clone_profile
+    cm = _load()
+    src = cm.get_profile(args.source)
+    if not src:
+        _err(f"Unknown profile: {args.source}")
+        return 1
+    name = args.name.strip()
+    if cm.get_profile(name):
+        _err(f"Profile name already exists: {name}")
+        return 1
+    ud, ex = default_profile_dirs(cm.get_app().get("base_dir", ""), name)
+    dst = Profile(name, os.path.abspath(norm(args.user_data)) if args.user_data else ud, os.path.abspath(norm(args.extensions)) if args.extensions else ex, src.vscode)
+    try:
+        report = clone_profile(src, dst)
+    except ValueError as e:
+        _err(str(e))
+        return 1
+    for line in report.lines():
+        _out(line)
+    cm.upsert_profile(dst)
+    if not _save(cm):
+        _err(f"{dst.name} was cloned to {dst.user_data} but is not registered in the config")
+        return 1
+    _out(f"Added profile {dst.name}")
+    return 1 if report.errors else 0
+
+
+def cmd_purge(args: argparse.Namespace) -> int:
+    """Delete cache dirs from the named (or all) profiles' user-data; running profiles are refused."""
+    import purge
+    cm = _load()
+    if not args.all and not args.profiles:
+        _err("Name one or more profiles, or pass --all")
+        return 2
+    targets = _resolve_profiles(cm, None if args.all else args.profiles)
+    if targets is None:
+        return 1
+    t0 = time.perf_counter()
+    results = purge.purge_profiles(targets, dry_run=args.dry_run)
+    for line in purge.summary(results, time.perf_counter() - t0, args.dry_run):
+        _out(line)
+    for r in results:
+        for e in r.errors[:20]:
+            _err(f"error: {e}")
+    return 1 if any(r.refused or r.errors for r in results) else 0
+
+
+def cmd_latency(args: argparse.Namespace) -> int:
+    """p50 / p95 spawn-to-ready per profile from the launch history."""
+    from latency import LatencyLog
+    cm = _load()
+    log = LatencyLog()
+    profiles = _resolve_profiles(cm, args.profiles)
+    if profiles is None:
+        return 1
+    if not args.profiles:
+        profiles = [p for p in profiles if log.stats(p.name).count]
+        if not profiles:
+            _out("No launches measured yet (GUI launches, launch-set and launch --wait record them).")
+            return 0
+    stats = [log.stats(p.name) for p in profiles]
+    if args.slowest:
+        stats.sort(key=lambda s: s.p50 if s.p50 is not None else (float("inf") if s.count else -1.0), reverse=True)
+    for s in stats:
+        _out(s.describe())
+    return 0
+
+
+def cmd_metrics(args: argparse.Namespace) -> int:
+    """One-shot Prometheus textfile (the GUI writes it every metrics_interval_s while running)."""
+    import threading
+    from diskusage import DiskUsageScanner
+    from latency import LatencyLog
+    from metrics import Snapshot, render, write_textfile
+    from processes import ProcessTracker
+    cm = _load()
+    snap = Snapshot(cm.get_profiles())
+    tracker = ProcessTracker()
+    tracker.poll()
+    for p in snap.profiles:
+        pids = tracker.pids(p.user_data)
+        if pids:
+            snap.pids[p.name] = pids
+    if not args.no_disk:
+        scanner = DiskUsageScanner()
+        done = threading.Event()
+        scanner.scan(snap.profiles, lambda *_r: None, lambda _s: done.set())
+        done.wait()
+        scanner.shutdown()
+        snap.disk = scanner.snapshot()
+    snap.latency = LatencyLog()
+    text = render(snap)
+    out = args.out or cm.get_app().get("metrics_textfile", "").strip()
+    if not out or out == "-":
+        sys.stdout.write(text)
+        return 0
+    try:
+        write_textfile(norm(out), text)
+    except OSError as e:
+        _err(f"Could not write {out}: {e}")
+        return 1
+    _out(f"Wrote {norm(out)}")
+    return 0
+
+
+def cmd_snapshot(args: argparse.Namespace) -> int:
+    """Incremental snapshot of a profile's user-data into the chunk store under base_dir."""
+    import snapshots
+    cm = _load()
+    p = cm.get_profile(args.profile)
+    if not p:
+        _err(f"Unknown profile: {args.profile}")
+        return 1
+    try:
+        report = snapshots.snapshot_profile(p, cm.get_app().get("base_dir", ""))
+    except ValueError as e:
+        _err(str(e))
+        return 1
+    for line in report.lines():
+        _out(line)
+    return 1 if report.errors else 0
+
+
+def cmd_snapshots(args: argparse.Namespace) -> int:
+    """List a profile's snapshots, or delete one (unused chunks are swept)."""
+    import snapshots
+    cm = _load()
+    p = cm.get_profile(args.profile)
+    if not p:
+        _err(f"Unknown profile: {args.profile}")
+        return 1
+    base_dir = cm.get_app().get("base_dir", "")
+    if args.delete:
+        snap = snapshots.find_snapshot(base_dir, p.name, args.delete)
+        if snap is None:
+            _err(f"No snapshot {args.delete} for {p.name} (ids must be exact or a unique prefix)")
+            return 1
+        freed, freed_bytes = snapshots.delete_snapshot(base_dir, snap)
+        _out(f"Deleted {snap.id}; {freed} unused chunks removed ({human_bytes(freed_bytes)})")
+        return 0
+    snaps = snapshots.list_snapshots(base_dir, p.name)
+    if not snaps:
+        _out(f"No snapshots for {p.name}.")
+    for snap in snaps:
+        _out(snap.describe())
+    return 0
+
+
+def cmd_restore(args: argparse.Namespace) -> int:
+    """Restore a profile's user-data from a snapshot, rewriting only files that differ."""
+    import snapshots
+    from readiness import instance_alive
+    cm = _load()
+    p = cm.get_profile(args.profile)
+    if not p:
+        _err(f"Unknown profile: {args.profile}")
+        return 1
+    try:
+        report = snapshots.restore_profile(p, cm.get_app().get("base_dir", ""), args.id, keep_extra=args.keep_extra,
+                                           dry_run=args.dry_run, running=instance_alive(p.user_data))
+    except ValueError as e:
+        _err(str(e))
+        return 1
+    for line in report.lines():
+        _out(line)
+    return 1 if report.refused or report.errors else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Stream a profile (user-data + extensions, caches skipped) into one archive; - writes stdout."""
+    import archive
+    cm = _load()
+    p = cm.get_profile(args.profile)
+    if not p:
+        _err(f"Unknown profile: {args.profile}")
+        return 1
+    level = args.level or archive.DEFAULT_LEVEL
+    if args.out == "-":
+        report = archive.export_profile(p, sys.stdout.buffer, level)
+        sys.stdout.buffer.flush()
+    else:
+        out = os.path.abspath(norm(args.out))
+        if os.path.isdir(out) or args.out.endswith(("/", os.sep)):
+            out = os.path.join(out, p.name + archive.ARCHIVE_SUFFIX)
+        try:
+            report = archive.export_to_path(p, out, level)
+        except OSError as e:
+            _err(f"Could not write {out}: {e}")
+            return 1
+        _err(f"Wrote {out}")
+    for line in report.lines():
+        _err(line)  # stderr: stdout may be the archive
+    return 1 if report.errors else 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Unpack an archive into a new profile (checksums verified) and register it in config.ini."""
+    import archive
+    cm = _load()
+    src = sys.stdin.buffer if args.archive == "-" else None
+    try:
+        if src is None:
+            with open(norm(args.archive), "rb") as f:
+                header = archive.read_header(f)
+        else:
+            header = None  # stdin can only be read once: the header is checked by import_profile
+    except (OSError, archive.ArchiveError) as e:
+        _err(f"Could not read {args.archive}: {e}")
+        return 1
+    name = (args.name or (header or {}).get("profile", "")).strip()
+    if not name:
+        _err("Pass --name when importing from stdin")
+        return 2
+    if cm.get_profile(name):
+        _err(f"Profile name already exists: {name} (use --name)")
+        return 1
+    ud, ex = default_profile_dirs(cm.get_app().get("base_dir", ""), name)
+    pinned = (header or {}).get("vscode", "")
+    dst = Profile(
+        name,
+        os.path.abspath(norm(args.user_data)) if args.user_data else ud,
+        os.path.abspath(norm(args.extensions)) if args.extensions else ex,
+        pinned if pinned and is_executable_path(norm(pinned)) else "",
+    )
+    try:
+        if src is None:
+            with open(norm(args.archive), "rb") as f:
+                report = archive.import_profile(f, dst)
+        else:
+            report = archive.import_profile(src, dst)
+    except (OSError, ValueError) as e:
+        _err(f"Import failed: {e}")
+        return 1
+    for line in report.lines():
+        _out(line)
+    cm.upsert_profile(dst)
+    if not _save(cm):
+        _err(f"{dst.name} was imported to {dst.user_data} but is not registered in the config")
+        return 1
+    _out(f"Added profile {dst.name}")
+    return 0
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    """Copy (or merge) settings.json, keybindings.json and snippets/ from one profile to others."""
+    import settingsync
+    cm = _load()
+    src = cm.get_profile(args.source)
+    if not src:
+        _err(f"Unknown profile: {args.source}")
+        return 1
+    if not args.all and not args.targets:
+        _err("Name one or more target profiles, or pass --all")
+        return 2
+    targets = _resolve_profiles(cm, None if args.all else args.targets)
+    if targets is None:
+        return 1
+    if args.all:
+        targets = [p for p in targets if p.name != src.name]
+    items = tuple(i.strip() for i in (args.only or ",".join(settingsync.ITEMS)).split(",") if i.strip())
+    unknown = set(items) - set(settingsync.ITEMS)
+    if unknown:
+        _err(f"Unknown item(s): {', '.join(sorted(unknown))} (choose from {', '.join(settingsync.ITEMS)})")
+        return 2
+    keys = [k.strip() for k in args.keys.split(",") if k.strip()] if args.keys else None
+    t0 = time.perf_counter()
+    results = settingsync.sync_settings(src, targets, items, merge=args.merge or keys is not None, keys=keys, dry_run=args.dry_run)
+    for line in settingsync.summary(results, time.perf_counter() - t0, args.dry_run):
+        _out(line)
+    return 1 if any(r.errors for r in results) else 0
+
+
+def cmd_extensions(args: argparse.Namespace) -> int:
+    """Installed extensions per profile from extensions.json + package.json (cached by folder mtime)."""
+    import json
+    import inventory
+    cm = _load()
+    profiles = _resolve_profiles(cm, args.profiles)
+    if profiles is None:
+        return 1
+    inv = inventory.Inventory()
+    results = inv.scan(profiles, refresh=args.refresh)
+    if args.json:
+        _out(json.dumps([r.to_json() for r in results], indent=2))
+        return 0
+    for r in results:
+        _out(r.describe())
+        width = max([len(e.id) for e in r.extensions] + [2])
+        for e in r.extensions:
+            _out(f"  {e.id:<{width}}  {e.version}" + (f"  [{e.source}]" if e.source else ""))
+        for msg in r.problems:
+            _out(f"  ! {msg}")
+    cached = sum(r.cached for r in results)
+    _out(f"{len(results)} profiles, {sum(len(r.extensions) for r in results)} extensions in {inv.elapsed * 1000:.0f} ms"
+         f" ({cached} from cache)")
+    return 0
+
+
+def cmd_ext_cost(args: argparse.Namespace) -> int:
+    """Profiles ranked by estimated extension startup cost, with the costliest extensions of each."""
+    import json
+    import activation
+    cm = _load()
+    profiles = _resolve_profiles(cm, args.profiles)
+    if profiles is None:
+        return 1
+    analyzer = activation.CostAnalyzer()
+    results = activation.ranking(analyzer.analyze(profiles, refresh=args.refresh))
+    if args.json:
+        _out(json.dumps([r.to_json() for r in results], indent=2))
+        return 0
+    for r in results:
+        for line in r.lines(args.top):
+            _out(line)
+    _out(f"{len(results)} profiles analyzed in {analyzer.elapsed * 1000:.0f} ms (estimates, not measurements)")
+    return 0
+
+
+def cmd_converge(args: argparse.Namespace) -> int:
+    """Plan (default) or apply [extension_sets]: install / uninstall extensions from local VSIX files."""
+    import extsets
+    cm = _load()
+    profiles = _resolve_profiles(cm, args.profiles)
+    if profiles is None:
+        return 1
+    vsix = extsets.VsixIndex(os.path.abspath(norm(args.vsix_dir)) if args.vsix_dir else extsets.vsix_dir_for(cm))
+    plans = extsets.plan_profiles(cm, profiles, vsix, uninstall=not args.keep_extra)
+    if not plans:
+        _out("No [extension_sets] entry names these profiles or a launch set they belong to.")
+        return 0
+    for msg in vsix.problems:
+        _out(f"! {msg}")
+    for plan in plans:
+        for line in plan.lines():
+            _out(line)
+    problems = any(plan.problems for plan in plans)
+    todo = [plan for plan in plans if plan.ops]
+    if not todo:
+        _out("Nothing to do.")
+        return 1 if problems else 0
+    if not args.apply:
+        _out("dry run: re-run with --apply to install / uninstall")
+        return 1 if problems else 0
+
+    default = norm(cm.get_app().get("vscode_path", ""))
+    for plan in todo:
+        exe = plan.profile.vscode_for(default)
+        if not is_executable_path(exe):
+            _err(f"VS Code path is invalid for {plan.name}: {exe or '(empty)'}")
+            return 1
+    jobs = args.jobs or cm.get_int("extension_jobs")
+    t0 = time.perf_counter()
+    results = extsets.converge(todo, lambda p: p.vscode_for(default), jobs, on_result=lambda r: _out(r.describe()))
+    _out(extsets.summary(results, time.perf_counter() - t0)[-1])
+    return 1 if problems or not all(r.ok for r in results) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="launcher.py", description=f"{APP_NAME} (no arguments starts the GUI)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    sp = sub.add_parser("launch", help="launch VS Code with a profile")
+    sp.add_argument("profile", help="profile name (case-insensitive)")
+    sp.add_argument("--folder", help="folder or workspace to open")
+    sp.add_argument("--no-forward", action="store_true", help="spawn directly even if the GUI is running")
+    sp.add_argument("--wait", action="store_true", help="wait until the instance is ready and record launch-to-ready time")
+    sp.set_defaults(func=cmd_launch)
+
+    sp = sub.add_parser("launch-set", help="launch a named profile set (no name: list sets)")
+    sp.add_argument("name", nargs="?", help="[launch_sets] entry")
+    sp.add_argument("--max-in-flight", type=int, help="instances warming up at once (default: launch_max_in_flight)")
+    sp.add_argument("--stagger", type=int, metavar="MS", help="minimum delay between spawns (default: launch_stagger_ms)")
+    sp.add_argument("--timeout", type=float, metavar="S", help="ready timeout per instance (default: launch_ready_timeout)")
+    sp.set_defaults(func=cmd_launch_set)
+
+    sp = sub.add_parser("list", help="list profiles")
+    sp.set_defaults(func=cmd_list)
+
+    sp = sub.add_parser("check", help="validate VS Code path and profile folders")
+    sp.set_defaults(func=cmd_check)
+
+    sp = sub.add_parser("stop", help="close the running (or resident) instance")
+    sp.set_defaults(func=cmd_stop)
+
+    sp = sub.add_parser("dedup", help="hardlink identical extension files across profiles (dry run by default)")
+    sp.add_argument("--apply", action="store_true", help="link duplicates into the shared store under base_dir")
+    sp.set_defaults(func=cmd_dedup)
+
+    sp = sub.add_parser("clone", help="clone a profile (reflink / hardlink / parallel copy, caches skipped)")
+    sp.add_argument("source", help="profile to copy")
+    sp.add_argument("name", help="new profile name")
+    sp.add_argument("--user-data", help="new user-data dir (default: <base_dir>/<Name>/user-data)")
+    sp.add_argument("--extensions", help="new extensions dir (default: <base_dir>/<Name>/extensions)")
+    sp.set_defaults(func=cmd_clone)
+
+    sp = sub.add_parser("purge", help="delete cache dirs (Cache, CachedData, logs, ...) from profiles' user data")
+    sp.add_argument("profiles", nargs="*", help="profile names (case-insensitive)")
+    sp.add_argument("--all", action="store_true", help="every profile")
+    sp.add_argument("--dry-run", action="store_true", help="report what would be reclaimed without deleting")
+    sp.set_defaults(func=cmd_purge)
+
+    sp = sub.add_parser("latency", help="launch-to-ready p50 / p95 per profile")
+    sp.add_argument("profiles", nargs="*", help="profile names (default: every profile with measurements)")
+    sp.add_argument("--slowest", action="store_true", help="sort by p50, slowest first")
+    sp.set_defaults(func=cmd_latency)
+
+    sp = sub.add_parser("metrics", help="write Prometheus metrics once (textfile collector format)")
+    sp.add_argument("--out", help="target .prom file; - for stdout (default: metrics_textfile, else stdout)")
+    sp.add_argument("--no-disk", action="store_true", help="skip the disk usage scan")
+    sp.set_defaults(func=cmd_metrics)
+
+    sp = sub.add_parser("snapshot", help="incremental, deduplicated snapshot of a profile's user data (caches skipped)")
+    sp.add_argument("profile", help="profile name (case-insensitive)")
+    sp.set_defaults(func=cmd_snapshot)
+
+    sp = sub.add_parser("snapshots", help="list a profile's snapshots")
+    sp.add_argument("profile", help="profile name (case-insensitive)")
+    sp.add_argument("--delete", metavar="ID", help="delete a snapshot and sweep chunks nothing else uses")
+    sp.set_defaults(func=cmd_snapshots)
+
+    sp = sub.add_parser("restore", help="restore a profile's user data from a snapshot (only changed files are written)")
+    sp.add_argument("profile", help="profile name (case-insensitive)")
+    sp.add_argument("id", nargs="?", help="snapshot id or unique prefix (default: latest)")
+    sp.add_argument("--keep-extra", action="store_true", help="keep files the snapshot does not have")
+    sp.add_argument("--dry-run", action="store_true", help="report what would be written / removed")
+    sp.set_defaults(func=cmd_restore)
+
+    sp = sub.add_parser("export", help="stream a profile (user data + extensions, caches skipped) into one archive")
+    sp.add_argument("profile", help="profile name (case-insensitive)")
+    sp.add_argument("out", help="archive path or folder (<profile>.vscmd); - for stdout")
+    sp.add_argument("--level", type=int, choices=range(1, 10), metavar="1-9",
+                    help="zlib level (default 1: fastest)")
+    sp.set_defaults(func=cmd_export)
+
+    sp = sub.add_parser("import", help="import an exported profile archive (checksums verified) as a new profile")
+    sp.add_argument("archive", help="archive path; - for stdin")
+    sp.add_argument("--name", help="profile name (default: the exported profile's)")
+    sp.add_argument("--user-data", help="user-data dir (default: <base_dir>/<Name>/user-data)")
+    sp.add_argument("--extensions", help="extensions dir (default: <base_dir>/<Name>/extensions)")
+    sp.set_defaults(func=cmd_import)
+
+    sp = sub.add_parser("sync", help="propagate settings.json / keybindings.json / snippets from one profile to others")
+    sp.add_argument("source", help="profile to copy from")
+    sp.add_argument("targets", nargs="*", help="profiles to update (case-insensitive)")
+    sp.add_argument("--all", action="store_true", help="every other profile")
+    sp.add_argument("--only", help="items: settings, keybindings, snippets (default: all)")
+    sp.add_argument("--merge", action="store_true", help="merge settings.json key by key instead of replacing it")
+    sp.add_argument("--keys", help="comma-separated settings keys to merge (implies --merge)")
+    sp.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    sp.set_defaults(func=cmd_sync)
+
+    sp = sub.add_parser("extensions", help="list installed extensions per profile (cached index)")
+    sp.add_argument("profiles", nargs="*", help="profile names (default: all)")
+    sp.add_argument("--json", action="store_true", help="machine-readable output")
+    sp.add_argument("--refresh", action="store_true", help="ignore the cache and re-read every package.json")
+    sp.set_defaults(func=cmd_extensions)
+
+    sp = sub.add_parser("ext-cost", help="rank profiles by estimated extension startup cost (* activators, unbundled extensions)")
+    sp.add_argument("profiles", nargs="*", help="profile names (default: all)")
+    sp.add_argument("--top", type=int, default=10, metavar="N", help="costliest extensions listed per profile (default: 10)")
+    sp.add_argument("--json", action="store_true", help="machine-readable output")
+    sp.add_argument("--refresh", action="store_true", help="ignore the caches and re-measure every extension")
+    sp.set_defaults(func=cmd_ext_cost)
+
+    sp = sub.add_parser("converge", help="install / uninstall extensions to match [extension_sets] (plan only without --apply)")
+    sp.add_argument("profiles", nargs="*", help="profile names (default: every profile with a declared set)")
+    sp.add_argument("--apply", action="store_true", help="run the plan with the code CLI")
+    sp.add_argument("--keep-extra", action="store_true", help="do not uninstall extensions missing from the set")
+    sp.add_argument("--jobs", type=int, metavar="N", help="code processes at once (default: extension_jobs)")
+    sp.add_argument("--vsix-dir", help="folder with .vsix files (default: vsix_dir, or <base_dir>/.vscodemd/vsix)")
+    sp.set_defaults(func=cmd_converge)
+
+    sp = sub.add_parser("installs", help="list detected VS Code installs (cached index)")
+    sp.add_argument("--refresh", action="store_true", help="rescan PATH and well-known install locations")
+    sp.set_defaults(func=cmd_installs)
+    return ap
+
+
+def main(argv: list[str]) -> int:
+    attach_console()
+    args = build_parser().parse_args(argv)
+    with events.timed("cli", command=args.command) as ev:
+        ev["exit_code"] = code = args.func(args)
+    return code
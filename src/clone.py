@@ -0,0 +1,195 @@
+# VSCode MultiData by Adam Natad
+# Profile cloning: copy-on-write reflinks where the filesystem supports them, hardlinks for files
+# inside installed extensions (immutable once installed), parallel plain copy otherwise.
+# Symlinks are recreated as symlinks; caches and per-instance lock files are skipped. No tkinter here.
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import USER_DATA_CACHE_DIRS, Profile, ensure_dir, human_bytes, is_instance_lock
+
+COPY_WORKERS = 8
+FICLONE = 0x40049409  # linux/fs.h ioctl
+
+
+def _reflink_linux(src: str, dst: str) -> None:
+    import fcntl
+    with open(src, "rb") as fs, open(dst, "wb") as fd:
+        fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+    shutil.copystat(src, dst)
+
+_clonefile = None
+
+def _reflink_macos(src: str, dst: str) -> None:
+    global _clonefile
+    if _clonefile is None:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        _clonefile = libc.clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    if _clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+        import ctypes
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), src)
+
+# errnos meaning "this pair of filesystems cannot clone" (vs. a problem with one file)
+UNSUPPORTED_ERRNOS = frozenset({errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS})
+_no_reflink: set[tuple[int, int]] = set()  # (src st_dev, dst st_dev) pairs that cannot clone
+
+def reflink(src: str, dst: str, devs: tuple[int, int] | None = None) -> bool:
+    """Copy-on-write clone (btrfs/XFS via FICLONE, APFS via clonefile); False when unsupported.
+    With devs, a pair of filesystems that reports cloning as unsupported is remembered and later
+    calls return False at once; other failures (permissions, one unreadable file) are not."""
+    if devs is not None and devs in _no_reflink:
+        return False
+    try:
+        if sys.platform.startswith("linux"):
+            _reflink_linux(src, dst)
+        elif sys.platform == "darwin":
+            _reflink_macos(src, dst)
+        else:
+            return False  # ReFS block cloning needs DeviceIoControl; plain copy instead
+        return True
+    except AttributeError:  # no clonefile() in this libc
+        unsupported = True
+    except OSError as e:
+        unsupported = e.errno in UNSUPPORTED_ERRNOS
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    if unsupported and devs is not None:
+        _no_reflink.add(devs)
+    return False
+
+
+class CloneReport:
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.reflinked = 0
+        self.hardlinked = 0
+        self.copied = 0
+        self.symlinks = 0  # recreated as symlinks (same target)
+        self.skipped = 0   # caches, lock files
+        self.cancelled = False
+        self.elapsed = 0.0
+        self.errors: list[str] = []
+
+    def throughput(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def lines(self) -> list[str]:
+        return [
+            f"{self.files} files, {human_bytes(self.bytes)} in {self.elapsed:.1f} s ({human_bytes(self.throughput())}/s)",
+            f"reflinked {self.reflinked}, hardlinked {self.hardlinked}, copied {self.copied}, symlinks {self.symlinks}, "
+            f"skipped {self.skipped}",
+        ] + [f"error: {e}" for e in self.errors[:20]]
+
+
+def _plan(src_root: str, dst_root: str, skip_caches: bool, link_depth: int | None,
+          report: CloneReport) -> list[tuple[str, str, int, bool, tuple[int, int]]]:
+    """(src, dst, size, may_hardlink, (src st_dev, dst st_dev)) for every file to copy; creates the
+    directory tree and recreates symlinks. link_depth: files at this depth or deeper may be
+    hardlinked (None = never)."""
+    jobs = []
+    ensure_dir(dst_root)
+    dst_dev = os.stat(dst_root).st_dev
+    stack = [(src_root, dst_root, 0)]
+    while stack:
+        s, d, depth = stack.pop()
+        ensure_dir(d)
+        try:
+            it = os.scandir(s)
+        except OSError as e:
+            report.errors.append(f"{s}: {e}")
+            continue
+        with it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir(follow_symlinks=False)
+                    # before the symlink branch: SingletonLock / SingletonSocket / SingletonCookie are symlinks
+                    if (is_dir or e.is_symlink()) and skip_caches and depth == 0 and e.name in USER_DATA_CACHE_DIRS:
+                        report.skipped += 1
+                        continue
+                    if not is_dir and is_instance_lock(e.name):
+                        report.skipped += 1
+                        continue
+                    if e.is_symlink():
+                        # same target, relative or not; a link into the source stays one (like copytree(symlinks=True))
+                        os.symlink(os.readlink(e.path), os.path.join(d, e.name), target_is_directory=e.is_dir())
+                        report.symlinks += 1
+                    elif is_dir:
+                        stack.append((e.path, os.path.join(d, e.name), depth + 1))
+                    elif e.is_file(follow_symlinks=False):
+                        may_link = link_depth is not None and depth >= link_depth
+                        st = os.stat(e.path, follow_symlinks=False)  # DirEntry has no st_dev on Windows
+                        jobs.append((e.path, os.path.join(d, e.name), st.st_size, may_link, (st.st_dev, dst_dev)))
+                except OSError as err:
+                    report.errors.append(f"{e.path}: {err}")
+    return jobs
+
+
+def clone_profile(
+    src: Profile,
+    dst: Profile,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> CloneReport:
+    """Copy src's user-data and extensions into dst's (which must be missing or empty).
+    on_progress(bytes_done, bytes_total) is called from worker threads. Once cancelled() is true the
+    remaining files are skipped and report.cancelled is set; the partial copy stays on disk."""
+    for d in (dst.user_data, dst.extensions):
+        if os.path.isdir(d) and os.listdir(d):
+            raise ValueError(f"Destination is not empty: {d}")
+
+    report = CloneReport()
+    t0 = time.perf_counter()
+    jobs = _plan(src.user_data, dst.user_data, True, None, report)
+    # extensions/<publisher.name-version>/... is immutable after install; extensions.json at depth 0 is not
+    jobs += _plan(src.extensions, dst.extensions, False, 1, report)
+    total = sum(j[2] for j in jobs)
+    lock = threading.Lock()
+    done = [0]
+
+    def one(job: tuple[str, str, int, bool, tuple[int, int]]) -> None:
+        if cancelled is not None and cancelled():
+            report.cancelled = True
+            return
+        s, d, size, may_link, devs = job
+        try:
+            if may_link:
+                try:
+                    os.link(s, d)
+                    method = "hardlinked"
+                except OSError:
+                    may_link = False
+            if not may_link:
+                if reflink(s, d, devs):
+                    method = "reflinked"
+                else:
+                    shutil.copy2(s, d)
+                    method = "copied"
+        except OSError as e:
+            with lock:
+                report.errors.append(f"{s}: {e}")
+            return
+        with lock:
+            setattr(report, method, getattr(report, method) + 1)
+            report.files += 1
+            report.bytes += size
+            done[0] += size
+            progress = done[0]
+        if on_progress:
+            on_progress(progress, total)
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS, thread_name_prefix="vscodemd-clone") as pool:
+        list(pool.map(one, jobs))
+    report.elapsed = time.perf_counter() - t0
+    return report
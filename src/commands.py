@@ -0,0 +1,11 @@
+# VSCode MultiData by Adam Natad
+# CLI command names. launcher.py decides GUI vs CLI from these before importing anything else,
+# so this module has no imports: a plain GUI start never loads cli.py or the feature modules.
+
+COMMANDS = ("launch", "launch-set", "list", "check", "stop", "dedup", "installs", "clone", "purge", "latency", "metrics",
+            "snapshot", "snapshots", "restore", "export", "import", "sync", "extensions", "ext-cost", "converge")
+
+
+def is_cli(argv: list[str]) -> bool:
+    """True when argv asks for a CLI command instead of the GUI."""
+    return bool(argv) and (argv[0] in COMMANDS or argv[0] in ("-h", "--help"))
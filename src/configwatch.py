@@ -0,0 +1,64 @@
+# VSCode MultiData by Adam Natad
+# Watches config.ini for external edits (provisioning scripts, a text editor): a stat poll on a
+# daemon thread, debounced so a file that is still being written fires once. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable
+
+POLL_INTERVAL_S = 0.5
+DEBOUNCE_S = 0.4   # the file's stat must stay unchanged this long before on_change fires
+
+
+def stat_key(path: str) -> tuple[int, int, int] | None:
+    """(mtime_ns, size, inode) or None when missing; an atomic replace changes the inode."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ConfigWatcher:
+    """One os.stat per tick; on_change() (from the watcher thread) after the file settles."""
+
+    def __init__(self, path: str, interval: float = POLL_INTERVAL_S, debounce: float = DEBOUNCE_S):
+        self.path = path
+        self.interval = interval
+        self.debounce = debounce
+        self._seen = stat_key(path)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sync(self) -> None:
+        """Accept the file as it is now, e.g. right after our own save()."""
+        self._seen = stat_key(self.path)
+
+    def start(self, on_change: Callable[[], None]) -> None:
+        if self._thread:
+            return
+
+        def loop() -> None:
+            pending = None      # stat of a change not yet fired
+            settled_at = 0.0
+            while not self._stop.wait(self.interval):
+                key = stat_key(self.path)
+                if key == self._seen:
+                    pending = None
+                    continue
+                if key != pending:
+                    pending, settled_at = key, time.monotonic()
+                    continue
+                if key is None or time.monotonic() - settled_at < self.debounce:
+                    continue  # missing (mid-replace) or still changing
+                self._seen, pending = key, None
+                on_change()
+
+        self._thread = threading.Thread(target=loop, name="vscodemd-configwatch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,611 @@
+# VSCode MultiData by Adam Natad
+# Core helpers, VS Code detection and config model. No tkinter here: the CLI imports this directly.
+
+from __future__ import annotations
+
+import os
+import sys
+import shutil
+import platform
+import subprocess
+import ctypes
+import bisect
+import configparser
+import json
+import time
+
+APP_NAME = "VSCode MultiData by Adam Natad"
+CONFIG_FILENAME = "config.ini"
+REPORT_BUGS_URL = "https://github.com/AdamNatad/VSCodeMultiData/issues"
+
+
+# --- Helpers ---
+
+def os_name() -> str:
+    return platform.system()
+
+def app_dir() -> str:
+    if getattr(sys, "frozen", False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+def config_path() -> str:
+    return os.path.join(app_dir(), CONFIG_FILENAME)
+
+
+def app_icon_path() -> str:
+    """app.ico path (dev or frozen)."""
+    return os.path.join(getattr(sys, "_MEIPASS", app_dir()), "app.ico")
+
+def crash_log_path() -> str:
+    return os.path.join(app_dir(), "crash.log")
+
+def cache_dir() -> str:
+    """Rebuildable indexes/caches beside the config (no AppData)."""
+    return os.path.join(app_dir(), "cache")
+
+def data_dir(base_dir: str) -> str:
+    """Launcher-owned data (shared stores, snapshots) under the profiles' base dir."""
+    return os.path.join(norm(base_dir), ".vscodemd")
+
+def load_json(path: str, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path: str, data) -> None:
+    """Atomic write (temp file + replace) so a crash never leaves a half-written cache."""
+    ensure_dir(os.path.dirname(path))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def norm(p: str) -> str:
+    return os.path.normpath(os.path.expandvars(os.path.expanduser((p or "").strip())))
+
+def ensure_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+
+def human_bytes(n: float) -> str:
+    """1536 -> "1.5 KB"."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return f"{n:.1f} TB"
+
+
+def get_windows_dpi() -> int:
+    """Windows logical DPI for UI scale Auto; 96 when not Windows."""
+    if platform.system() != "Windows":
+        return 96
+    try:
+        user32 = ctypes.windll.user32
+        gdi32 = ctypes.windll.gdi32
+        hdc = user32.GetDC(0)
+        if not hdc:
+            return 96
+        dpi = gdi32.GetDeviceCaps(hdc, 88)
+        user32.ReleaseDC(0, hdc)
+        return int(dpi) if dpi and int(dpi) > 0 else 96
+    except Exception:
+        return 96
+
+
+def open_folder_cross_platform(path: str) -> None:
+    path = norm(path)
+    ensure_dir(path)
+    if os_name() == "Windows":
+        os.startfile(path)  # type: ignore[attr-defined]
+    elif os_name() == "Darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+def split_args(extra: str) -> list[str]:
+    extra = (extra or "").strip()
+    if not extra:
+        return []
+    try:
+        import shlex
+        return shlex.split(extra, posix=(os_name() != "Windows"))
+    except Exception:
+        return extra.split()
+
+
+def attach_console() -> None:
+    """Frozen --noconsole EXE has no stdout; borrow the parent console when there is one."""
+    if sys.stdout is not None or os_name() != "Windows":
+        return
+    try:
+        if ctypes.windll.kernel32.AttachConsole(-1):
+            sys.stdout = open("CONOUT$", "w", encoding="utf-8")
+            sys.stderr = sys.stdout
+    except Exception:
+        pass
+
+
+# --- Startup trace ---
+
+class StartupTrace:
+    """Per-phase wall-clock timings (ms) from t0; used by --startup-trace / --startup-budget."""
+
+    def __init__(self, t0: float | None = None, enabled: bool = False):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.enabled = enabled
+        self._last = self.t0
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000.0))
+        self._last = now
+
+    def total_ms(self) -> float:
+        return (self._last - self.t0) * 1000.0
+
+    def report(self) -> str:
+        width = max([len(name) for name, _ in self.phases] + [5])
+        lines = [f"{name:<{width}}  {ms:8.1f} ms" for name, ms in self.phases]
+        lines.append(f"{'total':<{width}}  {self.total_ms():8.1f} ms")
+        return "\n".join(lines)
+
+
+# --- VS Code detection ---
+
+def vscode_candidates() -> list[str]:
+    cands: list[str] = []
+
+    if os_name() == "Windows":
+        cands += [
+            r"C:\Program Files\Microsoft VS Code\Code.exe",
+            r"C:\Program Files (x86)\Microsoft VS Code\Code.exe",
+        ]
+        local = os.environ.get("LOCALAPPDATA")
+        if local:
+            cands += [
+                os.path.join(local, r"Programs\Microsoft VS Code\Code.exe"),
+                os.path.join(local, r"Programs\Microsoft VS Code Insiders\Code - Insiders.exe"),
+            ]
+
+        which_code = shutil.which("code.cmd") or shutil.which("code.exe") or shutil.which("code")
+        if which_code:
+            cands.append(which_code)
+
+    elif os_name() == "Darwin":
+        cands += [
+            "/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code",
+            "/Applications/Visual Studio Code - Insiders.app/Contents/Resources/app/bin/code",
+            os.path.expanduser("~/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code"),
+        ]
+        which_code = shutil.which("code")
+        if which_code:
+            cands.insert(0, which_code)
+
+    else:
+        cands += ["/usr/bin/code", "/usr/local/bin/code", "/snap/bin/code"]
+        which_code = shutil.which("code")
+        if which_code:
+            cands.insert(0, which_code)
+
+    out, seen = [], set()
+    for p in cands:
+        if not p:
+            continue
+        p = norm(p)
+        if p not in seen:
+            seen.add(p)
+            out.append(p)
+    return out
+
+def autodetect_vscode_path() -> str:
+    """Preferred install from the persistent index (installs.py); only scans when the index is empty."""
+    from installs import InstallIndex  # installs imports core
+    return InstallIndex.load().default_exe()
+
+def is_executable_path(p: str) -> bool:
+    p = norm(p)
+    return bool(p) and (os.path.isfile(p) or shutil.which(p))
+
+
+# --- Config + model ---
+
+class Profile:
+    def __init__(self, name: str, user_data: str, extensions: str, vscode: str = ""):
+        self.name = name
+        self.user_data = user_data
+        self.extensions = extensions
+        self.vscode = vscode  # pinned VS Code executable; "" = use [app] vscode_path
+
+    def vscode_for(self, default: str) -> str:
+        return norm(self.vscode) if self.vscode else default
+
+    def ensure_folders(self) -> None:
+        ensure_dir(self.user_data)
+        ensure_dir(self.extensions)
+
+def default_profile_dirs(base_dir: str, name: str) -> tuple[str, str]:
+    """Auto-Fill layout: <base>/<Name>/user-data and <base>/<Name>/extensions."""
+    folder = name[0].upper() + name[1:] if len(name) > 1 else name.upper()
+    return (
+        norm(os.path.join(base_dir, folder, "user-data")),
+        norm(os.path.join(base_dir, folder, "extensions")),
+    )
+
+# Rebuildable caches VS Code / Electron keep in a user-data dir: not cloned, snapshotted or exported.
+USER_DATA_CACHE_DIRS = frozenset({
+    "Cache", "CachedData", "Code Cache", "GPUCache", "CachedExtensionVSIXs", "CachedProfilesData",
+    "logs", "Crashpad", "DawnCache", "DawnGraphiteCache", "DawnWebGPUCache",
+})
+# Per-instance lock / IPC files that must never be carried over to another profile.
+INSTANCE_LOCK_FILES = frozenset({"code.lock", "LOCK", "SingletonLock", "SingletonSocket", "SingletonCookie"})
+
+def is_instance_lock(name: str) -> bool:
+    return name in INSTANCE_LOCK_FILES or name.endswith(".sock")
+
+class ConfigChanges:
+    """What ConfigManager.reload() took from the file: changed keys per section, and keys that
+    were edited on both sides (the in-memory value was kept)."""
+
+    def __init__(self):
+        self.changed: dict[str, set[str]] = {}
+        self.conflicts: list[tuple[str, str]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.conflicts)
+
+    def describe(self) -> str:
+        parts = [f"[{s}] {len(keys)} changed" for s, keys in sorted(self.changed.items())]
+        if self.conflicts:
+            parts.append(f"{len(self.conflicts)} conflicts kept unsaved")
+        return ", ".join(parts) or "no changes"
+
+    def conflict_lines(self) -> list[str]:
+        return [f"[{s}] {k}" for s, k in self.conflicts]
+
+
+class ConfigManager:
+    def __init__(self, path: str):
+        self.path = path
+        # no interpolation (e.g. 200% in values)
+        self.cfg = configparser.ConfigParser(interpolation=None)
+        self.detect_pending = False
+        self.dirty = False  # in-memory config differs from the file; save() is a no-op otherwise
+        # [profiles] index, kept in step with self.cfg by upsert/delete: lower-cased name -> Profile,
+        # plus the lower-cased names in sort order and the list get_profiles() hands out
+        self._profiles: dict[str, Profile] = {}
+        self._order: list[str] = []
+        self._sorted: list[Profile] | None = None
+        self._norm_cache: dict[str, str] = {}
+        self._disk: dict[str, dict[str, str]] = {}  # sections as last read from / written to the file
+
+    def _default_base_dir(self) -> str:
+        if os_name() == "Windows":
+            return r"D:\VSCode-UData"
+        return os.path.expanduser("~/VSCode-UData")
+
+    # Static [app] defaults; vscode_path/base_dir are computed in _default_for() only when missing.
+    APP_DEFAULTS = {
+        "vscode_path": None,
+        "base_dir": None,
+        "open_new_window": "1",
+        "reuse_existing_window": "0",
+        "extra_args": "",
+        "theme": "Dark",
+        "ui_scale": "Auto",
+        "launch_max_in_flight": "2",
+        "launch_stagger_ms": "500",
+        "launch_ready_timeout": "60",
+        "metrics_textfile": "",      # Prometheus .prom path for node_exporter's textfile collector; "" = off
+        "metrics_interval_s": "15",
+        "vsix_dir": "",              # local .vsix files for extension sets; "" = <base_dir>/.vscodemd/vsix
+        "extension_jobs": "4",       # `code --install-extension` processes at once
+    }
+
+    def _default_for(self, key: str, detect: bool) -> str:
+        if key == "vscode_path":
+            if not detect:
+                self.detect_pending = True
+                return ""
+            return autodetect_vscode_path()
+        if key == "base_dir":
+            return self._default_base_dir()
+        return self.APP_DEFAULTS[key]
+
+    def load(self, detect: bool = True) -> None:
+        """Read config and fill missing keys. detect=False leaves a missing vscode_path empty and sets
+        detect_pending, so the caller can run detection off the startup critical path."""
+        self.detect_pending = False
+        for section in self.cfg.sections():
+            self.cfg.remove_section(section)  # read() merges; a reload must drop removed keys
+        if os.path.isfile(self.path):
+            self.cfg.read(self.path, encoding="utf-8")
+        else:
+            self._create_default(detect)
+
+        if "app" not in self.cfg: self.cfg["app"] = {}
+        if "profiles" not in self.cfg: self.cfg["profiles"] = {}
+        if "launch_sets" not in self.cfg: self.cfg["launch_sets"] = {}
+        if "extension_sets" not in self.cfg: self.cfg["extension_sets"] = {}
+
+        self._disk = self._snapshot()
+        self.dirty = False
+        for key in self.APP_DEFAULTS:
+            if key not in self.cfg["app"]:
+                self.cfg["app"][key] = self._default_for(key, detect)
+                self.dirty = True
+
+        if len(self.cfg["profiles"]) == 0:
+            base_dir = norm(self.cfg["app"]["base_dir"])
+            for i in range(1, 5):
+                name = f"code{i}"
+                ud = os.path.join(base_dir, f"Code{i}", "user-data")
+                ex = os.path.join(base_dir, f"Code{i}", "extensions")
+                self.cfg["profiles"][name] = f"{ud}|{ex}"
+            self.dirty = True
+            self.save()
+        self._index_profiles()
+
+    def _create_default(self, detect: bool = True) -> None:
+        self.cfg["app"] = {key: self._default_for(key, detect) for key in self.APP_DEFAULTS}
+        self.cfg["profiles"] = {}
+        self.cfg["launch_sets"] = {}
+        self.cfg["extension_sets"] = {}
+        ensure_dir(app_dir())
+        self.dirty = True
+        self.save()
+
+    def finish_detect(self, vscode_path: str) -> None:
+        """Store a deferred detection result; saved right away since the key was missing on disk."""
+        if not self.detect_pending:
+            return
+        self.detect_pending = False
+        if vscode_path:
+            self.set_app("vscode_path", vscode_path)
+            self.save()
+
+    def save(self) -> bool:
+        """Write the file when something changed since load / the last save; True if written."""
+        if not self.dirty and os.path.isfile(self.path):
+            return False
+        with open(self.path, "w", encoding="utf-8") as f:
+            self.cfg.write(f)
+        self._disk = self._snapshot()
+        self.dirty = False
+        return True
+
+    def _snapshot(self) -> dict[str, dict[str, str]]:
+        return {s: dict(self.cfg[s]) for s in self.cfg.sections()}
+
+    def reload(self) -> ConfigChanges:
+        """Take external edits to the file without dropping unsaved in-memory ones. Sections that
+        are unchanged since the last load/save are skipped; within the others only changed keys
+        are applied. A key changed both in the file and in memory keeps the in-memory value and is
+        reported as a conflict (the next save() writes it). Raises configparser.Error / OSError."""
+        fresh = configparser.ConfigParser(interpolation=None)
+        with open(self.path, "r", encoding="utf-8") as f:
+            fresh.read_file(f)
+        disk = {s: dict(fresh[s]) for s in fresh.sections()}
+        changes = ConfigChanges()
+        for section in sorted(self._disk.keys() | disk.keys()):
+            before, after = self._disk.get(section, {}), disk.get(section, {})
+            if before == after:
+                continue
+            if section not in self.cfg:
+                self.cfg[section] = {}
+            current = self.cfg[section]
+            for key in sorted(before.keys() | after.keys()):
+                old, new = before.get(key), after.get(key)
+                mine = current.get(key)
+                if old == new or mine == new:
+                    continue
+                if mine != old:
+                    changes.conflicts.append((section, key))
+                    continue
+                if section == "profiles":
+                    self._set_profile_value(key, new)
+                elif new is None:
+                    del current[key]
+                else:
+                    current[key] = new
+                changes.changed.setdefault(section, set()).add(key)
+        self._disk = disk
+        for key in self.APP_DEFAULTS:
+            if key not in self.cfg["app"]:
+                self.cfg["app"][key] = self._default_for(key, False)
+        self.dirty = self._snapshot() != self._disk
+        return changes
+
+    def get_app(self) -> dict:
+        return dict(self.cfg["app"])
+
+    def set_app(self, key: str, value: str) -> None:
+        if self.cfg["app"].get(key) != value:
+            self.cfg["app"][key] = value
+            self.dirty = True
+
+    # [profiles] name = user_data|extensions[|pinned exe]
+
+    def _norm(self, path: str) -> str:
+        n = self._norm_cache.get(path)
+        if n is None:
+            n = self._norm_cache[path] = norm(path)
+        return n
+
+    def _parse_profile(self, name: str, value: str) -> Profile:
+        parts = value.split("|", 2)
+        ud = self._norm(parts[0]) if parts else ""
+        ex = self._norm(parts[1]) if len(parts) > 1 else ""
+        pin = self._norm(parts[2]) if len(parts) > 2 and parts[2].strip() else ""
+        return Profile(name, ud, ex, pin)
+
+    def _index_profiles(self) -> None:
+        self._profiles = {name.lower(): self._parse_profile(name, value) for name, value in self.cfg["profiles"].items()}
+        self._order = sorted(self._profiles)
+        self._sorted = None
+
+    def get_profiles(self) -> list[Profile]:
+        """Profiles sorted by name (a copy; parsing and sorting happen on change, not per call)."""
+        if self._sorted is None:
+            self._sorted = [self._profiles[k] for k in self._order]
+        return list(self._sorted)
+
+    def get_profile(self, name: str) -> Profile | None:
+        """Case-insensitive lookup."""
+        return self._profiles.get(name.lower())
+
+    def upsert_profile(self, p: Profile) -> None:
+        value = f"{p.user_data}|{p.extensions}"
+        if p.vscode:
+            value += f"|{p.vscode}"
+        name = self.cfg.optionxform(p.name)
+        if self.cfg["profiles"].get(name) == value:
+            return
+        self._set_profile_value(name, value)
+        self.dirty = True
+
+    def delete_profile(self, name: str) -> None:
+        name = self.cfg.optionxform(name)
+        if name in self.cfg["profiles"]:
+            self._set_profile_value(name, None)
+            self.dirty = True
+
+    def _set_profile_value(self, name: str, value: str | None) -> None:
+        """Set (or with None remove) a raw [profiles] entry and keep the index in step."""
+        key = name.lower()
+        if value is None:
+            self.cfg["profiles"].pop(name, None)
+            if self._profiles.pop(key, None) is not None:
+                del self._order[bisect.bisect_left(self._order, key)]
+                self._sorted = None
+            return
+        self.cfg["profiles"][name] = value
+        if key not in self._profiles:
+            bisect.insort(self._order, key)
+        self._profiles[key] = self._parse_profile(name, value)
+        self._sorted = None
+
+    def launch_args(self, p: Profile, folder: str | None = None, running: bool = False) -> list[str]:
+        """argv for p from the saved [app] settings (the GUI uses its live, possibly unsaved, values)."""
+        app = self.cfg["app"]
+        return build_launch_args(
+            p.vscode_for(norm(app.get("vscode_path", ""))),
+            p,
+            app.get("open_new_window", "1") == "1",
+            app.get("reuse_existing_window", "0") == "1",
+            app.get("extra_args", ""),
+            folder=folder,
+            running=running,
+        )
+
+    # [launch_sets] name = profile1, profile2, ...
+
+    def get_launch_sets(self) -> dict[str, list[str]]:
+        return {
+            name: [n.strip() for n in value.split(",") if n.strip()]
+            for name, value in self.cfg["launch_sets"].items()
+        }
+
+    def set_launch_set(self, name: str, members: list[str]) -> None:
+        value = ", ".join(members)
+        if self.cfg["launch_sets"].get(name) != value:
+            self.cfg["launch_sets"][name] = value
+            self.dirty = True
+
+    def delete_launch_set(self, name: str) -> None:
+        if name in self.cfg["launch_sets"]:
+            del self.cfg["launch_sets"][name]
+            self.dirty = True
+
+    # [extension_sets] profile-or-launch-set = publisher.name[@version], ...
+
+    def get_extension_sets(self) -> dict[str, list[str]]:
+        return {
+            name: [n.strip() for n in value.split(",") if n.strip()]
+            for name, value in self.cfg["extension_sets"].items()
+        }
+
+    def set_extension_set(self, name: str, members: list[str]) -> None:
+        value = ", ".join(members)
+        if self.cfg["extension_sets"].get(name) != value:
+            self.cfg["extension_sets"][name] = value
+            self.dirty = True
+
+    def delete_extension_set(self, name: str) -> None:
+        if name in self.cfg["extension_sets"]:
+            del self.cfg["extension_sets"][name]
+            self.dirty = True
+
+    def get_int(self, key: str) -> int:
+        """Integer [app] setting, falling back to the default when the value is not a number."""
+        try:
+            return int(self.cfg["app"].get(key, ""))
+        except ValueError:
+            return int(self.APP_DEFAULTS[key])
+
+
+# --- Launch ---
+
+def _profile_args(vscode: str, p: Profile) -> list[str]:
+    return [
+        vscode,
+        "--user-data-dir", p.user_data,
+        "--extensions-dir", p.extensions,
+    ]
+
+def vscode_cli(vscode: str) -> str:
+    """The `code` CLI of an install. On Windows extension commands go through bin\\code.cmd
+    (Code.exe itself starts the GUI); elsewhere the configured path already is the CLI shim."""
+    if os_name() == "Windows" and vscode.lower().endswith(".exe"):
+        bin_dir = os.path.join(os.path.dirname(vscode), "bin")
+        try:
+            cmds = sorted(n for n in os.listdir(bin_dir) if n.lower().endswith(".cmd"))
+        except OSError:
+            cmds = []
+        if cmds:
+            return os.path.join(bin_dir, cmds[0])
+    return vscode
+
+def build_extension_args(vscode: str, p: Profile, install: list[str] | None = None, uninstall: list[str] | None = None) -> list[str]:
+    """argv for the `code` CLI installing (VSIX paths, replacing other versions) and uninstalling
+    (ids) extensions in profile p; same profile flags as build_launch_args()."""
+    args = _profile_args(vscode_cli(vscode), p)
+    for ext in uninstall or []:
+        args += ["--uninstall-extension", ext]
+    for vsix in install or []:
+        args += ["--install-extension", vsix]
+    if install:
+        args.append("--force")
+    return args
+
+def build_launch_args(
+    vscode: str,
+    p: Profile,
+    open_new_window: bool,
+    reuse_existing_window: bool,
+    extra_args: str,
+    folder: str | None = None,
+    running: bool = False,
+) -> list[str]:
+    """argv for launching VS Code with profile p (shared by GUI and CLI). running: the profile
+    already has an instance; without a folder it is focused (--reuse-window) instead of getting
+    an empty new window."""
+    args = _profile_args(vscode, p)
+    if running and not folder:
+        args.append("--reuse-window")
+    elif open_new_window and not reuse_existing_window:
+        args.append("--new-window")
+
+    args.extend(split_args(extra_args))
+    if folder:
+        args.append(os.path.abspath(norm(folder)))  # VS Code is spawned with its own dir as cwd
+    return args
+
+def spawn_vscode(args: list[str]) -> subprocess.Popen:
+    vscode = args[0]
+    return subprocess.Popen(args, cwd=os.path.dirname(vscode) if os.path.isfile(vscode) else None)
+
@@ -0,0 +1,275 @@
+# VSCode MultiData by Adam Natad
+# Extension dedup: identical files across profiles' extensions dirs become hardlinks into one
+# content-addressed store under base_dir. Hashes are cached by (size, mtime) so reruns only hash changes.
+# Only package content is linked: files inside an installed extension's folder that have not changed
+# since the install. The per-profile manifests (extensions.json, .obsolete) and anything an extension
+# wrote into its own folder later (logs, caches, downloaded binaries) stay private copies. A link is
+# not broken on write, so a packaged file rewritten in place changes in every profile sharing it.
+
+from __future__ import annotations
+
+import os
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from core import Profile, cache_dir, data_dir, ensure_dir, human_bytes, load_json, save_json
+from inventory import read_manifest
+
+HASH_BLOCK = 1024 * 1024
+HASH_WORKERS = 8
+MIN_SIZE = 1  # empty files are not worth a link
+MANIFESTS = ("extensions.json", ".obsolete")  # per-profile, rewritten by VS Code: never shared
+INSTALL_GRACE_S = 300  # files modified later than this after the install were written by the extension
+
+
+def store_dir(base_dir: str) -> str:
+    return os.path.join(data_dir(base_dir), "extensions-store")
+
+def index_path() -> str:
+    return os.path.join(cache_dir(), "dedup-index.json")
+
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(HASH_BLOCK)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+def iter_files(root: str):
+    """(path, stat) for regular files under root; symlinks are not followed."""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif e.is_file(follow_symlinks=False):
+                        # os.stat, not e.stat(): DirEntry has no inode/device on Windows
+                        yield e.path, os.stat(e.path, follow_symlinks=False)
+                except OSError:
+                    continue
+
+
+def package_files(extensions_root: str):
+    """(path, stat) for the package content of each extension folder under extensions_root: never
+    the top-level manifests, and never files modified after the extension was installed (install
+    time from extensions.json, else package.json's mtime)."""
+    manifest = read_manifest(extensions_root) or {}
+    try:
+        folders = [e for e in os.scandir(extensions_root) if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")]
+    except OSError:
+        return
+    for folder in folders:
+        installed_ms = (manifest.get(folder.name, {}).get("metadata") or {}).get("installedTimestamp")
+        if isinstance(installed_ms, (int, float)) and installed_ms > 0:
+            cutoff = int(installed_ms) * 1_000_000
+        else:
+            try:
+                cutoff = os.stat(os.path.join(folder.path, "package.json")).st_mtime_ns
+            except OSError:
+                continue  # not an extension
+        cutoff += INSTALL_GRACE_S * 1_000_000_000
+        for path, st in iter_files(folder.path):
+            if st.st_mtime_ns <= cutoff:
+                yield path, st
+
+
+class DedupReport:
+    def __init__(self):
+        self.files = 0
+        self.hashed = 0
+        self.groups = 0            # digests present in more than one inode
+        self.reclaimable = 0       # bytes freed if every duplicate became a link
+        self.linked = 0
+        self.reclaimed = 0
+        self.cross_volume = 0      # copies left alone (store on another volume)
+        self.orphans = 0           # store objects no profile links to any more (st_nlink == 1)
+        self.orphan_bytes = 0
+        self.swept = 0             # orphans removed (apply)
+        self.swept_bytes = 0
+        self.unshared = 0          # manifests linked by an older version, turned back into private copies
+        self.errors: list[str] = []
+
+    def lines(self, applied: bool) -> list[str]:
+        out = [
+            f"files scanned     {self.files}",
+            f"files hashed      {self.hashed}",
+            f"duplicate groups  {self.groups}",
+            f"reclaimable       {human_bytes(self.reclaimable)}",
+        ]
+        if applied:
+            out.append(f"linked            {self.linked} files, {human_bytes(self.reclaimed)} reclaimed")
+        if self.cross_volume:
+            out.append(f"cross-volume      {self.cross_volume} files kept as copies")
+        if self.unshared:
+            out.append(f"manifests         {self.unshared} shared extensions.json / .obsolete " +
+                       ("made private again" if applied else "to make private again"))
+        if self.orphans:
+            if applied:
+                out.append(f"store sweep       {self.swept} unreferenced objects removed, {human_bytes(self.swept_bytes)} freed")
+            else:
+                out.append(f"store sweep       {self.orphans} unreferenced objects, {human_bytes(self.orphan_bytes)}")
+        out += [f"error             {e}" for e in self.errors]
+        return out
+
+
+def _replace_with_link(src: str, dst: str) -> None:
+    """Point dst at src's inode; temp link + os.replace so dst never goes missing."""
+    tmp = f"{dst}.vscodemd-link"
+    if os.path.lexists(tmp):
+        os.unlink(tmp)
+    os.link(src, tmp)
+    os.replace(tmp, dst)
+
+
+def sweep_store(store: str, report: DedupReport, apply: bool) -> None:
+    """Store objects whose only remaining name is the store's own (every profile copy was
+    uninstalled or replaced) free nothing while kept: count them, and delete them on apply."""
+    for path, st in iter_files(store):
+        if st.st_nlink != 1:
+            continue
+        report.orphans += 1
+        report.orphan_bytes += st.st_size
+        if not apply:
+            continue
+        try:
+            os.remove(path)
+            report.swept += 1
+            report.swept_bytes += st.st_size
+        except OSError as e:
+            report.errors.append(f"{path}: {e}")
+    if apply:
+        for e in list(os.scandir(store)) if os.path.isdir(store) else []:
+            if e.is_dir(follow_symlinks=False):
+                try:
+                    os.rmdir(e.path)  # only succeeds for fan-out folders left empty
+                except OSError:
+                    pass
+
+
+def _break_link(path: str) -> None:
+    """Give path its own inode again (copy + os.replace, so it never goes missing)."""
+    tmp = f"{path}.vscodemd-copy"
+    shutil.copy2(path, tmp)
+    os.replace(tmp, path)
+
+
+def dedup_extensions(profiles: list[Profile], base_dir: str, apply: bool = False) -> DedupReport:
+    """Hash the extensions' package content (package_files), then (apply=True) hardlink duplicates
+    through the shared store and sweep store objects no profile uses any more."""
+    report = DedupReport()
+    store = store_dir(base_dir)
+    old_index: dict = load_json(index_path(), {})
+    new_index: dict = {}
+
+    files: list[tuple[str, os.stat_result]] = []
+    seen_roots: set[str] = set()
+    for p in profiles:
+        root = os.path.normcase(p.extensions)
+        if root in seen_roots or not os.path.isdir(p.extensions):
+            continue
+        seen_roots.add(root)
+        files += [(path, st) for path, st in package_files(p.extensions) if st.st_size >= MIN_SIZE]
+        for name in MANIFESTS:
+            path = os.path.join(p.extensions, name)
+            try:
+                if os.stat(path).st_nlink < 2:
+                    continue
+                report.unshared += 1
+                if apply:
+                    _break_link(path)
+            except OSError as e:
+                if os.path.exists(path):
+                    report.errors.append(f"{path}: {e}")
+    report.files = len(files)
+
+    digests: dict[str, str] = {}
+    to_hash: list[str] = []
+    for path, st in files:
+        hit = old_index.get(path)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            digests[path] = hit[2]
+        else:
+            to_hash.append(path)
+
+    def _hash(path: str) -> tuple[str, str | None]:
+        try:
+            return path, hash_file(path)
+        except OSError as e:
+            report.errors.append(f"{path}: {e}")
+            return path, None
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        for path, digest in pool.map(_hash, to_hash):
+            if digest:
+                digests[path] = digest
+                report.hashed += 1
+
+    groups: dict[str, list[tuple[str, os.stat_result]]] = {}
+    for path, st in files:
+        digest = digests.get(path)
+        if digest:
+            new_index[path] = [st.st_size, st.st_mtime_ns, digest]
+            groups.setdefault(digest, []).append((path, st))
+
+    store_dev = None
+    if apply:
+        ensure_dir(store)
+        store_dev = os.stat(store).st_dev
+
+    for digest, members in groups.items():
+        obj = os.path.join(store, digest[:2], digest)
+        try:
+            obj_st = os.stat(obj)
+        except OSError:
+            obj_st = None
+        inodes = {(st.st_dev, st.st_ino) for _, st in members}
+        if obj_st is None and len(inodes) < 2:
+            continue  # unique content, nothing to share
+        size = members[0][1].st_size
+        canonical = (obj_st.st_dev, obj_st.st_ino) if obj_st else None
+        extra = len(inodes) - (1 if canonical is None or canonical in inodes else 0)
+        if extra <= 0:
+            continue
+        report.groups += 1
+        report.reclaimable += extra * size
+        if not apply:
+            continue
+
+        linkable = [(path, st) for path, st in members if st.st_dev == store_dev]
+        report.cross_volume += len(members) - len(linkable)
+        if not linkable:
+            continue
+        try:
+            if obj_st is None:
+                ensure_dir(os.path.dirname(obj))
+                os.link(linkable[0][0], obj)  # first copy becomes the store object, no data copied
+                obj_st = os.stat(obj)
+            refs: dict[tuple[int, int], int] = {}
+            for path, st in linkable:
+                key = (st.st_dev, st.st_ino)
+                if key == (obj_st.st_dev, obj_st.st_ino):
+                    continue
+                _replace_with_link(obj, path)
+                report.linked += 1
+                refs[key] = refs.get(key, 0) + 1
+                if refs[key] == st.st_nlink:
+                    report.reclaimed += size  # last name of that inode is gone
+                new_index[path][1] = obj_st.st_mtime_ns
+        except OSError as e:
+            report.errors.append(f"{digest[:12]}: {e}")
+
+    sweep_store(store, report, apply)
+    save_json(index_path(), new_index)
+    return report
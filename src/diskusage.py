@@ -0,0 +1,148 @@
+# VSCode MultiData by Adam Natad
+# Per-profile disk usage: os.scandir walks on a thread pool, cached per directory keyed by the
+# directory's mtime so unchanged subtrees are not listed again. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import Profile, cache_dir, human_bytes, load_json, save_json
+
+SCAN_WORKERS = 4
+PARTIAL_EVERY = 0.25  # seconds between partial results while a tree is being walked
+KINDS = ("user_data", "extensions")
+
+# on_result(profile_name, kind, bytes, files, done)
+ResultCallback = Callable[[str, str, int, int, bool], None]
+
+
+def cache_path() -> str:
+    return os.path.join(cache_dir(), "disk-usage.json")
+
+
+def scan_tree(root: str, old: dict, fresh: dict, on_partial: Callable[[int, int], None] | None = None) -> tuple[int, int]:
+    """Total (bytes, files) under root. A directory whose mtime matches the cache reuses its own
+    file totals and subdir list; its subdirs are still visited (their mtimes are independent).
+    Note: in-place file growth does not touch the directory mtime, so it shows up on the next
+    create/delete in that directory."""
+    total_bytes = total_files = 0
+    last = time.monotonic()
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            continue
+        hit = old.get(d)
+        if hit and hit[0] == mtime:
+            entry = hit
+        else:
+            own_bytes = own_files = 0
+            subdirs: list[str] = []
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        try:
+                            if e.is_dir(follow_symlinks=False):
+                                subdirs.append(e.name)
+                            elif e.is_file(follow_symlinks=False):
+                                own_bytes += e.stat(follow_symlinks=False).st_size
+                                own_files += 1
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            entry = [mtime, own_bytes, own_files, subdirs]
+        fresh[d] = entry
+        total_bytes += entry[1]
+        total_files += entry[2]
+        stack.extend(os.path.join(d, name) for name in entry[3])
+        if on_partial and time.monotonic() - last >= PARTIAL_EVERY:
+            on_partial(total_bytes, total_files)
+            last = time.monotonic()
+    return total_bytes, total_files
+
+
+def fmt_usage(nbytes: int, files: int) -> str:
+    return f"{human_bytes(nbytes)} ({files:,})"
+
+
+def _under(path: str, roots: list[str]) -> bool:
+    for r in roots:
+        if path == r or path.startswith(r + os.sep):
+            return True
+    return False
+
+
+class DiskUsageScanner:
+    """Scans profiles in the background; results are delivered on worker threads via on_result
+    (the GUI queues them and applies them on the Tk thread)."""
+
+    def __init__(self, workers: int = SCAN_WORKERS):
+        self._workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vscodemd-du")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.results: dict[str, dict[str, tuple[int, int]]] = {}  # last complete totals per profile
+
+    def scan(self, profiles: list[Profile], on_result: ResultCallback, on_done: Callable[[float], None] | None = None) -> None:
+        """Start a scan; a newer scan supersedes (silences) an older one still running."""
+        with self._lock:
+            self._generation += 1
+            gen = self._generation
+        jobs = [(p.name, kind, getattr(p, kind)) for p in profiles for kind in KINDS]
+        self._pool.submit(self._run, gen, jobs, on_result, on_done)
+
+    def _current(self, gen: int) -> bool:
+        return gen == self._generation
+
+    def _run(self, gen: int, jobs: list[tuple[str, str, str]], on_result: ResultCallback, on_done) -> None:
+        t0 = time.perf_counter()
+        old: dict = load_json(cache_path(), {})
+        fresh: dict = {}
+
+        def one(job: tuple[str, str, str]) -> None:
+            name, kind, root = job
+            if not self._current(gen):
+                return
+
+            def partial(b: int, f: int) -> None:
+                if self._current(gen):
+                    on_result(name, kind, b, f, False)
+
+            b, f = scan_tree(root, old, fresh, partial)
+            with self._lock:
+                self.results.setdefault(name, {})[kind] = (b, f)
+            if self._current(gen):
+                on_result(name, kind, b, f, True)
+
+        # scan() only queues this on a single thread; the roots are walked in parallel here.
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="vscodemd-du-walk") as walkers:
+            list(walkers.map(one, jobs))
+
+        if not self._current(gen):
+            return
+        roots = [root for _, _, root in jobs]
+        merged = {d: e for d, e in old.items() if not _under(d, roots)}
+        merged.update(fresh)
+        try:
+            save_json(cache_path(), merged)
+        except OSError:
+            pass
+        if on_done:
+            on_done(time.perf_counter() - t0)
+
+    def snapshot(self) -> dict[str, dict[str, tuple[int, int]]]:
+        """Copy of results, safe while a scan is writing them."""
+        with self._lock:
+            return {name: dict(kinds) for name, kinds in self.results.items()}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._generation += 1
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,162 @@
+# VSCode MultiData by Adam Natad
+# Structured event log: one JSON object per line in events.jsonl beside the config (launches,
+# durations, config saves, scans, errors with stack), for aggregating launcher behaviour across
+# machines. emit() only queues a dict; a daemon thread serializes and appends in batches, and
+# files are rotated by size (events.jsonl.1 ... .N). Crashes go through crash(), which also
+# keeps the human-readable crash.log. No tkinter here.
+
+from __future__ import annotations
+
+import atexit
+import datetime
+import json
+import os
+import platform
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from core import app_dir, crash_log_path
+
+LOG_FILENAME = "events.jsonl"
+MAX_BYTES = 5 * 1024 * 1024   # rotate when the file grows past this
+BACKUPS = 5                   # events.jsonl.1 (newest) ... .5 (oldest)
+FLUSH_INTERVAL_S = 2.0
+FLUSH_AT = 200                # queued events that trigger an early flush
+
+
+def log_path() -> str:
+    return os.path.join(app_dir(), LOG_FILENAME)
+
+
+def rotate(path: str, max_bytes: int, backups: int) -> None:
+    """path -> path.1 -> ... -> path.<backups> (dropped) once path is larger than max_bytes."""
+    try:
+        if os.path.getsize(path) < max_bytes:
+            return
+    except OSError:
+        return
+    try:
+        for i in range(backups - 1, 0, -1):
+            src = f"{path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{path}.{i + 1}")
+        if backups > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+    except OSError:
+        pass  # another process rotated first
+
+
+class EventLog:
+    """Buffered JSONL writer. Safe from any thread; a write failure drops the batch, never raises."""
+
+    def __init__(self, path: str | None = None, max_bytes: int = MAX_BYTES, backups: int = BACKUPS,
+                 flush_interval: float = FLUSH_INTERVAL_S):
+        self.path = path or log_path()
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.base = {"host": platform.node(), "pid": os.getpid()}
+        self._queue: list[dict] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def emit(self, event: str, **fields) -> None:
+        record = {"ts": time.time(), "event": event}
+        record.update(fields)
+        with self._lock:
+            self._queue.append(record)
+            n = len(self._queue)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="vscodemd-events", daemon=True)
+                self._thread.start()
+        if n >= FLUSH_AT:
+            self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._queue = self._queue, []
+        if not batch:
+            return
+        lines = []
+        for record in batch:
+            record.update(self.base)
+            record["ts"] = datetime.datetime.fromtimestamp(record["ts"], datetime.timezone.utc).isoformat(timespec="milliseconds")
+            lines.append(json.dumps(record, separators=(",", ":"), default=str, ensure_ascii=False) + "\n")
+        with self._write_lock:
+            try:
+                rotate(self.path, self.max_bytes, self.backups)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+
+_log: EventLog | None = None
+_log_lock = threading.Lock()
+
+
+def get_log() -> EventLog:
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = EventLog()
+            atexit.register(_log.close)
+        return _log
+
+
+def emit(event: str, **fields) -> None:
+    get_log().emit(event, **fields)
+
+
+@contextmanager
+def timed(event: str, **fields):
+    """Emit `event` with ms (and error, when the block raises) once the block finishes."""
+    t0 = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        emit(event, ms=round((time.perf_counter() - t0) * 1000.0, 2), **fields)
+
+
+def error(event: str, exc: BaseException, **fields) -> None:
+    emit(event, error=f"{type(exc).__name__}: {exc}",
+         stack="".join(traceback.format_exception(type(exc), exc, exc.__traceback__)), **fields)
+
+
+def crash(exc_type: type, exc: BaseException, tb, where: str) -> None:
+    """Uncaught error: a "crash" event flushed at once, plus the readable entry in crash.log."""
+    stack = "".join(traceback.format_exception(exc_type, exc, tb))
+    log = get_log()
+    log.emit("crash", where=where, error=f"{exc_type.__name__}: {exc}", stack=stack)
+    log.flush()
+    stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    path = crash_log_path()
+    try:
+        rotate(path, MAX_BYTES, 1)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n" + "=" * 80 + "\n")
+            f.write(f"{stamp}\n")
+            f.write(stack)
+    except OSError:
+        pass
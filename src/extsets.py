@@ -0,0 +1,343 @@
+# VSCode MultiData by Adam Natad
+# Extension sets: desired extensions per profile or per launch set ([extension_sets] in
+# config.ini), diffed against the extension inventory into a plan of install / uninstall
+# operations, then executed with the `code` CLI from local .vsix files (no marketplace access
+# needed) on a bounded pool of processes, timed per operation. No tkinter here.
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import ConfigManager, Profile, build_extension_args, cache_dir, data_dir, load_json, norm, save_json
+from inventory import Inventory, ProfileInventory
+
+DEFAULT_JOBS = 4
+OP_TIMEOUT_S = 300
+READ_WORKERS = 4
+CACHE_VERSION = 1
+BUILTIN_PUBLISHER = "vscode"  # vscode.git, vscode.github, ...: ship with VS Code, never installed per profile
+
+
+def cache_path() -> str:
+    return os.path.join(cache_dir(), "vsix-index.json")
+
+
+def default_vsix_dir(base_dir: str) -> str:
+    return os.path.join(data_dir(base_dir), "vsix")
+
+
+def version_key(version: str) -> tuple:
+    """Sort key for extension versions ("1.10.2" > "1.9.0"); non-numeric parts count as 0."""
+    return tuple(int(x) if x.isdigit() else 0 for x in re.split(r"[.+-]", version))
+
+
+def parse_spec(entry: str) -> tuple[str, str | None] | None:
+    """"publisher.name" or "publisher.name@1.2.3" -> (lower-cased id, version or None)."""
+    ext_id, _, version = entry.strip().partition("@")
+    ext_id = ext_id.strip().lower()
+    if "." not in ext_id.strip(".") or " " in ext_id:
+        return None
+    return ext_id, version.strip() or None
+
+
+# --- Local VSIX files ---
+
+class VsixPackage:
+    def __init__(self, path: str, ext_id: str, version: str, dependencies: list[str], pack: list[str]):
+        self.path = path
+        self.id = ext_id
+        self.version = version
+        self.dependencies = dependencies
+        self.pack = pack
+
+
+def read_vsix(path: str) -> VsixPackage | None:
+    """The extension's package.json from inside the .vsix (a zip); None when unreadable."""
+    try:
+        with zipfile.ZipFile(path) as z:
+            pkg = json.loads(z.read("extension/package.json").decode("utf-8-sig"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if not isinstance(pkg, dict) or not pkg.get("publisher") or not pkg.get("name"):
+        return None
+    return VsixPackage(
+        path,
+        f"{pkg['publisher']}.{pkg['name']}".lower(),
+        str(pkg.get("version", "")),
+        [str(d).lower() for d in pkg.get("extensionDependencies") or []],
+        [str(d).lower() for d in pkg.get("extensionPack") or []],
+    )
+
+
+class VsixIndex:
+    """.vsix files under a folder by extension id, manifests cached by file size / mtime."""
+
+    def __init__(self, folder: str, path: str | None = None):
+        self.folder = folder
+        self.path = path or cache_path()
+        self.packages: dict[str, list[VsixPackage]] = {}
+        self.problems: list[str] = []
+
+    def scan(self) -> None:
+        data = load_json(self.path, {})
+        old = data.get("files", {}) if isinstance(data, dict) and data.get("version") == CACHE_VERSION else {}
+        paths: dict[str, list[int]] = {}
+        for dirpath, _dirs, files in os.walk(self.folder):
+            for name in files:
+                if name.lower().endswith(".vsix"):
+                    full = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    paths[full] = [st.st_mtime_ns, st.st_size]
+        fresh = {p: old[p] for p, k in paths.items() if p in old and old[p].get("k") == k}
+        todo = [p for p in paths if p not in fresh]
+        with ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="vscodemd-vsix") as pool:
+            for p, pkg in zip(todo, pool.map(read_vsix, todo)):
+                if pkg is None:
+                    self.problems.append(f"{os.path.basename(p)}: not a readable VSIX")
+                    continue
+                fresh[p] = {"k": paths[p], "id": pkg.id, "version": pkg.version, "deps": pkg.dependencies, "pack": pkg.pack}
+        self.packages = {}
+        for p, e in sorted(fresh.items()):
+            self.packages.setdefault(e["id"], []).append(VsixPackage(p, e["id"], e["version"], e["deps"], e["pack"]))
+        if fresh != old:
+            try:
+                save_json(self.path, {"version": CACHE_VERSION, "files": fresh})
+            except OSError:
+                pass  # cache only
+
+    def best(self, ext_id: str, version: str | None = None) -> VsixPackage | None:
+        """The pinned version, or the newest one available."""
+        cands = self.packages.get(ext_id, [])
+        if version is not None:
+            cands = [c for c in cands if c.version == version]
+        return max(cands, key=lambda c: version_key(c.version), default=None)
+
+
+# --- Plan ---
+
+def desired_specs(cm: ConfigManager, p: Profile) -> tuple[dict[str, str | None], list[str], list[str]] | None:
+    """(id -> pinned version or None, where declared, problems) for p from the [extension_sets]
+    entries named after p or after a launch set p belongs to; None when nothing is declared."""
+    groups = {name.lower() for name, members in cm.get_launch_sets().items() if p.name.lower() in (m.lower() for m in members)}
+    specs: dict[str, str | None] = {}
+    sources: list[str] = []
+    problems: list[str] = []
+    for name, entries in cm.get_extension_sets().items():
+        if name.lower() != p.name.lower() and name.lower() not in groups:
+            continue
+        sources.append(name)
+        for entry in entries:
+            spec = parse_spec(entry)
+            if spec is None:
+                problems.append(f"[extension_sets] {name}: not an extension id: {entry!r}")
+                continue
+            ext_id, version = spec
+            if specs.get(ext_id) and version and specs[ext_id] != version:
+                problems.append(f"{ext_id}: pinned to both {specs[ext_id]} and {version}; keeping {specs[ext_id]}")
+                continue
+            specs[ext_id] = specs.get(ext_id) or version
+    return (specs, sources, problems) if sources else None
+
+
+class Operation:
+    def __init__(self, kind: str, ext_id: str, version: str = "", vsix: str = ""):
+        self.kind = kind          # "install" / "uninstall"
+        self.id = ext_id
+        self.version = version
+        self.vsix = vsix          # install only
+
+    def describe(self) -> str:
+        if self.kind == "install":
+            return f"install {self.id} {self.version} ({os.path.basename(self.vsix)})"
+        return f"uninstall {self.id} {self.version}".rstrip()
+
+
+class ProfilePlan:
+    def __init__(self, profile: Profile, sources: list[str]):
+        self.profile = profile
+        self.name = profile.name
+        self.sources = sources
+        self.ops: list[Operation] = []
+        self.unchanged = 0
+        self.problems: list[str] = []
+
+    def describe(self) -> str:
+        installs = sum(1 for o in self.ops if o.kind == "install")
+        line = (f"{self.name} ({', '.join(self.sources)}): {installs} to install, "
+                f"{len(self.ops) - installs} to uninstall, {self.unchanged} up to date")
+        if self.problems:
+            line += f", {len(self.problems)} problems"
+        return line
+
+    def lines(self) -> list[str]:
+        return [self.describe()] + [f"  {o.describe()}" for o in self.ops] + [f"  ! {m}" for m in self.problems]
+
+
+def is_builtin(ext_id: str) -> bool:
+    return ext_id.partition(".")[0] == BUILTIN_PUBLISHER
+
+
+def _ordered(ids: list[str], deps: Callable[[str], list[str]]) -> list[str]:
+    """ids with each one's dependencies (among ids) before it."""
+    wanted, out, seen = set(ids), [], set()
+
+    def visit(i: str) -> None:
+        if i in seen:
+            return
+        seen.add(i)
+        for d in deps(i):
+            if d in wanted:
+                visit(d)
+        out.append(i)
+
+    for i in ids:
+        visit(i)
+    return out
+
+
+def plan_profile(p: Profile, inv: ProfileInventory, specs: dict[str, str | None], sources: list[str],
+                 vsix: VsixIndex, uninstall: bool = True) -> ProfilePlan:
+    """Diff one profile's installed extensions against its desired set. Dependencies and pack
+    members of desired extensions (from the VSIX, or the installed copy) are desired too;
+    built-in ones (publisher "vscode") are skipped."""
+    plan = ProfilePlan(p, sources)
+    installed = inv.by_id()
+    want = dict(specs)
+    chosen: dict[str, VsixPackage] = {}
+    queue = list(want)
+    while queue:
+        ext_id = queue.pop()
+        if is_builtin(ext_id):
+            continue  # always present; nothing to install or report
+        have = installed.get(ext_id)
+        pin = want[ext_id]
+        if have and (pin is None or have.version == pin):
+            plan.unchanged += 1
+            related = have.dependencies + have.pack
+        else:
+            pkg = vsix.best(ext_id, pin)
+            if pkg is None:
+                plan.problems.append(f"{ext_id}{'@' + pin if pin else ''}: no VSIX in {vsix.folder}")
+                continue
+            chosen[ext_id] = pkg
+            related = pkg.dependencies + pkg.pack
+        for r in related:
+            if r not in want:
+                want[r] = None
+                queue.append(r)
+    for ext_id in _ordered(sorted(chosen), lambda i: chosen[i].dependencies):
+        pkg = chosen[ext_id]
+        plan.ops.append(Operation("install", ext_id, pkg.version, pkg.path))
+    if uninstall:
+        extra = sorted(set(installed) - set(want))
+        # dependents first: VS Code refuses to uninstall an extension another one depends on
+        for ext_id in reversed(_ordered(extra, lambda i: installed[i].dependencies)):
+            plan.ops.append(Operation("uninstall", ext_id, installed[ext_id].version))
+    return plan
+
+
+def plan_profiles(cm: ConfigManager, profiles: list[Profile], vsix: VsixIndex, inventory: Inventory | None = None,
+                  uninstall: bool = True) -> list[ProfilePlan]:
+    """Plans for the profiles that have a declared set (others are left alone)."""
+    declared = [(p, desired_specs(cm, p)) for p in profiles]
+    declared = [(p, d) for p, d in declared if d is not None]
+    if not declared:
+        return []
+    if not vsix.packages and not vsix.problems:
+        vsix.scan()
+    inventories = (inventory or Inventory()).scan([p for p, _ in declared])
+    plans = []
+    for (p, (specs, sources, problems)), inv in zip(declared, inventories):
+        plan = plan_profile(p, inv, specs, sources, vsix, uninstall)
+        plan.problems = problems + plan.problems
+        plans.append(plan)
+    return plans
+
+
+# --- Execute ---
+
+class OpResult:
+    def __init__(self, profile: str, op: Operation):
+        self.profile = profile
+        self.op = op
+        self.ok = False
+        self.seconds = 0.0
+        self.message = ""
+
+    def describe(self) -> str:
+        state = "ok" if self.ok else f"FAILED: {self.message}"
+        return f"{self.profile}: {self.op.describe()} — {state} ({self.seconds:.1f} s)"
+
+
+def run_operation(vscode: str, p: Profile, op: Operation) -> OpResult:
+    r = OpResult(p.name, op)
+    if op.kind == "install":
+        argv = build_extension_args(vscode, p, install=[op.vsix])
+    else:
+        argv = build_extension_args(vscode, p, uninstall=[op.id])
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(argv, capture_output=True, text=True, errors="replace", timeout=OP_TIMEOUT_S,
+                              stdin=subprocess.DEVNULL, creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+        out = [ln.strip() for ln in (proc.stderr + "\n" + proc.stdout).splitlines() if ln.strip()]
+        r.ok = proc.returncode == 0 and not any(ln.lower().startswith(("error", "failed")) for ln in out)
+        r.message = out[-1] if out else f"exit code {proc.returncode}"
+    except subprocess.TimeoutExpired:
+        r.message = f"timed out after {OP_TIMEOUT_S} s"
+    except OSError as e:
+        r.message = str(e)
+    r.seconds = time.perf_counter() - t0
+    return r
+
+
+def converge(
+    plans: list[ProfilePlan],
+    vscode_for: Callable[[Profile], str],
+    jobs: int = DEFAULT_JOBS,
+    on_result: Callable[[OpResult], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> list[OpResult]:
+    """Run the plans with at most `jobs` `code` processes at once. A profile's operations run in
+    order, one at a time (they share its extensions.json); profiles run in parallel. on_result
+    fires per operation from worker threads; nothing new starts once cancelled() turns true."""
+
+    def one(plan: ProfilePlan) -> list[OpResult]:
+        vscode = vscode_for(plan.profile)
+        out = []
+        for op in plan.ops:
+            if cancelled is not None and cancelled():
+                r = OpResult(plan.name, op)
+                r.message = "cancelled"
+            else:
+                r = run_operation(vscode, plan.profile, op)
+            out.append(r)
+            if on_result:
+                on_result(r)
+        return out
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="vscodemd-extsets") as pool:
+        return [r for rs in pool.map(one, [plan for plan in plans if plan.ops]) for r in rs]
+
+
+def summary(results: list[OpResult], elapsed: float) -> list[str]:
+    ok = [r for r in results if r.ok]
+    times = sorted(r.seconds for r in results if r.message != "cancelled")
+    line = f"{len(results)} operations on {len({r.profile for r in results})} profiles: {len(ok)} ok, {len(results) - len(ok)} failed in {elapsed:.1f} s"
+    if times:
+        line += f" (per operation: median {times[len(times) // 2]:.1f} s, max {times[-1]:.1f} s)"
+    return [r.describe() for r in results] + [line]
+
+
+def vsix_dir_for(cm: ConfigManager) -> str:
+    app = cm.get_app()
+    return norm(app.get("vsix_dir", "")) or default_vsix_dir(norm(app.get("base_dir", "")))
@@ -0,0 +1,2817 @@
+# VSCode MultiData by Adam Natad
+# Tk GUI: profile editor, dialogs and main window. Started from launcher.py.
+
+from __future__ import annotations
+
+import os
+import sys
+import platform
+import subprocess
+import ctypes
+import configparser
+import queue
+import time
+import traceback
+from typing import TYPE_CHECKING, Callable
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
+
+from core import (
+    APP_NAME,
+    REPORT_BUGS_URL,
+    ConfigManager,
+    Profile,
+    StartupTrace,
+    app_dir,
+    app_icon_path,
+    build_launch_args,
+    config_path,
+    default_profile_dirs,
+    get_windows_dpi,
+    human_bytes,
+    is_executable_path,
+    norm,
+    open_folder_cross_platform,
+    os_name,
+    spawn_vscode,
+)
+from configwatch import ConfigWatcher
+import events
+from diskusage import DiskUsageScanner, fmt_usage
+from installs import InstallIndex, VSCodeInstall
+from ipc import InstanceServer, IpcRequest
+from latency import LatencyLog, LatencyStats, launch_context
+from metrics import MetricsExporter, Snapshot
+from processes import ProcessTracker
+from search import ProfileIndex, describe
+from tasks import Task, TaskRunner
+
+# Modules behind menu actions (archive, snapshots, clone, purge, sync, extensions, launch sets) are
+# imported inside the handlers that use them, so they stay off the startup path; annotations only here.
+if TYPE_CHECKING:
+    from activation import CostAnalyzer, ProfileCost
+    from archive import ExportReport, ImportReport
+    from clone import CloneReport
+    from extsets import OpResult, ProfilePlan
+    from inventory import Inventory, ProfileInventory
+    from launchsets import LaunchResult
+    from snapshots import RestoreReport, SnapshotInfo, SnapshotReport
+
+_app_ref: "App | None" = None  # used by excepthook
+
+
+# --- Profile editor ---
+
+class ProfileEditor(tk.Toplevel):
+    DEFAULT_VSCODE = "(default VS Code path)"
+
+    def __init__(self, master: tk.Tk, title: str, initial: Profile | None, base_dir: str, installs: list[VSCodeInstall] | None = None):
+        super().__init__(master)
+        self.title(title)
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.result: Profile | None = None
+        self._master_app = getattr(master, "palette", None) and master or None
+
+        self.base_dir = norm(base_dir)
+        self.var_name = tk.StringVar(value=(initial.name if initial else "codeX"))
+        self.var_user_data = tk.StringVar(value=(initial.user_data if initial else ""))
+        self.var_extensions = tk.StringVar(value=(initial.extensions if initial else ""))
+        # label -> exe for the pin combobox; a pin that is no longer indexed is kept as a raw path
+        self._vscode_choices = {self.DEFAULT_VSCODE: ""}
+        for inst in installs or []:
+            self._vscode_choices[inst.label()] = inst.exe
+        pinned = initial.vscode if initial else ""
+        current = next((lbl for lbl, exe in self._vscode_choices.items() if exe == pinned), None)
+        if current is None:
+            current = pinned
+            self._vscode_choices[pinned] = pinned
+        self.var_vscode = tk.StringVar(value=current)
+
+        if self._master_app:
+            self.configure(bg=self._master_app.palette["bg"])
+        frm = ttk.Frame(self, style="Card.TFrame" if self._master_app else "TFrame", padding=12)
+        frm.grid(row=0, column=0, sticky="nsew")
+        frm.columnconfigure(1, weight=1)
+
+        lbl_style = "Card.TLabel" if self._master_app else "TLabel"
+        ttk.Label(frm, text="Name", style=lbl_style).grid(row=0, column=0, sticky="w")
+        ttk.Entry(frm, textvariable=self.var_name, width=46).grid(row=0, column=1, sticky="ew", padx=(8, 0))
+
+        ttk.Label(frm, text="User Data", style=lbl_style).grid(row=1, column=0, sticky="w", pady=(8, 0))
+        ttk.Entry(frm, textvariable=self.var_user_data, width=46).grid(row=1, column=1, sticky="ew", padx=(8, 0), pady=(8, 0))
+        ttk.Button(frm, text="Browse…", command=self.browse_ud, takefocus=False, cursor="hand2").grid(row=1, column=2, padx=(8, 0), pady=(8, 0))
+
+        ttk.Label(frm, text="Extensions", style=lbl_style).grid(row=2, column=0, sticky="w", pady=(8, 0))
+        ttk.Entry(frm, textvariable=self.var_extensions, width=46).grid(row=2, column=1, sticky="ew", padx=(8, 0), pady=(8, 0))
+        ttk.Button(frm, text="Browse…", command=self.browse_ex, takefocus=False, cursor="hand2").grid(row=2, column=2, padx=(8, 0), pady=(8, 0))
+
+        ttk.Label(frm, text="VS Code", style=lbl_style).grid(row=3, column=0, sticky="w", pady=(8, 0))
+        ttk.Combobox(frm, textvariable=self.var_vscode, values=list(self._vscode_choices), state="readonly", width=44).grid(row=3, column=1, columnspan=2, sticky="ew", padx=(8, 0), pady=(8, 0))
+
+        ttk.Separator(frm).grid(row=4, column=0, columnspan=3, sticky="ew", pady=10)
+
+        ttk.Button(frm, text="Auto-Fill from Base", command=self.autofill, takefocus=False, cursor="hand2").grid(row=5, column=0, columnspan=3, sticky="ew")
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=6, column=0, columnspan=3, sticky="e", pady=(10, 0))
+        ttk.Button(btns, text="Cancel", command=self.destroy, takefocus=False, cursor="hand2").grid(row=0, column=0, padx=(0, 8))
+        ttk.Button(btns, text="Save", command=self.save, takefocus=False, cursor="hand2").grid(row=0, column=1)
+
+        self.bind("<Return>", lambda _e: self.save())
+        self.bind("<Escape>", lambda _e: self.destroy())
+
+        self.transient(master)
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Tk) -> None:
+        """Center on master."""
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def autofill(self) -> None:
+        name = self.var_name.get().strip()
+        if not name:
+            messagebox.showwarning(APP_NAME, "Enter a name first.")
+            return
+        ud, ex = default_profile_dirs(self.base_dir, name)
+        self.var_user_data.set(ud)
+        self.var_extensions.set(ex)
+
+    def browse_ud(self) -> None:
+        d = filedialog.askdirectory(title="Select User Data Folder")
+        if d:
+            self.var_user_data.set(norm(d))
+
+    def browse_ex(self) -> None:
+        d = filedialog.askdirectory(title="Select Extensions Folder")
+        if d:
+            self.var_extensions.set(norm(d))
+
+    def save(self) -> None:
+        name = self.var_name.get().strip()
+        ud = norm(self.var_user_data.get())
+        ex = norm(self.var_extensions.get())
+        if not name:
+            messagebox.showerror(APP_NAME, "Name cannot be empty.")
+            return
+        if not ud or not ex:
+            messagebox.showerror(APP_NAME, "User Data and Extensions are required.")
+            return
+        self.result = Profile(name, ud, ex, self._vscode_choices.get(self.var_vscode.get(), ""))
+        self.destroy()
+
+
+# --- Delete confirm ---
+
+class DeleteConfirmDialog(tk.Toplevel):
+
+    def __init__(self, master: "App", profile_name: str):
+        super().__init__(master)
+        self.master_app = master
+        self.profile_name = profile_name
+        self.confirmed = False
+
+        self.title("Remove profile")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        ttk.Label(
+            outer,
+            text=f'"{profile_name}" will be removed from the list.',
+            style="Card.TLabel",
+            font=(master.base_font.cget("family"), master.base_font.cget("size") + 1, "bold"),
+        ).grid(row=0, column=0, sticky="w", pady=(0, 6))
+
+        ttk.Label(
+            outer,
+            text="Your data folders stay on disk. Use Save Config when you're done to write the change.",
+            style="Card.TLabel",
+        ).grid(row=1, column=0, sticky="w", pady=(0, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=2, column=0, sticky="e")
+        ttk.Button(btn_row, text="Cancel", command=self._cancel, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Remove", style="Danger.TButton", command=self._remove, takefocus=False, cursor="hand2").pack(side="left")
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self._cancel())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _cancel(self) -> None:
+        self.destroy()
+
+    def _remove(self) -> None:
+        self.confirmed = True
+        self.destroy()
+
+
+# --- Purge confirm ---
+
+class PurgeConfirmDialog(tk.Toplevel):
+    """Confirm a cache purge; self.scope is "selected", "all" or None (cancelled)."""
+
+    def __init__(self, master: "App", selected_count: int):
+        super().__init__(master)
+        self.master_app = master
+        self.scope: str | None = None
+
+        self.title("Purge caches")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        ttk.Label(
+            outer,
+            text="Delete cached data from the profiles' user data?",
+            style="Card.TLabel",
+            font=(master.base_font.cget("family"), master.base_font.cget("size") + 1, "bold"),
+        ).grid(row=0, column=0, sticky="w", pady=(0, 6))
+
+        ttk.Label(
+            outer,
+            text="Cache, CachedData, Code Cache, GPUCache, CachedExtensionVSIXs, logs and similar folders are removed.\n"
+                 "VS Code rebuilds them on the next start. Profiles that are running are skipped.",
+            style="Card.TLabel",
+        ).grid(row=1, column=0, sticky="w", pady=(0, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=2, column=0, sticky="e")
+        ttk.Button(btn_row, text="Cancel", command=self.destroy, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="All Profiles", command=lambda: self._choose("all"), takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        b = ttk.Button(btn_row, text=f"Selected ({selected_count})", style="Danger.TButton", command=lambda: self._choose("selected"), takefocus=False, cursor="hand2")
+        b.pack(side="left")
+        if not selected_count:
+            b.state(["disabled"])
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _choose(self, scope: str) -> None:
+        self.scope = scope
+        self.destroy()
+
+
+# --- Save confirm ---
+
+class SaveConfirmDialog(tk.Toplevel):
+
+    def __init__(self, master: "App"):
+        super().__init__(master)
+        self.confirmed = False
+
+        self.title("Save configuration")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        ttk.Label(
+            outer,
+            text="Save configuration to file?",
+            style="Card.TLabel",
+            font=(master.base_font.cget("family"), master.base_font.cget("size") + 1, "bold"),
+        ).grid(row=0, column=0, sticky="w", pady=(0, 6))
+
+        ttk.Label(
+            outer,
+            text="Your current settings will be written to the config file.",
+            style="Card.TLabel",
+        ).grid(row=1, column=0, sticky="w", pady=(0, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=2, column=0, sticky="e")
+        ttk.Button(btn_row, text="Cancel", command=self._cancel, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Save", style="Accent.TButton", command=self._save, takefocus=False, cursor="hand2").pack(side="left")
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self._cancel())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _cancel(self) -> None:
+        self.destroy()
+
+    def _save(self) -> None:
+        self.confirmed = True
+        self.destroy()
+
+
+# --- Report bugs ---
+
+class ReportBugsDialog(tk.Toplevel):
+
+    def __init__(self, master: "App", error_message: str | None = None):
+        super().__init__(master)
+        self.title("Report Bugs?")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        if error_message:
+            text = f"An unexpected error occurred.\n\n{error_message}\n\nPlease report it at:\n{REPORT_BUGS_URL}"
+        else:
+            text = f"Report bugs or post issues at:\n\n{REPORT_BUGS_URL}"
+        ttk.Label(outer, text=text, style="Card.TLabel", wraplength=360).grid(row=0, column=0, sticky="w", pady=(0, 16))
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=1, column=0, sticky="e")
+        ttk.Button(btn_row, text="Copy Url", style="Accent.TButton", command=self._copy_url, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="OK", command=self.destroy, takefocus=False, cursor="hand2").pack(side="left")
+
+        self.transient(master)
+        self.bind("<Return>", lambda _e: self.destroy())
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _copy_url(self) -> None:
+        self.clipboard_clear()
+        self.clipboard_append(REPORT_BUGS_URL)
+        self.update()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+
+# --- Save and relaunch (UI scale) ---
+
+class SaveAndRelaunchConfirmDialog(tk.Toplevel):
+
+    def __init__(self, master: "App"):
+        super().__init__(master)
+        self.confirmed = False
+
+        self.title("Save and Relaunch?")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        ttk.Label(
+            outer,
+            text="Save config and relaunch the app to apply the new UI scale?",
+            style="Card.TLabel",
+            wraplength=360,
+        ).grid(row=0, column=0, sticky="w", pady=(0, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=1, column=0, sticky="e")
+        ttk.Button(btn_row, text="No", command=self._no, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Yes", style="Accent.TButton", command=self._yes, takefocus=False, cursor="hand2").pack(side="left")
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self._no())
+        self.bind("<Return>", lambda _e: self._yes())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _no(self) -> None:
+        self.destroy()
+
+    def _yes(self) -> None:
+        self.confirmed = True
+        self.destroy()
+
+
+# --- Info dialog ---
+
+class InfoDialog(tk.Toplevel):
+
+    def __init__(self, master: "App", title: str, message: str):
+        super().__init__(master)
+        self.title(title)
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        ttk.Label(outer, text=message, style="Card.TLabel", wraplength=360).grid(row=0, column=0, sticky="w", pady=(0, 16))
+        ttk.Button(outer, text="OK", style="Accent.TButton", command=self.destroy, takefocus=False, cursor="hand2").grid(row=1, column=0, sticky="e")
+
+        self.transient(master)
+        self.bind("<Return>", lambda _e: self.destroy())
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+
+# --- Launch sets ---
+
+class LaunchSetDialog(tk.Toplevel):
+    """Pick / save / delete a [launch_sets] entry. Launch leaves the name in self.launch."""
+
+    def __init__(self, master: "App", selected: list[str]):
+        super().__init__(master)
+        self.master_app = master
+        self.selected = selected
+        self.launch: str | None = None
+
+        self.title("Launch sets")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        outer.columnconfigure(1, weight=1)
+
+        self.var_set = tk.StringVar()
+        ttk.Label(outer, text="Set", style="Card.TLabel").grid(row=0, column=0, sticky="w")
+        self.combo = ttk.Combobox(outer, textvariable=self.var_set, width=32)
+        self.combo.grid(row=0, column=1, sticky="ew", padx=(8, 0))
+        self.combo.bind("<<ComboboxSelected>>", lambda _e: self._show_members())
+        self.combo.bind("<KeyRelease>", lambda _e: self._show_members())
+
+        self.members = ttk.Label(outer, text="", style="Card.TLabel", wraplength=360)
+        self.members.grid(row=1, column=0, columnspan=2, sticky="w", pady=(8, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=2, column=0, columnspan=2, sticky="e")
+        ttk.Button(btn_row, text="Save Selection", command=self._save_selection, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Delete", style="Danger.TButton", command=self._delete, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Close", command=self.destroy, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Launch", style="Accent.TButton", command=self._launch, takefocus=False, cursor="hand2").pack(side="left")
+
+        self._reload_names()
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.bind("<Return>", lambda _e: self._launch())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _reload_names(self, current: str | None = None) -> None:
+        names = sorted(self.master_app.cm.get_launch_sets())
+        self.combo.configure(values=names)
+        self.var_set.set(current if current is not None else (names[0] if names else ""))
+        self._show_members()
+
+    def _show_members(self) -> None:
+        members = self.master_app.cm.get_launch_sets().get(self.var_set.get().strip().lower())
+        if members is None:
+            text = f"New set from selection: {', '.join(self.selected) or '(select profiles in the table)'}"
+        else:
+            text = ", ".join(members) or "(empty)"
+        self.members.configure(text=text)
+
+    def _save_selection(self) -> None:
+        name = self.var_set.get().strip().lower()
+        if not name or not self.selected:
+            messagebox.showinfo(APP_NAME, "Type a set name and select profiles in the table first.", parent=self)
+            return
+        self.master_app.cm.set_launch_set(name, self.selected)
+        self.master_app.status.set(f"Saved launch set {name} (use Save Config to write it)")
+        self._reload_names(name)
+
+    def _delete(self) -> None:
+        name = self.var_set.get().strip().lower()
+        self.master_app.cm.delete_launch_set(name)
+        self._reload_names()
+
+    def _launch(self) -> None:
+        name = self.var_set.get().strip().lower()
+        if name not in self.master_app.cm.get_launch_sets():
+            return
+        self.launch = name
+        self.destroy()
+
+
+# --- Snapshots ---
+
+class SnapshotDialog(tk.Toplevel):
+    """Pick a snapshot of one profile. self.action is ("take", None), ("restore", snap),
+    ("delete", snap) or None (closed)."""
+
+    def __init__(self, master: "App", profile_name: str, snaps: list[SnapshotInfo]):
+        super().__init__(master)
+        self.snaps = list(reversed(snaps))  # newest first
+        self.action: tuple[str, SnapshotInfo | None] | None = None
+
+        self.title(f"Snapshots: {profile_name}")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        outer.columnconfigure(1, weight=1)
+
+        self.var_snap = tk.StringVar()
+        ttk.Label(outer, text="Snapshot", style="Card.TLabel").grid(row=0, column=0, sticky="w")
+        self.combo = ttk.Combobox(outer, textvariable=self.var_snap, width=64, state="readonly",
+                                  values=[s.describe() for s in self.snaps])
+        self.combo.grid(row=0, column=1, sticky="ew", padx=(8, 0))
+        if self.snaps:
+            self.combo.current(0)
+
+        ttk.Label(
+            outer,
+            text="Snapshots keep User settings, globalStorage and the rest of the user data (caches skipped);\n"
+                 "only new chunks are stored. Restore rewrites the files that differ and removes files the\n"
+                 "snapshot does not have. Running profiles are not restored.",
+            style="Card.TLabel",
+        ).grid(row=1, column=0, columnspan=2, sticky="w", pady=(8, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=2, column=0, columnspan=2, sticky="e")
+        ttk.Button(btn_row, text="Close", command=self.destroy, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        b_delete = ttk.Button(btn_row, text="Delete", style="Danger.TButton", command=lambda: self._choose("delete"), takefocus=False, cursor="hand2")
+        b_delete.pack(side="left", padx=(0, 8))
+        b_restore = ttk.Button(btn_row, text="Restore", command=lambda: self._choose("restore"), takefocus=False, cursor="hand2")
+        b_restore.pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Take Snapshot", style="Accent.TButton", command=lambda: self._choose("take"), takefocus=False, cursor="hand2").pack(side="left")
+        if not self.snaps:
+            b_delete.state(["disabled"])
+            b_restore.state(["disabled"])
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _choose(self, kind: str) -> None:
+        snap = None
+        if kind != "take":
+            i = self.combo.current()
+            if i < 0:
+                return
+            snap = self.snaps[i]
+            verb = "Restore" if kind == "restore" else "Delete"
+            if not messagebox.askyesno(APP_NAME, f"{verb} snapshot {snap.id}?", parent=self):
+                return
+        self.action = (kind, snap)
+        self.destroy()
+
+
+# --- Settings sync ---
+
+class SyncSettingsDialog(tk.Toplevel):
+    """Choose targets and what to propagate from one profile. self.result is a dict of
+    sync_settings() arguments, or None when cancelled."""
+
+    def __init__(self, master: "App", source: str, names: list[str], preselected: list[str]):
+        super().__init__(master)
+        self.names = names
+        self.result: dict | None = None
+
+        self.title(f"Sync settings from {source}")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+        p = master.palette
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        outer.columnconfigure(1, weight=1)
+
+        ttk.Label(outer, text="Targets", style="Card.TLabel").grid(row=0, column=0, sticky="nw")
+        self.targets = tk.Listbox(outer, selectmode="extended", height=min(12, max(4, len(names))), width=40,
+                                  activestyle="none", relief="flat", borderwidth=0, highlightthickness=1, exportselection=False,
+                                  bg=p["field"], fg=p["text"], selectbackground=p["select"],
+                                  selectforeground="#FFFFFF" if master._theme_is_dark() else p["text"],
+                                  highlightbackground=p["border"], highlightcolor=p["border"])
+        self.targets.grid(row=0, column=1, sticky="ew", padx=(8, 0))
+        for i, name in enumerate(names):
+            self.targets.insert("end", name)
+            if name in preselected:
+                self.targets.selection_set(i)
+
+        import settingsync
+        self.items = {item: tk.IntVar(value=1) for item in settingsync.ITEMS}
+        items_row = ttk.Frame(outer, style="Card.TFrame")
+        items_row.grid(row=1, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+        for item in settingsync.ITEMS:
+            ttk.Checkbutton(items_row, text=settingsync.ITEM_PATHS[item].split("/")[-1], variable=self.items[item],
+                            style="Card.TCheckbutton", takefocus=False).pack(side="left", padx=(0, 12))
+
+        self.var_merge = tk.IntVar(value=0)
+        ttk.Checkbutton(outer, text="Merge settings.json keys (keep the targets' other keys and comments)", variable=self.var_merge,
+                        style="Card.TCheckbutton", takefocus=False).grid(row=2, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+        self.var_keys = tk.StringVar()
+        ttk.Label(outer, text="Keys", style="Card.TLabel").grid(row=3, column=0, sticky="w", pady=(8, 0))
+        ttk.Entry(outer, textvariable=self.var_keys).grid(row=3, column=1, sticky="ew", padx=(8, 0), pady=(8, 0))
+        ttk.Label(outer, text="Comma-separated; empty merges every key of the source.", style="Card.TLabel").grid(
+            row=4, column=1, sticky="w", padx=(8, 0), pady=(2, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=5, column=0, columnspan=2, sticky="e")
+        ttk.Button(btn_row, text="Cancel", command=self.destroy, takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Preview", command=lambda: self._choose(True), takefocus=False, cursor="hand2").pack(side="left", padx=(0, 8))
+        ttk.Button(btn_row, text="Sync", style="Accent.TButton", command=lambda: self._choose(False), takefocus=False, cursor="hand2").pack(side="left")
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _choose(self, dry_run: bool) -> None:
+        targets = [self.names[i] for i in self.targets.curselection()]
+        items = tuple(item for item in self.items if self.items[item].get())
+        if not targets or not items:
+            messagebox.showinfo(APP_NAME, "Select at least one target and one item.", parent=self)
+            return
+        keys = [k.strip() for k in self.var_keys.get().split(",") if k.strip()] or None
+        self.result = {"targets": targets, "items": items, "merge": bool(self.var_merge.get()) or keys is not None,
+                       "keys": keys, "dry_run": dry_run}
+        self.destroy()
+
+
+# --- Extension inventory ---
+
+class ExtensionsDialog(tk.Toplevel):
+    """Read-only view of the extension inventory; the combobox switches between profiles.
+    costs (activation.py estimates) fill the Startup column when the background scan has run."""
+
+    def __init__(self, master: "App", inventories: list[ProfileInventory], current: str, costs: dict[str, ProfileCost]):
+        super().__init__(master)
+        self.inventories = inventories
+        self.costs = costs
+
+        self.title("Extensions")
+        self.resizable(False, False)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.configure(bg=master.palette["bg"])
+
+        outer = ttk.Frame(self, style="Card.TFrame", padding=16)
+        outer.grid(row=0, column=0, sticky="nsew")
+        outer.columnconfigure(1, weight=1)
+
+        self.var_profile = tk.StringVar()
+        ttk.Label(outer, text="Profile", style="Card.TLabel").grid(row=0, column=0, sticky="w")
+        self.combo = ttk.Combobox(outer, textvariable=self.var_profile, width=40, state="readonly",
+                                  values=[inv.name for inv in inventories])
+        self.combo.grid(row=0, column=1, sticky="w", padx=(8, 0))
+        self.combo.bind("<<ComboboxSelected>>", lambda _e: self._show())
+
+        table = ttk.Frame(outer, style="Card.TFrame")
+        table.grid(row=1, column=0, columnspan=2, sticky="nsew", pady=(12, 0))
+        self.tree = ttk.Treeview(table, columns=("id", "version", "source", "startup"), show="headings", height=14, takefocus=False)
+        for col, text, width in (("id", "Extension", 320), ("version", "Version", 120), ("source", "Source", 90), ("startup", "Startup", 260)):
+            self.tree.heading(col, text=text, anchor="w")
+            self.tree.column(col, width=width, stretch=col == "id", anchor="w")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        vsb = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        vsb.grid(row=0, column=1, sticky="ns", padx=(6, 0))
+
+        self.var_info = tk.StringVar()
+        ttk.Label(outer, textvariable=self.var_info, style="Card.TLabel", wraplength=600, justify="left").grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(8, 16))
+
+        btn_row = ttk.Frame(outer)
+        btn_row.grid(row=3, column=0, columnspan=2, sticky="e")
+        ttk.Button(btn_row, text="Close", style="Accent.TButton", command=self.destroy, takefocus=False, cursor="hand2").pack(side="left")
+
+        names = [inv.name for inv in inventories]
+        self.combo.current(names.index(current) if current in names else 0)
+        self._show()
+
+        self.transient(master)
+        self.bind("<Escape>", lambda _e: self.destroy())
+        self.grab_set()
+        self.wait_visibility()
+        self._center_on(master)
+        self.focus_force()
+
+    def _center_on(self, master: tk.Misc) -> None:
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        mx = master.winfo_x()
+        my = master.winfo_y()
+        mw = master.winfo_width()
+        mh = master.winfo_height()
+        x = mx + max(0, (mw - w) // 2)
+        y = my + max(0, (mh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+
+    def _show(self) -> None:
+        i = self.combo.current()
+        if i < 0:
+            return
+        inv = self.inventories[i]
+        cost = self.costs.get(inv.name)
+        by_id = {c.id: c for c in cost.extensions} if cost else {}
+        self.tree.delete(*self.tree.get_children())
+        for e in inv.extensions:
+            c = by_id.get(e.id)
+            startup = f"~{c.cost_ms:.0f} ms" + "".join(f", {f}" for f in c.flags()) if c else ""
+            self.tree.insert("", "end", values=(e.id, e.version + (" (pre-release)" if e.pre_release else ""), e.source, startup))
+        info = f"{len(inv.extensions)} extensions in {inv.root}"
+        if cost:
+            info += f"\nEstimated startup cost {cost.label()}"
+        if inv.problems:
+            info += "\n" + "\n".join(inv.problems[:6]) + ("\n…" if len(inv.problems) > 6 else "")
+        self.var_info.set(info)
+
+
+# --- Main app ---
+
+class App(tk.Tk):
+    THEME_OPTIONS = ["Dark", "Light"]
+    SCALE_OPTIONS = ["Auto", "100%", "125%", "150%", "175%", "200%", "225%", "250%", "300%"]
+    MIN_WIDTH = 1024  # right rail stays visible
+    MIN_HEIGHT = 780  # every rail button stays visible
+
+    @staticmethod
+    def _normalize_theme(raw: str) -> str:
+        v = (raw or "").strip().lower()
+        return "Dark" if v == "dark" else "Light"
+
+    def _theme_is_dark(self) -> bool:
+        return (self.var_theme.get() or "").strip().lower() == "dark"
+
+    def __init__(self, trace: StartupTrace | None = None):
+        self.trace = trace or StartupTrace()
+        self._budget_ms: float | None = None
+        self._exit_code = 0
+        self._visible_ms = 0.0
+        self._startup_done = False
+        self._fill_job: str | None = None
+        # windowed table (_set_virtual): only the visible slice of self.profiles exists as rows
+        self._virtual = False
+        self._v_top = 0
+        self._v_sel: set[str] = set()
+        self._v_focus = ""
+        self._v_index: dict[str, int] = {}
+        self._v_render_job: str | None = None
+        self.search = ProfileIndex()
+        self._search_stale = True   # profiles changed since the index was last synced
+        self._search_hits: list[str] = []
+        self._ui_calls: queue.Queue = queue.Queue()
+        self.disk_usage = DiskUsageScanner()
+        self.installs = InstallIndex()
+        self.inventory: Inventory | None = None  # loaded on first use (reads the cache file)
+        self.ext_cost: CostAnalyzer | None = None
+        self.ext_costs: dict[str, ProfileCost] = {}
+        self.processes = ProcessTracker()
+        self.latency = LatencyLog(load=False)  # read after first paint
+        self.metrics = MetricsExporter(self._metrics_snapshot)
+        self.config_watch = ConfigWatcher(config_path())
+        # filesystem / subprocess work goes through here; results come back via run_on_ui
+        self.tasks = TaskRunner(self.run_on_ui, lambda msg: self.status.set(msg), self._on_tasks_active)
+        if platform.system() == "Windows":
+            try:
+                ctypes.windll.shcore.SetProcessDpiAwareness(2)
+            except Exception:
+                try:
+                    ctypes.windll.user32.SetProcessDPIAware()
+                except Exception:
+                    pass
+        super().__init__()
+        self.title(APP_NAME)
+        _icon = app_icon_path()
+        if os.path.isfile(_icon):
+            try:
+                self.iconbitmap(_icon)
+            except Exception:
+                pass
+        self.minsize(self.MIN_WIDTH, self.MIN_HEIGHT)
+        self.bind("<Configure>", self._enforce_min_size)
+        self.trace.mark("tk_init")
+
+        _config_path = config_path()
+        self._config_existed_at_startup = os.path.isfile(_config_path)
+        self.cm = ConfigManager(_config_path)
+        self.cm.load(detect=False)  # detection runs after first paint (_deferred_startup)
+        app = self.cm.get_app()
+        self.trace.mark("config_load")
+
+        self.var_vscode_path = tk.StringVar(value=norm(app.get("vscode_path", "")))
+        self.var_base_dir = tk.StringVar(value=norm(app.get("base_dir", "")))
+        self.var_open_new_window = tk.IntVar(value=int(app.get("open_new_window", "1")))
+        self.var_reuse_existing_window = tk.IntVar(value=int(app.get("reuse_existing_window", "0")))
+        self.var_extra_args = tk.StringVar(value=app.get("extra_args", ""))
+        self.var_theme = tk.StringVar(value=self._normalize_theme(app.get("theme", "Dark")))
+        self.var_ui_scale = tk.StringVar(value=(app.get("ui_scale", "Auto") or "Auto"))
+
+        self.status = tk.StringVar(value=f"Config: {config_path()}")
+
+        self.base_font = tkfont.nametofont("TkDefaultFont")
+        if os_name() == "Windows":
+            try:
+                self.base_font.configure(family="Segoe UI")
+            except Exception:
+                pass
+
+        self.style = ttk.Style(self)
+        try:
+            self.style.theme_use("clam")
+        except Exception:
+            pass
+
+        self.palette = self._palette_dark() if self._theme_is_dark() else self._palette_light()
+        self._apply_style()
+        self.trace.mark("style")
+        # Auto: Tk already picked up the system DPI (DPI-aware process); the explicit probe is deferred.
+        self._apply_scale(probe_dpi=False)
+        self.trace.mark("scale")
+        self._build_ui()
+        self.trace.mark("build_ui")
+        self._refresh_list()  # first FILL_CHUNK rows only; the rest fill in after mainloop starts
+        self.trace.mark("tree_fill")
+
+        self.update_idletasks()
+        w = self.winfo_width()
+        h = self.winfo_height()
+        sw = self.winfo_screenwidth()
+        sh = self.winfo_screenheight()
+        x = max(0, (sw - w) // 2)
+        y = max(0, (sh - h) // 2)
+        self.geometry(f"+{x}+{y}")
+        self.trace.mark("layout")
+
+        # “dotted focus” look: prevent focus by default
+        self.bind_all("<Button-1>", self._defocus_on_click, add="+")
+        self._map_bind = self.bind("<Map>", self._on_first_map, add="+")
+
+        global _app_ref
+        _app_ref = self
+
+    def _on_first_map(self, event=None) -> None:
+        if event is not None and event.widget is not self:
+            return
+        self.unbind("<Map>", self._map_bind)
+        self.update_idletasks()  # flush pending redraws so "visible" means painted
+        self.trace.mark("window_visible")
+        self._visible_ms = self.trace.total_ms()
+        self.after(0, self._deferred_startup)
+
+    def _deferred_startup(self) -> None:
+        """Non-essential startup work, run once the window is on screen."""
+        self._pump_ui()  # task results arrive through the UI queue
+        hints = self._install_hints()
+        self.tasks.submit("Loading launch history", lambda _t: self.latency.reload(), on_done=lambda _r: self._on_latency_loaded())
+        self.tasks.submit(
+            "Loading VS Code installs",
+            lambda _t: InstallIndex.load(hints),  # stat-validated cache, no PATH scan
+            on_done=self._startup_installs_loaded,
+            on_error=lambda _e: self._startup_installs_loaded(InstallIndex()),
+        )
+
+    def _startup_installs_loaded(self, index: InstallIndex) -> None:
+        self.installs = index
+        self.trace.mark("install_index")
+        if self.cm.detect_pending:
+            p = self.installs.default_exe()
+            self.cm.finish_detect(p)
+            if p:
+                self.entry_vscode_path.config(state="normal")
+                self.var_vscode_path.set(norm(p))
+                self.entry_vscode_path.config(state="disabled")
+                self.status.set(f"Detected VS Code: {p}")
+            self.trace.mark("detect")
+        if self._parse_ui_scale() is None:
+            dpi_scaling = get_windows_dpi() / 72.0
+            if abs(float(self.tk.call("tk", "scaling")) - dpi_scaling) > 0.01:
+                self._apply_scale()
+                self._apply_style()
+            self.trace.mark("dpi_probe")
+        self._finish_trace()
+        self._startup_done = True
+        self.scan_disk_usage()
+        self.scan_extension_costs()
+        self.processes.start(lambda _r: self.run_on_ui(self._on_processes))
+        self.config_watch.start(lambda: self.run_on_ui(self._on_config_changed))
+        self._configure_metrics()
+
+    def set_startup_budget(self, budget_ms: float | None) -> None:
+        """With a budget the app reports and exits after startup (exit code 1 when over budget)."""
+        self._budget_ms = budget_ms
+
+    def _finish_trace(self) -> None:
+        events.emit("startup", visible_ms=round(self._visible_ms, 1), total_ms=round(self.trace.total_ms(), 1),
+                    phases={name: round(ms, 1) for name, ms in self.trace.phases}, profiles=len(self.profiles))
+        if not self.trace.enabled and self._budget_ms is None:
+            return
+        if sys.stdout is not None:
+            print(self.trace.report())
+            if self._budget_ms is not None:
+                verdict = "OK" if self._visible_ms <= self._budget_ms else "OVER BUDGET"
+                print(f"window visible in {self._visible_ms:.1f} ms (budget {self._budget_ms:.0f} ms): {verdict}")
+        if self._budget_ms is not None:
+            self._exit_code = 0 if self._visible_ms <= self._budget_ms else 1
+            self.quit()
+
+    def _enforce_min_size(self, event=None):
+        """Clamp to MIN_WIDTH x MIN_HEIGHT."""
+        if event and event.widget != self:
+            return
+        w = self.winfo_width()
+        h = self.winfo_height()
+        if w < self.MIN_WIDTH or h < self.MIN_HEIGHT:
+            self.geometry(f"{max(w, self.MIN_WIDTH)}x{max(h, self.MIN_HEIGHT)}")
+
+    def _defocus_on_click(self, e):
+        try:
+            if isinstance(e.widget, ttk.Button):
+                return
+            w = self.focus_get()
+            if isinstance(w, ttk.Button):
+                self.focus_set()
+        except Exception:
+            pass
+
+    def _report_bugs_enter(self, _e=None) -> None:
+        if hasattr(self, "report_bugs_lbl"):
+            self.report_bugs_lbl.config(fg="red")
+
+    def _report_bugs_leave(self, _e=None) -> None:
+        if hasattr(self, "report_bugs_lbl"):
+            self.report_bugs_lbl.config(fg=self.palette["muted"])
+
+    def _palette_dark(self) -> dict:
+        return {
+            "bg": "#1E1E1E",
+            "panel": "#252526",
+            "panel2": "#2D2D2D",
+            "border": "#3C3C3C",
+            "text": "#D4D4D4",
+            "muted": "#9DA2A6",
+            "accent": "#007ACC",
+            "accent_hover": "#1A8AD4",
+            "danger": "#F14C4C",
+            "danger_hover": "#FF6B6B",
+            "button_hover": "#3C3C3C",
+            "warning": "#F14C4C",
+            "field": "#1F1F1F",
+            "select": "#094771",
+            "button_border": "#6C6C6C",
+        }
+
+    def _palette_light(self) -> dict:
+        return {
+            "bg": "#F3F3F3",
+            "panel": "#FFFFFF",
+            "panel2": "#F6F6F6",
+            "border": "#D0D0D0",
+            "text": "#1E1E1E",
+            "muted": "#5A5A5A",
+            "accent": "#007ACC",
+            "accent_hover": "#3399DD",
+            "danger": "#C62828",
+            "danger_hover": "#E53935",
+            "button_hover": "#E8E8E8",
+            "warning": "#C62828",
+            "field": "#FFFFFF",
+            "select": "#CFE8FF",
+            "button_border": "#5A5A5A",
+        }
+
+    def _apply_style(self) -> None:
+        p = self.palette
+        self.configure(bg=p["bg"])
+
+        self.style.configure(".", background=p["bg"], foreground=p["text"])
+        self.style.configure("TFrame", background=p["bg"])
+        self.style.configure("TLabel", background=p["bg"], foreground=p["text"])
+        self.style.configure("Muted.TLabel", background=p["bg"], foreground=p["muted"])
+        self.style.configure("Card.TLabel", background=p["panel"], foreground=p["text"])
+        self.style.configure("Warning.TLabel", background=p["panel"], foreground=p["warning"], font=(self.base_font.cget("family"), self.base_font.cget("size"), "normal"))
+
+        self.style.configure("Card.TCheckbutton", background=p["panel"], foreground=p["text"])
+        self.style.map("Card.TCheckbutton", background=[("active", p["panel"])])
+        self.style.configure("Card.TFrame", background=p["panel"], relief="flat", borderwidth=1)
+
+        self.style.configure("TEntry", fieldbackground=p["field"], foreground=p["text"])
+        self.style.configure(
+            "TCombobox",
+            fieldbackground=p["field"],
+            foreground=p["text"],
+            background=p["panel2"],
+            bordercolor=p["button_border"],
+            borderwidth=1,
+            padding=(6, 4),
+            arrowcolor=p["text"],
+        )
+        # Keep text and field colors correct when dropdown is pressed/focused (fixes light theme text turning white)
+        self.style.map(
+            "TCombobox",
+            fieldbackground=[
+                ("readonly", p["field"]),
+                ("focus", p["field"]),
+                ("pressed", p["field"]),
+            ],
+            foreground=[
+                ("readonly", p["text"]),
+                ("focus", p["text"]),
+                ("pressed", p["text"]),
+            ],
+            background=[
+                ("readonly", p["panel2"]),
+                ("focus", p["panel2"]),
+                ("pressed", p["panel2"]),
+            ],
+            arrowcolor=[
+                ("readonly", p["text"]),
+                ("focus", p["text"]),
+                ("pressed", p["text"]),
+            ],
+        )
+
+        self.style.configure(
+            "TButton",
+            background=p["panel2"],
+            foreground=p["text"],
+            padding=(6, 4),
+            relief="solid",
+            borderwidth=1,
+            bordercolor=p["button_border"],
+        )
+        self.style.map("TButton", background=[("active", p["button_hover"]), ("pressed", p["border"])])
+        try:
+            self.style.configure("TButton", focusthickness=0, focuspadding=0)
+        except Exception:
+            pass
+
+        self.style.configure(
+            "Accent.TButton",
+            background=p["accent"],
+            foreground="#FFFFFF",
+            padding=(6, 5),
+            relief="solid",
+            borderwidth=1,
+            bordercolor=p["button_border"],
+        )
+        self.style.map("Accent.TButton", background=[("active", p["accent_hover"]), ("pressed", p["accent"])])
+
+        self.style.configure(
+            "Danger.TButton",
+            background=p["panel2"],
+            foreground=p["danger"],
+            padding=(6, 4),
+            relief="solid",
+            borderwidth=1,
+            bordercolor=p["button_border"],
+        )
+        self.style.map("Danger.TButton", background=[("active", p["button_hover"]), ("pressed", p["border"])])
+
+        self.style.configure("Treeview", background=p["field"], fieldbackground=p["field"], foreground=p["text"], relief="flat", borderwidth=0)
+        self.style.map("Treeview", background=[("selected", p["select"])], foreground=[("selected", "#FFFFFF" if self._theme_is_dark() else p["text"])])
+        self.style.configure("Treeview.Heading", background=p["panel2"], foreground=p["text"], padding=(12, 10), relief="flat")
+        if hasattr(self, "body_sep"):
+            self.body_sep.configure(bg=p["border"])
+        if hasattr(self, "header_sep1"):
+            self.header_sep1.configure(bg=p["border"])
+        if hasattr(self, "header_sep2"):
+            self.header_sep2.configure(bg=p["border"])
+        if hasattr(self, "header_sep3"):
+            self.header_sep3.configure(bg=p["border"])
+        if hasattr(self, "header_sep4"):
+            self.header_sep4.configure(bg=p["border"])
+        if hasattr(self, "header_sep5"):
+            self.header_sep5.configure(bg=p["border"])
+        if hasattr(self, "header_sep6"):
+            self.header_sep6.configure(bg=p["border"])
+        if hasattr(self, "header_sep7"):
+            self.header_sep7.configure(bg=p["border"])
+        if hasattr(self, "report_bugs_lbl"):
+            self.report_bugs_lbl.config(fg=p["muted"], bg=p["bg"])
+        if hasattr(self, "search_list"):
+            self.search_list.configure(
+                bg=p["panel"], fg=p["text"], selectbackground=p["select"],
+                selectforeground="#FFFFFF" if self._theme_is_dark() else p["text"],
+                highlightbackground=p["border"], highlightcolor=p["border"],
+            )
+
+    def _parse_ui_scale(self) -> float | None:
+        v = (self.var_ui_scale.get() or "").strip()
+        if v.lower() == "auto":
+            return None
+        if v.endswith("%"):
+            try:
+                pct = float(v[:-1])
+                factor = pct / 100.0
+                return (96.0 * factor) / 72.0
+            except Exception:
+                return None
+        return None
+
+    def _apply_scale(self, probe_dpi: bool = True) -> None:
+        forced = self._parse_ui_scale()
+        if forced is not None:
+            self.tk.call("tk", "scaling", forced)
+        elif probe_dpi:
+            dpi = get_windows_dpi()
+            self.tk.call("tk", "scaling", dpi / 72.0)
+        self.update_idletasks()
+        self._update_tree_rowheight()
+
+    def _update_tree_rowheight(self) -> None:
+        linespace = self.base_font.metrics("linespace")
+        self.style.configure("Treeview", rowheight=max(int(linespace + 16), 34))
+
+    def _build_ui(self) -> None:
+        root = ttk.Frame(self, padding=6)
+        root.grid(row=0, column=0, sticky="nsew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        root.columnconfigure(0, weight=1)
+        root.rowconfigure(1, weight=1)
+
+        top = ttk.Frame(root, style="Card.TFrame", padding=6)
+        top.grid(row=0, column=0, sticky="ew")
+        top.columnconfigure(1, weight=1)
+
+        ttk.Label(top, text="VS Code Path", style="Card.TLabel").grid(row=0, column=0, sticky="w")
+        self.entry_vscode_path = ttk.Entry(top, textvariable=self.var_vscode_path)
+        self.entry_vscode_path.grid(row=0, column=1, sticky="ew", padx=(6, 6))
+        ttk.Button(top, text="Browse", command=self._browse_vscode, takefocus=False, cursor="hand2").grid(row=0, column=2, padx=(0, 4))
+        ttk.Button(top, text="Detect", command=self._detect_vscode, takefocus=False, cursor="hand2").grid(row=0, column=3)
+
+        ttk.Label(top, text="Base Dir", style="Card.TLabel").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.entry_base_dir = ttk.Entry(top, textvariable=self.var_base_dir)
+        self.entry_base_dir.grid(row=1, column=1, sticky="ew", padx=(6, 6), pady=(6, 0))
+        ttk.Button(top, text="Browse", command=self._browse_base, takefocus=False, cursor="hand2").grid(row=1, column=2, padx=(0, 4), pady=(6, 0))
+
+        self.entry_vscode_path.config(state="disabled")
+        self.entry_base_dir.config(state="disabled")
+
+        # Theme + UI Scale aligned right (compact); Theme: Dark / Light (case-sensitive)
+        right = ttk.Frame(top, style="Card.TFrame")
+        right.grid(row=0, column=4, rowspan=2, sticky="e", padx=(10, 0))
+        ttk.Label(right, text="Theme", style="Card.TLabel").grid(row=0, column=0, sticky="e", padx=(0, 4))
+        theme = ttk.Combobox(right, textvariable=self.var_theme, values=self.THEME_OPTIONS, state="readonly", width=8)
+        theme.grid(row=0, column=1, sticky="e")
+        theme.bind("<<ComboboxSelected>>", lambda _e: self._on_theme_change())
+
+        ttk.Label(right, text="UI Scale", style="Card.TLabel").grid(row=1, column=0, sticky="e", padx=(0, 4), pady=(6, 0))
+        scale = ttk.Combobox(right, textvariable=self.var_ui_scale, values=self.SCALE_OPTIONS, state="readonly", width=8)
+        scale.grid(row=1, column=1, sticky="e", pady=(6, 0))
+        scale.bind("<<ComboboxSelected>>", lambda _e: self._on_scale_change())
+
+        mid = ttk.Frame(root, style="Card.TFrame", padding=8)
+        mid.grid(row=1, column=0, sticky="nsew", pady=(6, 0))
+        mid.columnconfigure(0, weight=1)
+        mid.rowconfigure(0, weight=1)
+
+        body = ttk.Frame(mid)
+        body.grid(row=0, column=0, sticky="nsew")
+        body.columnconfigure(0, weight=1)
+        body.columnconfigure(1, weight=0)
+        body.columnconfigure(2, weight=0)
+        body.rowconfigure(0, weight=1)
+
+        table = ttk.Frame(body, padding=(0, 4))
+        table.grid(row=0, column=0, sticky="nsew")
+        table.columnconfigure(0, weight=1)
+        table.rowconfigure(0, weight=0)
+        table.rowconfigure(1, weight=0)
+        table.rowconfigure(2, weight=1)
+        table.rowconfigure(3, weight=0)
+
+        # Quick-launch search: ranked hits drop down over the table; Enter launches the top one
+        search_frm = ttk.Frame(table)
+        search_frm.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 6))
+        search_frm.columnconfigure(1, weight=1)
+        ttk.Label(search_frm, text="Search").grid(row=0, column=0, sticky="w", padx=(0, 8))
+        self.var_search = tk.StringVar()
+        self.entry_search = ttk.Entry(search_frm, textvariable=self.var_search)
+        self.entry_search.grid(row=0, column=1, sticky="ew")
+        ttk.Label(search_frm, text="Enter launches · Ctrl+K", style="Muted.TLabel").grid(row=0, column=2, sticky="e", padx=(8, 0))
+        self.var_search.trace_add("write", lambda *_a: self._on_search_change())
+        self.entry_search.bind("<FocusIn>", lambda _e: self._sync_search())
+        self.entry_search.bind("<Down>", lambda _e: self._move_search_hit(1))
+        self.entry_search.bind("<Up>", lambda _e: self._move_search_hit(-1))
+        self.entry_search.bind("<Return>", lambda _e: self._launch_search_hit())
+        self.entry_search.bind("<Escape>", lambda _e: self._clear_search())
+        self.bind("<Control-k>", lambda _e: self._focus_search())
+        self.bind("<Control-f>", lambda _e: self._focus_search())
+
+        # Custom header row: titles + vertical separators (title only)
+        header_frm = ttk.Frame(table, style="Card.TFrame")
+        header_frm.grid(row=1, column=0, sticky="ew", pady=(0, 4))
+        header_frm.columnconfigure(0, weight=0, minsize=100)
+        header_frm.columnconfigure(1, weight=0, minsize=2)
+        header_frm.columnconfigure(2, weight=1, minsize=180)
+        header_frm.columnconfigure(3, weight=0, minsize=2)
+        header_frm.columnconfigure(4, weight=1, minsize=180)
+        header_frm.columnconfigure(5, weight=0, minsize=2)
+        header_frm.columnconfigure(6, weight=0, minsize=130)
+        header_frm.columnconfigure(7, weight=0, minsize=2)
+        header_frm.columnconfigure(8, weight=0, minsize=130)
+        header_frm.columnconfigure(9, weight=0, minsize=2)
+        header_frm.columnconfigure(10, weight=0, minsize=90)
+        header_frm.columnconfigure(11, weight=0, minsize=2)
+        header_frm.columnconfigure(12, weight=0, minsize=120)
+        header_frm.columnconfigure(13, weight=0, minsize=2)
+        header_frm.columnconfigure(14, weight=0, minsize=130)
+        ttk.Label(header_frm, text="Profile", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=0, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep1 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep1.grid(row=0, column=1, sticky="ns")
+        self.header_sep1.grid_propagate(False)
+        ttk.Label(header_frm, text="User Data Dir", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=2, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep2 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep2.grid(row=0, column=3, sticky="ns")
+        self.header_sep2.grid_propagate(False)
+        ttk.Label(header_frm, text="Extensions Dir", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=4, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep3 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep3.grid(row=0, column=5, sticky="ns")
+        self.header_sep3.grid_propagate(False)
+        ttk.Label(header_frm, text="User Data Size", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=6, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep4 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep4.grid(row=0, column=7, sticky="ns")
+        self.header_sep4.grid_propagate(False)
+        ttk.Label(header_frm, text="Ext Size", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=8, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep5 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep5.grid(row=0, column=9, sticky="ns")
+        self.header_sep5.grid_propagate(False)
+        ttk.Label(header_frm, text="Running", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=10, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep6 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep6.grid(row=0, column=11, sticky="ns")
+        self.header_sep6.grid_propagate(False)
+        ttk.Label(header_frm, text="Start p50 / p95", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=12, sticky="w", padx=(12, 8), pady=6)
+        self.header_sep7 = tk.Frame(header_frm, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.header_sep7.grid(row=0, column=13, sticky="ns")
+        self.header_sep7.grid_propagate(False)
+        ttk.Label(header_frm, text="Ext Startup", style="Card.TLabel", font=(self.base_font.cget("family"), self.base_font.cget("size"), "bold")).grid(row=0, column=14, sticky="w", padx=(12, 8), pady=6)
+
+        cols = ("name", "user_data", "extensions", "ud_size", "ex_size", "running", "latency", "ext_cost")
+        self.tree = ttk.Treeview(table, columns=cols, show="headings", height=10, takefocus=False)
+        self.tree.grid(row=2, column=0, sticky="nsew")
+        # Hide the native heading row (no text + zero height via style not possible, so we use show="" after setting columns)
+        self.tree["show"] = ""  # custom header above
+        self.tree.column("name", width=100, minwidth=80, stretch=False, anchor="w")
+        self.tree.column("user_data", width=280, minwidth=180, stretch=True, anchor="w")
+        self.tree.column("extensions", width=280, minwidth=180, stretch=True, anchor="w")
+        self.tree.column("ud_size", width=130, minwidth=100, stretch=False, anchor="e")
+        self.tree.column("ex_size", width=130, minwidth=100, stretch=False, anchor="e")
+        self.tree.column("running", width=90, minwidth=70, stretch=False, anchor="w")
+        self.tree.column("latency", width=120, minwidth=90, stretch=False, anchor="w")
+        self.tree.column("ext_cost", width=130, minwidth=100, stretch=False, anchor="w")
+
+        self.vsb = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.vsb.set)
+        self.vsb.grid(row=2, column=1, sticky="ns", padx=(6, 0))
+
+        hsb = ttk.Scrollbar(table, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+        hsb.grid(row=3, column=0, sticky="ew", pady=(6, 0))
+
+        self.search_list = tk.Listbox(table, activestyle="none", relief="flat", borderwidth=0, highlightthickness=1, exportselection=False)
+        self.search_list.bind("<ButtonRelease-1>", lambda _e: self._pick_search_hit())
+        self.search_list.bind("<Double-1>", lambda _e: self._launch_search_hit())
+
+        self.tree.bind("<Double-1>", lambda _e: self.launch_selected())
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", lambda _e: self._virtual_schedule())
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self._on_tree_wheel)
+        for seq in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.tree.bind(seq, self._on_tree_key)
+
+        self.body_sep = tk.Frame(body, width=2, bg=self.palette["border"], highlightthickness=0)
+        self.body_sep.grid(row=0, column=1, sticky="ns", padx=(4, 4))
+        self.body_sep.grid_propagate(False)
+
+        rail = ttk.Frame(body, width=130)
+        rail.grid(row=0, column=2, sticky="ns", padx=(4, 0))
+        rail.grid_propagate(False)
+
+        def rbtn(text, cmd, style="TButton", pady=(0, 4)):
+            b = ttk.Button(rail, text=text, command=cmd, style=style, takefocus=False, cursor="hand2")
+            b.pack(fill="x", pady=pady)
+            return b
+
+        rbtn("Launch", self.launch_selected, style="Accent.TButton", pady=(0, 4))
+        rbtn("Launch Set…", self.open_launch_sets)
+        rbtn("Add", self.add_profile)
+        rbtn("Edit", self.edit_profile)
+        rbtn("Clone", self.clone_selected)
+        rbtn("Purge Caches", self.purge_caches)
+        rbtn("Sync Settings…", self.sync_settings)
+        rbtn("Snapshots…", self.open_snapshots)
+        rbtn("Export…", self.export_selected)
+        rbtn("Import…", self.import_archive)
+        rbtn("Extensions…", self.show_extensions)
+        rbtn("Extension Sets…", self.converge_extensions)
+        rbtn("Delete", self.delete_profile, style="Danger.TButton", pady=(0, 4))
+
+        ttk.Separator(rail).pack(fill="x", pady=(4, 6))
+
+        rbtn("Open User Data", self.open_user_data)
+        rbtn("Open Extensions", self.open_extensions)
+        rbtn("Open Base Dir", self.open_base_dir, pady=(0, 4))
+
+        ttk.Separator(rail).pack(fill="x", pady=(4, 6))
+
+        rbtn("Save Config", self.save_config)
+        rbtn("Reload", self.reload_config, pady=(0, 0))
+
+        status = ttk.Frame(root, padding=(2, 4, 2, 0))
+        status.grid(row=2, column=0, sticky="ew")
+        status.columnconfigure(0, weight=1)
+        ttk.Label(status, textvariable=self.status, style="Muted.TLabel").grid(row=0, column=0, sticky="w")
+        self.report_bugs_lbl = tk.Label(
+            status,
+            text="Report Bugs?",
+            fg=self.palette["muted"],
+            bg=self.palette["bg"],
+            cursor="hand2",
+            font=(self.base_font.cget("family"), self.base_font.cget("size")),
+        )
+        self.btn_cancel_tasks = ttk.Button(status, text="Cancel", command=self.tasks.cancel_all, takefocus=False, cursor="hand2")
+        # gridded by _on_tasks_active while background tasks run
+        self.report_bugs_lbl.grid(row=0, column=2, sticky="e")
+        self.report_bugs_lbl.bind("<Enter>", self._report_bugs_enter)
+        self.report_bugs_lbl.bind("<Leave>", self._report_bugs_leave)
+        self.report_bugs_lbl.bind("<Button-1>", lambda _e: ReportBugsDialog(self))
+
+    VIRTUAL_THRESHOLD = 2000  # above this many profiles only the visible rows are materialized
+
+    def _refresh_list(self, select: str | None = None):
+        """Bring the table in line with the config: rows keyed by profile name are inserted, updated
+        or deleted as needed, keeping selection and scroll. `select` names a row to select instead."""
+        if self._fill_job:
+            self.after_cancel(self._fill_job)
+            self._fill_job = None
+        self.profiles = self.cm.get_profiles()
+        self._search_stale = True
+        virtual = len(self.profiles) > self.VIRTUAL_THRESHOLD
+        if virtual != self._virtual:
+            self._set_virtual(virtual)
+        if virtual:
+            self._virtual_refresh(select)
+        else:
+            self._diff_rows(select)
+        if self.var_search.get().strip():
+            self._on_search_change()
+        if self._startup_done:
+            self.scan_disk_usage()  # mtime cache: unchanged profiles come back almost at once
+            self.scan_extension_costs()
+
+    FILL_CHUNK = 200  # rows per event-loop turn; large configs don't block the first paint
+
+    def _fill_rows(self, start: int) -> None:
+        self._fill_job = None
+        end = start + self.FILL_CHUNK
+        for p in self.profiles[start:end]:
+            self.tree.insert("", "end", iid=p.name, values=self._row_values(p))
+        if end < len(self.profiles):
+            self._fill_job = self.after(1, lambda: self._fill_rows(end))
+
+    def _diff_rows(self, select: str | None) -> None:
+        keep = {p.name for p in self.profiles}
+        gone = [iid for iid in self.tree.get_children() if iid not in keep]
+        if gone:
+            self.tree.delete(*gone)
+        if not self.tree.get_children():
+            self._fill_rows(0)  # first fill: chunked
+        else:
+            # rows are sorted by name and names never change in place (rename = delete + insert),
+            # so surviving rows are already in order and new rows go in at their final index
+            for i, p in enumerate(self.profiles):
+                values = self._row_values(p)
+                if not self.tree.exists(p.name):
+                    self.tree.insert("", i, iid=p.name, values=values)
+                elif tuple(str(v) for v in self.tree.item(p.name, "values")) != values:
+                    self.tree.item(p.name, values=values)
+        if select and self.tree.exists(select):
+            self.tree.selection_set(select)
+            self.tree.focus(select)
+            self.tree.see(select)
+        elif not self.tree.selection():
+            kids = self.tree.get_children()
+            if kids:
+                self.tree.selection_set(kids[0])
+                self.tree.focus(kids[0])
+
+    # --- Windowed table for large configs ---
+
+    def _set_virtual(self, on: bool) -> None:
+        """Switch modes. Windowed: the scrollbar is driven by _virtual_yview over self.profiles and
+        the selection lives in _v_sel, since rows outside the window do not exist."""
+        self._virtual = on
+        self.tree.delete(*self.tree.get_children())
+        self._v_top = 0
+        self._v_sel = set()
+        self._v_focus = ""
+        if on:
+            self.vsb.configure(command=self._virtual_yview)
+            self.tree.configure(yscrollcommand="")
+        else:
+            self.vsb.configure(command=self.tree.yview)
+            self.tree.configure(yscrollcommand=self.vsb.set)
+
+    def _virtual_refresh(self, select: str | None) -> None:
+        self._v_index = {p.name: i for i, p in enumerate(self.profiles)}
+        if select in self._v_index:
+            self._v_sel = {select}
+            self._v_focus = select
+            self._virtual_reveal(self._v_index[select])
+        else:
+            self._v_sel &= self._v_index.keys()
+            if not self._v_sel and self.profiles:
+                self._v_sel = {self.profiles[0].name}
+            if self._v_focus not in self._v_index:
+                self._v_focus = min(self._v_sel, key=self._v_index.__getitem__, default="")
+        self._virtual_render()
+
+    def _virtual_rows(self) -> int:
+        rowheight = int(self.style.lookup("Treeview", "rowheight") or 34)
+        return max(1, self.tree.winfo_height() // rowheight + 1)
+
+    def _virtual_reveal(self, i: int) -> None:
+        rows = self._virtual_rows() - 1  # the last row may be cut off
+        if i < self._v_top:
+            self._v_top = i
+        elif i >= self._v_top + rows:
+            self._v_top = i - rows + 1
+
+    def _virtual_render(self) -> None:
+        self._v_render_job = None
+        n = len(self.profiles)
+        rows = self._virtual_rows()
+        self._v_top = max(0, min(self._v_top, n - rows + 1))
+        window = self.profiles[self._v_top:self._v_top + rows]
+        self.tree.delete(*self.tree.get_children())
+        for p in window:
+            self.tree.insert("", "end", iid=p.name, values=self._row_values(p))
+        visible = [p.name for p in window if p.name in self._v_sel]
+        self.tree.selection_set(visible)
+        if self.tree.exists(self._v_focus):
+            self.tree.focus(self._v_focus)
+        if n:
+            self.vsb.set(self._v_top / n, (self._v_top + len(window)) / n)
+        else:
+            self.vsb.set(0, 1)
+
+    def _virtual_schedule(self) -> None:
+        if self._virtual and not self._v_render_job:
+            self._v_render_job = self.after_idle(self._virtual_render)
+
+    def _virtual_yview(self, *args) -> None:
+        n = len(self.profiles)
+        if args[0] == "moveto":
+            self._v_top = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            step = self._virtual_rows() - 1 if args[2] == "pages" else 1
+            self._v_top += int(args[1]) * max(1, step)
+        self._virtual_render()
+
+    def _on_tree_select(self, _e=None) -> None:
+        if not self._virtual:
+            return
+        visible = set(self.tree.get_children())
+        self._v_sel = (self._v_sel - visible) | set(self.tree.selection())
+        self._v_focus = self.tree.focus() or self._v_focus
+
+    def _on_tree_wheel(self, e):
+        if not self._virtual:
+            return None
+        up = e.num == 4 or getattr(e, "delta", 0) > 0
+        self._virtual_yview("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def _on_tree_key(self, e):
+        if not self._virtual or not self.profiles:
+            return None
+        n = len(self.profiles)
+        page = self._virtual_rows() - 1
+        delta = {"Up": -1, "Down": 1, "Prior": -page, "Next": page, "Home": -n, "End": n}[e.keysym]
+        i = max(0, min(n - 1, self._v_index.get(self._v_focus, 0) + delta))
+        self._v_focus = self.profiles[i].name
+        self._v_sel = {self._v_focus}
+        self._virtual_reveal(i)
+        self._virtual_render()
+        return "break"
+
+    def _reveal_profile(self, name: str) -> None:
+        """Select and scroll to a profile row in either table mode."""
+        if self._virtual:
+            if name in self._v_index:
+                self._v_sel = {name}
+                self._v_focus = name
+                self._virtual_reveal(self._v_index[name])
+                self._virtual_render()
+        elif self.tree.exists(name):
+            self.tree.selection_set(name)
+            self.tree.focus(name)
+            self.tree.see(name)
+
+    # --- Quick-launch search (search.py) ---
+
+    SEARCH_LIST_ROWS = 8
+
+    def _sync_search(self) -> None:
+        if self._search_stale:
+            self.search.sync(self.profiles)  # only changed profiles are re-indexed
+            self._search_stale = False
+
+    def _focus_search(self) -> str:
+        self.entry_search.focus_set()
+        self.entry_search.select_range(0, "end")
+        return "break"
+
+    def _on_search_change(self) -> None:
+        self._sync_search()
+        self._search_hits = self.search.query(self.var_search.get(), limit=self.SEARCH_LIST_ROWS * 4)
+        self.search_list.delete(0, "end")
+        if not self._search_hits:
+            self.search_list.place_forget()
+            return
+        for name in self._search_hits:
+            p = self.cm.get_profile(name)
+            self.search_list.insert("end", describe(p) if p else name)
+        self.search_list.configure(height=min(len(self._search_hits), self.SEARCH_LIST_ROWS))
+        self.search_list.place(in_=self.tree, x=0, y=0, relwidth=1.0)
+        self.search_list.lift()
+        self.search_list.selection_set(0)
+        self._reveal_profile(self._search_hits[0])
+
+    def _move_search_hit(self, delta: int) -> str:
+        if self._search_hits:
+            cur = self.search_list.curselection()
+            i = max(0, min(len(self._search_hits) - 1, (cur[0] if cur else 0) + delta))
+            self.search_list.selection_clear(0, "end")
+            self.search_list.selection_set(i)
+            self.search_list.see(i)
+            self._reveal_profile(self._search_hits[i])
+        return "break"
+
+    def _pick_search_hit(self) -> None:
+        cur = self.search_list.curselection()
+        if cur:
+            self._reveal_profile(self._search_hits[cur[0]])
+
+    def _launch_search_hit(self) -> str:
+        """Launch the highlighted hit (top one by default) through launch_selected()."""
+        if self._search_hits:
+            cur = self.search_list.curselection()
+            self._reveal_profile(self._search_hits[cur[0] if cur else 0])
+            self._clear_search()
+            self.launch_selected()
+        return "break"
+
+    def _clear_search(self) -> str:
+        self.var_search.set("")
+        self.tree.focus_set()
+        return "break"
+
+    def _selected_names(self) -> list[str]:
+        if self._virtual:
+            return sorted(self._v_sel, key=lambda name: self._v_index.get(name, 0))
+        return list(self.tree.selection())
+
+    def _row_values(self, p: Profile) -> tuple:
+        usage = self.disk_usage.results.get(p.name, {})
+        return (
+            p.name,
+            p.user_data,
+            p.extensions,
+            fmt_usage(*usage["user_data"]) if "user_data" in usage else "",
+            fmt_usage(*usage["extensions"]) if "extensions" in usage else "",
+            self._running_label(p),
+            self.latency.stats(p.name).label(),
+            self.ext_costs[p.name].label() if p.name in self.ext_costs else "",
+        )
+
+    def _running_label(self, p: Profile) -> str:
+        pids = self.processes.pids(p.user_data)
+        return f"● {len(pids)} pids" if pids else ""
+
+    # --- Disk usage (diskusage.py) ---
+
+    def scan_disk_usage(self) -> None:
+        """Background scan; rows update as partial results arrive."""
+        self.status.set("Scanning disk usage…")
+        self.disk_usage.scan(
+            list(self.profiles),
+            lambda *r: self.run_on_ui(lambda: self._on_disk_usage(*r)),
+            lambda secs: self.run_on_ui(lambda: self._disk_usage_done(secs)),
+        )
+
+    def _disk_usage_done(self, secs: float) -> None:
+        self.status.set(f"Disk usage scanned in {secs:.1f} s")
+        events.emit("disk_scan", profiles=len(self.profiles), ms=round(secs * 1000.0, 1))
+
+    def _on_disk_usage(self, name: str, kind: str, nbytes: int, files: int, done: bool) -> None:
+        if not self.tree.exists(name):
+            return
+        col = "ud_size" if kind == "user_data" else "ex_size"
+        self.tree.set(name, col, fmt_usage(nbytes, files) + ("" if done else " …"))
+
+    # --- Extension startup cost (activation.py) ---
+
+    def scan_extension_costs(self) -> None:
+        """Background estimate per profile; inventory and measurements are cached, so reruns are cheap."""
+        profiles = list(self.profiles)
+
+        def work(_t: Task) -> list[ProfileCost]:
+            from activation import CostAnalyzer
+            from inventory import Inventory
+            if self.inventory is None:
+                self.inventory = Inventory()
+            if self.ext_cost is None:
+                self.ext_cost = CostAnalyzer(self.inventory)
+            return self.ext_cost.analyze(profiles)
+
+        self.tasks.submit("Extension startup cost", work, on_done=self._ext_costs_done)
+
+    def _ext_costs_done(self, results: list[ProfileCost]) -> None:
+        for r in results:
+            self.ext_costs[r.name] = r
+            if self.tree.exists(r.name):
+                self.tree.set(r.name, "ext_cost", r.label())
+        events.emit("extension_cost_scan", profiles=len(results), ms=round(self.ext_cost.elapsed * 1000.0, 1) if self.ext_cost else 0.0)
+
+    # --- Running instances (processes.py) ---
+
+    def _on_processes(self) -> None:
+        for name in self.tree.get_children():
+            p = self.cm.get_profile(name)
+            if p:
+                self.tree.set(name, "running", self._running_label(p))
+
+    # --- Launch-to-ready latency (latency.py) ---
+
+    def _on_latency_loaded(self) -> None:
+        for name in self.tree.get_children():
+            self._show_latency(name)
+
+    def _show_latency(self, name: str) -> None:
+        if self.tree.exists(name):
+            self.tree.set(name, "latency", self.latency.stats(name).label())
+
+    def _on_latency(self, name: str, stats: LatencyStats) -> None:
+        self._show_latency(name)
+        s = stats.last.get("s") if stats.last else None
+        self.metrics.counters.observe_ready(name, s)
+        if s is None:
+            self.status.set(f"{name} not ready within {self.cm.get_int('launch_ready_timeout')} s")
+        else:
+            self.status.set(f"{name} ready in {s:.1f} s (p50 {stats.p50:.1f} s, p95 {stats.p95:.1f} s)")
+
+    # --- Prometheus textfile (metrics.py) ---
+
+    def _configure_metrics(self) -> None:
+        path = self.cm.get_app().get("metrics_textfile", "").strip()
+        self.metrics.configure(norm(path) if path else "", self.cm.get_int("metrics_interval_s"))
+
+    def _metrics_snapshot(self) -> Snapshot:
+        """Runs on the exporter thread: only reads state the other workers already keep current."""
+        snap = Snapshot(list(self.profiles))
+        snap.disk = self.disk_usage.snapshot()
+        for p in snap.profiles:
+            pids = self.processes.pids(p.user_data)
+            if pids:
+                snap.pids[p.name] = pids
+        snap.latency = self.latency
+        return snap
+
+    # --- Background tasks (tasks.py) ---
+
+    def _on_tasks_active(self, count: int) -> None:
+        if not hasattr(self, "btn_cancel_tasks"):
+            return
+        if count:
+            self.btn_cancel_tasks.grid(row=0, column=1, sticky="e", padx=(8, 8))
+        else:
+            self.btn_cancel_tasks.grid_remove()
+
+    # --- Worker → Tk marshaling ---
+
+    UI_PUMP_MS = 50
+
+    def run_on_ui(self, fn) -> None:
+        """Thread-safe: queue fn to run on the Tk thread (Tk itself must only be touched there)."""
+        self._ui_calls.put(fn)
+
+    def _pump_ui(self) -> None:
+        deadline = time.perf_counter() + 0.02  # keep the loop responsive under a burst of results
+        while time.perf_counter() < deadline:
+            try:
+                fn = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn()
+            except Exception as e:  # one failing result callback must not stop the pump
+                events.error("ui_callback_error", e)
+                self.report_callback_exception(type(e), e, e.__traceback__)
+        self.after(self.UI_PUMP_MS, self._pump_ui)
+
+    def selected_profile(self) -> Profile | None:
+        sel = self._selected_names()
+        if not sel:
+            return None
+        return self.cm.get_profile(sel[0])  # row iid is the profile name
+
+    def _browse_vscode(self):
+        if os_name() == "Windows":
+            fp = filedialog.askopenfilename(
+                title="Select VS Code executable (Code.exe)",
+                filetypes=[("VS Code", "Code.exe"), ("Executable", "*.exe"), ("All files", "*.*")]
+            )
+        else:
+            fp = filedialog.askopenfilename(title="Select VS Code launcher/binary (code)")
+        if fp:
+            self.entry_vscode_path.config(state="normal")
+            self.var_vscode_path.set(norm(fp))
+            self.entry_vscode_path.config(state="disabled")
+
+    def _install_hints(self) -> list[str]:
+        """Configured and pinned exes, so the index always knows about them."""
+        return [self.var_vscode_path.get()] + [p.vscode for p in self.profiles if p.vscode]
+
+    def _detect_vscode(self):
+        hints = self._install_hints()
+
+        def work(_t: Task) -> InstallIndex:
+            index = InstallIndex()
+            with events.timed("install_scan") as ev:
+                index.discover(hints)  # explicit Detect: full rescan
+                ev["installs"] = len(index.installs)
+            return index
+
+        self.tasks.submit("Detecting VS Code installs", work, on_done=self._detect_done)
+
+    def _detect_done(self, index: InstallIndex) -> None:
+        self.installs = index
+        p = self.installs.default_exe()
+        if p:
+            self.entry_vscode_path.config(state="normal")
+            self.var_vscode_path.set(norm(p))
+            self.entry_vscode_path.config(state="disabled")
+            n = len(self.installs.installs)
+            self.status.set(f"Detected VS Code: {p}" + (f" ({n} installs found)" if n > 1 else ""))
+        else:
+            messagebox.showwarning(APP_NAME, "Could not auto-detect VS Code.")
+
+    def _browse_base(self):
+        d = filedialog.askdirectory(title="Select Base Directory")
+        if d:
+            self.entry_base_dir.config(state="normal")
+            self.var_base_dir.set(norm(d))
+            self.entry_base_dir.config(state="disabled")
+
+    def _on_theme_change(self):
+        self.palette = self._palette_dark() if self._theme_is_dark() else self._palette_light()
+        self._apply_style()
+        self._apply_scale()
+
+    def _on_scale_change(self):
+        self._apply_scale()
+        self._apply_style()  # Reapply styles so fonts/row heights reflect new scaling
+        d = SaveAndRelaunchConfirmDialog(self)
+        self.wait_window(d)
+        if not d.confirmed:
+            return
+        self._write_config_to_disk()
+        self._relaunch()
+
+    def add_profile(self):
+        ed = ProfileEditor(self, "Add Profile", None, self.var_base_dir.get(), self.installs.installs)
+        self.wait_window(ed)
+        if ed.result:
+            if self.cm.get_profile(ed.result.name):
+                messagebox.showerror(APP_NAME, "Profile name already exists.")
+                return
+            self.cm.upsert_profile(ed.result)
+            self._refresh_list(select=self.cm.get_profile(ed.result.name).name)
+
+    def edit_profile(self):
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        ed = ProfileEditor(self, "Edit Profile", p, self.var_base_dir.get(), self.installs.installs)
+        self.wait_window(ed)
+        if ed.result:
+            other = self.cm.get_profile(ed.result.name)
+            if other and other.name.lower() != p.name.lower():
+                messagebox.showerror(APP_NAME, "Another profile with that name already exists.")
+                return
+            if ed.result.name != p.name:
+                self.cm.delete_profile(p.name)
+            self.cm.upsert_profile(ed.result)
+            self._refresh_list(select=self.cm.get_profile(ed.result.name).name)
+
+    def clone_selected(self):
+        """Clone the selected profile's data into a new profile (worker thread, progress in status)."""
+        src = self.selected_profile()
+        if not src:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        base_dir = self.var_base_dir.get()
+        name = f"{src.name}-copy"
+        initial = Profile(name, *default_profile_dirs(base_dir, name), src.vscode)
+        ed = ProfileEditor(self, f"Clone {src.name}", initial, base_dir, self.installs.installs)
+        self.wait_window(ed)
+        dst = ed.result
+        if not dst:
+            return
+        if self.cm.get_profile(dst.name):
+            messagebox.showerror(APP_NAME, "Profile name already exists.")
+            return
+
+        last = [0.0]
+
+        def work(task: Task) -> CloneReport:
+            from clone import clone_profile
+
+            def progress(done: int, total: int) -> None:
+                now = time.monotonic()
+                if now - last[0] >= 0.2:
+                    last[0] = now
+                    task.report(f"Cloning {src.name} → {dst.name}: {human_bytes(done)} / {human_bytes(total)}")
+
+            return clone_profile(src, dst, progress, lambda: task.cancelled)
+
+        self.tasks.submit(
+            f"Clone {src.name} → {dst.name}",
+            work,
+            on_done=lambda report: self._clone_done(dst, report),
+            on_error=lambda e: messagebox.showerror(APP_NAME, f"Clone failed:\n\n{e}"),
+            status=f"Cloning {src.name} → {dst.name}…",
+        )
+
+    def purge_caches(self) -> None:
+        """Purge cache dirs of the selected (or all) profiles on a worker pool (purge.py)."""
+        import purge
+        d = PurgeConfirmDialog(self, len(self.selected_profiles()))
+        self.wait_window(d)
+        if not d.scope:
+            return
+        targets = self.selected_profiles() if d.scope == "selected" else list(self.profiles)
+        total = len(targets)
+        done = [0]
+
+        def work(task: Task) -> list[str]:
+            def on_result(r: purge.PurgeResult) -> None:
+                done[0] += 1
+                task.report(f"Purge: {r.describe()} ({done[0]}/{total})")
+
+            t0 = time.perf_counter()
+            results = purge.purge_profiles(targets, on_result=on_result, tracker=self.processes, cancelled=lambda: task.cancelled)
+            return purge.summary(results, time.perf_counter() - t0)
+
+        self.tasks.submit("Purge caches", work, on_done=self._purge_done, status=f"Purging caches of {total} profiles…")
+
+    def _purge_done(self, lines: list[str]) -> None:
+        events.emit("purge", summary=lines[-1], profiles=len(lines) - 1)
+        self.status.set(lines[-1])
+        self.scan_disk_usage()
+        InfoDialog(self, "Purge caches", "\n".join(lines))
+
+    def _clone_done(self, dst: Profile, report: CloneReport) -> None:
+        events.emit("clone", profile=dst.name, files=report.files, bytes=report.bytes, ms=round(report.elapsed * 1000.0, 1),
+                    reflinked=report.reflinked, hardlinked=report.hardlinked, copied=report.copied, errors=len(report.errors))
+        self.cm.upsert_profile(dst)
+        self._refresh_list(select=self.cm.get_profile(dst.name).name)
+        self.status.set(f"Cloned into {dst.name} ({human_bytes(report.throughput())}/s). Use Save Config to keep it.")
+        InfoDialog(self, f"Cloned {dst.name}", "\n".join(report.lines()))
+
+    def sync_settings(self) -> None:
+        """Propagate settings / keybindings / snippets from the selected profile (settingsync.py)."""
+        import settingsync
+        src = self.selected_profile()
+        if not src:
+            messagebox.showinfo(APP_NAME, "Select the profile to copy from first.")
+            return
+        others = [p.name for p in self.profiles if p.name != src.name]
+        if not others:
+            messagebox.showinfo(APP_NAME, "No other profiles to sync to.")
+            return
+        d = SyncSettingsDialog(self, src.name, others, [p.name for p in self.selected_profiles() if p.name != src.name])
+        self.wait_window(d)
+        if not d.result:
+            return
+        opts = d.result
+        targets = [p for p in map(self.cm.get_profile, opts.pop("targets")) if p]
+        total = len(targets)
+        done = [0]
+
+        def work(task: Task) -> list[str]:
+            def on_result(r: settingsync.SyncResult) -> None:
+                done[0] += 1
+                task.report(f"Sync: {r.describe()} ({done[0]}/{total})")
+
+            t0 = time.perf_counter()
+            results = settingsync.sync_settings(src, targets, on_result=on_result, cancelled=lambda: task.cancelled, **opts)
+            return settingsync.summary(results, time.perf_counter() - t0, opts["dry_run"])
+
+        self.tasks.submit(
+            f"Sync settings from {src.name}",
+            work,
+            on_done=lambda lines: self._sync_done(src.name, lines, opts["dry_run"]),
+            status=f"Syncing settings from {src.name} to {total} profiles…",
+        )
+
+    def _sync_done(self, source: str, lines: list[str], dry_run: bool) -> None:
+        events.emit("settings_sync", source=source, summary=lines[-1], dry_run=dry_run)
+        self.status.set(lines[-1])
+        if len(lines) > 41:
+            lines = lines[:40] + ["…", lines[-1]]
+        InfoDialog(self, "Settings preview" if dry_run else "Settings synced", "\n".join(lines))
+
+    def open_snapshots(self) -> None:
+        """List the selected profile's snapshots off the Tk thread (manifests can be large), then ask."""
+        import snapshots
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        base_dir = self.var_base_dir.get()
+        self.tasks.submit(
+            f"Snapshots of {p.name}",
+            lambda _t: snapshots.list_snapshots(base_dir, p.name),
+            on_done=lambda snaps: self._snapshot_action(p, base_dir, snaps),
+            status=f"Reading snapshots of {p.name}…",
+        )
+
+    def _snapshot_action(self, p: Profile, base_dir: str, snaps: list[SnapshotInfo]) -> None:
+        import snapshots
+        d = SnapshotDialog(self, p.name, snaps)
+        self.wait_window(d)
+        if not d.action:
+            return
+        kind, snap = d.action
+        last = [0.0]
+
+        def progress(task: Task, verb: str):
+            def report(done: int, total: int) -> None:
+                now = time.monotonic()
+                if now - last[0] >= 0.2:
+                    last[0] = now
+                    task.report(f"{verb} {p.name}: {done} / {total} files")
+            return report
+
+        if kind == "take":
+            self.tasks.submit(
+                f"Snapshot {p.name}",
+                lambda task: snapshots.snapshot_profile(p, base_dir, progress(task, "Snapshot"), lambda: task.cancelled),
+                on_done=self._snapshot_done,
+                on_error=lambda e: messagebox.showerror(APP_NAME, f"Snapshot failed:\n\n{e}"),
+                status=f"Taking snapshot of {p.name}…",
+            )
+        elif kind == "restore":
+            self.tasks.submit(
+                f"Restore {p.name}",
+                lambda task: snapshots.restore_profile(p, base_dir, snap.id, running=bool(self.processes.pids(p.user_data)),
+                                                       on_progress=progress(task, "Restore"), cancelled=lambda: task.cancelled),
+                on_done=self._restore_done,
+                on_error=lambda e: messagebox.showerror(APP_NAME, f"Restore failed:\n\n{e}"),
+                status=f"Restoring {p.name} from {snap.id}…",
+            )
+        else:
+            self.tasks.submit(
+                f"Delete snapshot {snap.id}",
+                lambda _t: snapshots.delete_snapshot(base_dir, snap),
+                on_done=lambda r: self.status.set(f"Deleted snapshot {snap.id}; {r[0]} unused chunks removed ({human_bytes(r[1])})"),
+                on_error=lambda e: messagebox.showerror(APP_NAME, f"Delete failed:\n\n{e}"),
+                status=f"Deleting snapshot {snap.id}…",
+            )
+
+    def _snapshot_done(self, report: SnapshotReport) -> None:
+        events.emit("snapshot", profile=report.name, id=report.id, files=report.files, chunked=report.chunked,
+                    new_chunks=report.new_chunks, new_bytes=report.new_bytes, ms=round(report.elapsed * 1000.0, 1),
+                    live=report.live, errors=len(report.errors))
+        self.status.set(f"Snapshot of {report.name}: +{human_bytes(report.new_bytes)} stored")
+        InfoDialog(self, f"Snapshot {report.name}", "\n".join(report.lines()))
+
+    def _restore_done(self, report: RestoreReport) -> None:
+        events.emit("restore", profile=report.name, id=report.id, written=report.written, bytes=report.bytes,
+                    removed=report.removed, refused=report.refused, ms=round(report.elapsed * 1000.0, 1), errors=len(report.errors))
+        self.status.set(report.lines()[0])
+        if report.written or report.removed:
+            self.scan_disk_usage()
+        InfoDialog(self, f"Restore {report.name}", "\n".join(report.lines()))
+
+    def export_selected(self) -> None:
+        """Stream the selected profile into an archive (archive.py) on a worker thread."""
+        import archive
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        path = filedialog.asksaveasfilename(
+            title=f"Export {p.name}",
+            initialfile=p.name + archive.ARCHIVE_SUFFIX,
+            defaultextension=archive.ARCHIVE_SUFFIX,
+            filetypes=[("Profile archive", f"*{archive.ARCHIVE_SUFFIX}"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        last = [0.0]
+
+        def work(task: Task) -> ExportReport:
+            def progress(done: int, total: int) -> None:
+                now = time.monotonic()
+                if now - last[0] >= 0.2:
+                    last[0] = now
+                    task.report(f"Exporting {p.name}: {human_bytes(done)} / {human_bytes(total)}")
+
+            return archive.export_to_path(p, path, on_progress=progress, cancelled=lambda: task.cancelled)
+
+        self.tasks.submit(
+            f"Export {p.name}",
+            work,
+            on_done=lambda report: self._export_done(path, report),
+            on_error=lambda e: messagebox.showerror(APP_NAME, f"Export failed:\n\n{e}"),
+            status=f"Exporting {p.name}…",
+        )
+
+    def _export_done(self, path: str, report: ExportReport) -> None:
+        events.emit("export", profile=report.name, files=report.files, bytes=report.bytes, archive_bytes=report.archive_bytes,
+                    ms=round(report.elapsed * 1000.0, 1), errors=len(report.errors))
+        self.status.set(f"Exported {report.name} to {path} ({human_bytes(report.throughput())}/s)")
+        InfoDialog(self, f"Exported {report.name}", "\n".join([path] + report.lines()))
+
+    def import_archive(self) -> None:
+        """Pick an archive, read its header off the Tk thread, then confirm name and folders."""
+        import archive
+        path = filedialog.askopenfilename(
+            title="Import profile archive",
+            filetypes=[("Profile archive", f"*{archive.ARCHIVE_SUFFIX}"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        def work(_t: Task) -> dict:
+            with open(path, "rb") as f:
+                return archive.read_header(f)
+
+        self.tasks.submit(
+            f"Read {path}",
+            work,
+            on_done=lambda header: self._import_confirm(path, header),
+            on_error=lambda e: messagebox.showerror(APP_NAME, f"Could not read archive:\n\n{e}"),
+        )
+
+    def _import_confirm(self, path: str, header: dict) -> None:
+        import archive
+        base_dir = self.var_base_dir.get()
+        name = header.get("profile", "") or "imported"
+        if self.cm.get_profile(name):
+            name = f"{name}-imported"
+        pinned = header.get("vscode", "")
+        pinned = pinned if pinned and is_executable_path(norm(pinned)) else ""
+        ed = ProfileEditor(self, f"Import {header.get('profile', '')}", Profile(name, *default_profile_dirs(base_dir, name), pinned),
+                           base_dir, self.installs.installs)
+        self.wait_window(ed)
+        dst = ed.result
+        if not dst:
+            return
+        if self.cm.get_profile(dst.name):
+            messagebox.showerror(APP_NAME, "Profile name already exists.")
+            return
+        total = header.get("bytes", 0)
+        last = [0.0]
+
+        def work(task: Task) -> ImportReport:
+            def progress(done: int, _total: int) -> None:
+                now = time.monotonic()
+                if now - last[0] >= 0.2:
+                    last[0] = now
+                    task.report(f"Importing {dst.name}: {human_bytes(done)} / {human_bytes(total)}")
+
+            with open(path, "rb") as f:
+                return archive.import_profile(f, dst, progress, lambda: task.cancelled)
+
+        self.tasks.submit(
+            f"Import {dst.name}",
+            work,
+            on_done=lambda report: self._import_done(dst, report),
+            on_error=lambda e: messagebox.showerror(APP_NAME, f"Import failed:\n\n{e}"),
+            status=f"Importing {dst.name}…",
+        )
+
+    def _import_done(self, dst: Profile, report: ImportReport) -> None:
+        events.emit("import", profile=dst.name, files=report.files, bytes=report.bytes, ms=round(report.elapsed * 1000.0, 1),
+                    skipped=report.skipped)
+        self.cm.upsert_profile(dst)
+        self._refresh_list(select=self.cm.get_profile(dst.name).name)
+        self.status.set(f"Imported {dst.name} ({human_bytes(report.throughput())}/s). Use Save Config to keep it.")
+        InfoDialog(self, f"Imported {dst.name}", "\n".join(report.lines()))
+
+    def show_extensions(self) -> None:
+        """Inventory every profile off the Tk thread (cached by folder mtime, so reopening is cheap)."""
+        profiles = list(self.profiles)
+        if not profiles:
+            messagebox.showinfo(APP_NAME, "No profiles yet.")
+            return
+        sel = self.selected_profile()
+        current = sel.name if sel else profiles[0].name
+
+        def work(task: Task) -> list[ProfileInventory]:
+            from inventory import Inventory
+            if self.inventory is None:
+                self.inventory = Inventory()
+            done = [0]
+            last = [0.0]
+
+            def on_result(_inv: ProfileInventory) -> None:
+                done[0] += 1
+                now = time.monotonic()
+                if now - last[0] >= 0.2:
+                    last[0] = now
+                    task.report(f"Reading extensions… {done[0]}/{len(profiles)} profiles")
+            return self.inventory.scan(profiles, on_result=on_result)
+
+        self.tasks.submit(
+            "Extension inventory",
+            work,
+            on_done=lambda invs: self._extensions_done(invs, current),
+            status="Reading extensions…",
+        )
+
+    def _extensions_done(self, inventories: list[ProfileInventory], current: str) -> None:
+        total = sum(len(inv.extensions) for inv in inventories)
+        elapsed = self.inventory.elapsed if self.inventory else 0.0
+        self.status.set(f"{total} extensions across {len(inventories)} profiles ({elapsed * 1000:.0f} ms)")
+        ExtensionsDialog(self, inventories, current, self.ext_costs)
+
+    def converge_extensions(self) -> None:
+        """Plan [extension_sets] for the selected profiles (all when none are selected) off the Tk
+        thread, confirm, then run the code CLI on a bounded pool."""
+        import extsets
+        from inventory import Inventory
+        profiles = self.selected_profiles() or list(self.profiles)
+        vsix_dir = extsets.vsix_dir_for(self.cm)
+
+        def work(_t: Task) -> tuple[list[ProfilePlan], list[str]]:
+            if self.inventory is None:
+                self.inventory = Inventory()
+            vsix = extsets.VsixIndex(vsix_dir)
+            return extsets.plan_profiles(self.cm, profiles, vsix, self.inventory), vsix.problems
+
+        self.tasks.submit("Planning extension sets", work, on_done=lambda r: self._converge_confirm(*r))
+
+    def _converge_confirm(self, plans: list[ProfilePlan], vsix_problems: list[str]) -> None:
+        import extsets
+        if not plans:
+            messagebox.showinfo(APP_NAME, "No [extension_sets] entry in config.ini names these profiles or a launch set they belong to.")
+            return
+        lines = [f"! {m}" for m in vsix_problems] + [line for plan in plans for line in plan.lines()]
+        if len(lines) > 40:
+            lines = lines[:40] + ["…"]
+        todo = [plan for plan in plans if plan.ops]
+        if not todo:
+            InfoDialog(self, "Extension sets", "\n".join(lines + ["Nothing to do."]))
+            return
+        ops = sum(len(plan.ops) for plan in todo)
+        if not messagebox.askyesno(APP_NAME, "\n".join(lines) + f"\n\nRun {ops} operations?"):
+            return
+        default = norm(self.var_vscode_path.get())
+        jobs = self.cm.get_int("extension_jobs")
+
+        def work(task: Task) -> list[str]:
+            done = [0]
+            last = [0.0]
+
+            def on_result(r: OpResult) -> None:
+                done[0] += 1
+                now = time.monotonic()
+                if now - last[0] >= 0.2:
+                    last[0] = now
+                    task.report(f"Extension sets… {done[0]}/{ops} ({r.profile}: {r.op.id})")
+
+            t0 = time.perf_counter()
+            results = extsets.converge(todo, lambda p: p.vscode_for(default), jobs, on_result=on_result, cancelled=lambda: task.cancelled)
+            return extsets.summary(results, time.perf_counter() - t0)
+
+        self.tasks.submit("Extension sets", work, on_done=self._converge_done, status=f"Extension sets… 0/{ops}")
+
+    def _converge_done(self, lines: list[str]) -> None:
+        events.emit("extension_sets", summary=lines[-1], operations=len(lines) - 1)
+        self.status.set(lines[-1])
+        self.scan_disk_usage()
+        self.scan_extension_costs()
+        if len(lines) > 41:
+            lines = lines[:40] + ["…", lines[-1]]
+        InfoDialog(self, "Extension sets", "\n".join(lines))
+
+    def delete_profile(self):
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        d = DeleteConfirmDialog(self, p.name)
+        self.wait_window(d)
+        if not d.confirmed:
+            return
+        self.cm.delete_profile(p.name)
+        self._refresh_list()
+
+    def open_user_data(self):
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        self._open_folder(p.user_data)
+
+    def open_extensions(self):
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+        self._open_folder(p.extensions)
+
+    def open_base_dir(self):
+        self._open_folder(self.var_base_dir.get())
+
+    def _open_folder(self, path: str) -> None:
+        """Create (if needed) and open a folder off the Tk thread; mapped drives can stall."""
+        self.tasks.submit(
+            f"Opening {path}",
+            lambda _t: open_folder_cross_platform(path),
+            on_done=lambda _r: self.status.set(f"Opened {path}"),
+            on_error=lambda e: messagebox.showerror(APP_NAME, f"Could not open folder:\n\n{e}"),
+        )
+
+    def _app_fields(self) -> dict[str, tuple[tk.Variable, Callable[[str], str]]]:
+        """[app] keys edited on top: key -> (variable, canonical form of a value)."""
+        def flag(v: str) -> str:
+            return "0" if str(v).strip() in ("", "0") else "1"
+
+        return {
+            "vscode_path": (self.var_vscode_path, norm),
+            "base_dir": (self.var_base_dir, norm),
+            "open_new_window": (self.var_open_new_window, flag),
+            "reuse_existing_window": (self.var_reuse_existing_window, flag),
+            "extra_args": (self.var_extra_args, lambda v: (v or "").strip()),
+            "theme": (self.var_theme, self._normalize_theme),
+            "ui_scale": (self.var_ui_scale, lambda v: v or "Auto"),
+        }
+
+    def _push_app_edits(self) -> None:
+        """Copy settings edited on top into the config model (only those that differ)."""
+        app = self.cm.get_app()
+        for key, (var, canon) in self._app_fields().items():
+            value = canon(str(var.get()))
+            if value != canon(app.get(key, "")):
+                self.cm.set_app(key, value)
+
+    def _pull_app_values(self, keys) -> None:
+        app = self.cm.get_app()
+        fields = self._app_fields()
+        for key in keys:
+            if key in fields:
+                var, canon = fields[key]
+                value = canon(app.get(key, ""))
+                var.set(int(value) if isinstance(var, tk.IntVar) else value)
+
+    def _write_config_to_disk(self) -> None:
+        """Write current UI state to config file (no dialogs)."""
+        self._push_app_edits()
+        with events.timed("config_save") as ev:
+            written = self.cm.save()
+            ev.update(written=written, profiles=len(self.profiles))
+        self.config_watch.sync()  # our own write is not an external edit
+        self._configure_metrics()
+        self.status.set(f"Saved config: {config_path()}" if written else f"Config unchanged: {config_path()}")
+
+    def _on_config_changed(self) -> None:
+        """config.ini changed on disk: apply the changed keys, keep unsaved edits (reported)."""
+        self._push_app_edits()
+        try:
+            changes = self.cm.reload()
+        except (configparser.Error, OSError) as e:
+            self.status.set(f"Config changed on disk but could not be read: {e}")
+            return
+        if not changes:
+            return
+        events.emit("config_reload", changed={s: sorted(k) for s, k in changes.changed.items()},
+                    conflicts=changes.conflict_lines())
+        app_keys = changes.changed.get("app", set())
+        self._pull_app_values(app_keys)
+        if app_keys & {"theme", "ui_scale"}:
+            self.palette = self._palette_dark() if self._theme_is_dark() else self._palette_light()
+            self._apply_style()
+            self._apply_scale()
+        if "profiles" in changes.changed:
+            self._refresh_list()
+        if app_keys & {"metrics_textfile", "metrics_interval_s"}:
+            self._configure_metrics()
+        self.status.set(f"Config reloaded from disk: {changes.describe()}")
+        if changes.conflicts:
+            InfoDialog(
+                self,
+                "Config changed on disk",
+                "These settings were changed both in the file and here. Your unsaved values were kept; "
+                "Save Config writes them, Reload Config takes the file's.\n\n" + "\n".join(changes.conflict_lines()),
+            )
+
+    def _relaunch(self) -> None:
+        """Start a new process and exit so the new UI scale takes effect."""
+        def work(_t: Task) -> None:
+            cwd = app_dir()
+            if getattr(sys, "frozen", False) and platform.system() == "Windows":
+                os.startfile(sys.executable)
+            else:
+                kwargs = {"cwd": cwd}
+                if platform.system() == "Windows":
+                    kwargs["creationflags"] = getattr(subprocess, "DETACHED_PROCESS", 0x00000008)
+                if getattr(sys, "frozen", False):
+                    subprocess.Popen([sys.executable], **kwargs)
+                else:
+                    subprocess.Popen([sys.executable, os.path.join(app_dir(), "launcher.py")], **kwargs)
+
+        self.tasks.submit(
+            "Relaunching",
+            work,
+            on_done=lambda _r: self.after(600, self._exit_after_relaunch),
+            on_error=lambda _e: InfoDialog(
+                self,
+                "Auto relaunch failed",
+                "Auto relaunch failed. You can manually close and open the program to apply the new UI scale.",
+            ),
+        )
+
+    def _exit_after_relaunch(self) -> None:
+        self.quit()
+        sys.exit(0)
+
+    def save_config(self):
+        d = SaveConfirmDialog(self)
+        self.wait_window(d)
+        if not d.confirmed:
+            return
+        self._write_config_to_disk()
+        d = InfoDialog(self, "Configuration saved", "Your settings have been written to the config file.")
+        self.wait_window(d)
+
+    def reload_config(self):
+        self.cm.load()
+        self.config_watch.sync()
+        self._pull_app_values(self._app_fields())
+        self._configure_metrics()
+
+        self.palette = self._palette_dark() if self._theme_is_dark() else self._palette_light()
+        self._apply_style()
+        self._apply_scale()
+        self._refresh_list()
+        self.status.set(f"Reloaded config: {config_path()}")
+
+    def launch_selected(self):
+        p = self.selected_profile()
+        if not p:
+            messagebox.showinfo(APP_NAME, "Select a profile first.")
+            return
+
+        def reply(err: str | None, _message: str) -> None:
+            if err:
+                messagebox.showerror(APP_NAME, f"Launch failed:\n\n{err}")
+
+        self.launch_profile(p, reply=reply)
+
+    def _launch_argv(self, p: Profile, folder: str | None = None, running: bool = False) -> list[str]:
+        """argv from the live (possibly unsaved) settings on top."""
+        return build_launch_args(
+            p.vscode_for(norm(self.var_vscode_path.get())),
+            p,
+            bool(self.var_open_new_window.get()),
+            bool(self.var_reuse_existing_window.get()),
+            self.var_extra_args.get(),
+            folder=folder,
+            running=running,
+        )
+
+    # --- Launch sets (launchsets.py) ---
+
+    def selected_profiles(self) -> list[Profile]:
+        return [p for p in map(self.cm.get_profile, self._selected_names()) if p]
+
+    def open_launch_sets(self) -> None:
+        d = LaunchSetDialog(self, [p.name for p in self.selected_profiles()])
+        self.wait_window(d)
+        if d.launch:
+            self.launch_set(d.launch)
+
+    def launch_set(self, name: str) -> None:
+        """Run the set through LaunchScheduler on a worker thread; progress goes to the status bar."""
+        from launchsets import LaunchScheduler, summary
+        members: list[tuple[str, Profile | None, list[str] | None]] = []
+        for member in self.cm.get_launch_sets().get(name, []):
+            p = self.cm.get_profile(member)
+            members.append((member, p, self._launch_argv(p) if p else None))
+        if not any(p for _m, p, _a in members):
+            messagebox.showerror(APP_NAME, f"Nothing to launch in set {name}.")
+            return
+        sched = LaunchScheduler(
+            self.cm.get_int("launch_max_in_flight"),
+            self.cm.get_int("launch_stagger_ms"),
+            self.cm.get_int("launch_ready_timeout"),
+            latency=self.latency,
+        )
+        done = [0]
+
+        def work(task: Task) -> list[str]:
+            task.on_cancel(sched.cancel)
+            jobs = [(p, argv) for _m, p, argv in members if p and argv and is_executable_path(argv[0])]
+            skipped = [m for m, p, argv in members if not (p and argv and is_executable_path(argv[0]))]
+            total = len(jobs)
+
+            def on_event(r: LaunchResult, phase: str) -> None:
+                if phase in ("ready", "timeout", "failed"):
+                    done[0] += 1
+                if phase == "spawned":
+                    self.metrics.counters.launch(r.name, handoff=r.already_running)
+                if phase in ("ready", "timeout") and not r.already_running:
+                    self.metrics.counters.observe_ready(r.name, r.ready_s)
+                    self.run_on_ui(lambda: self._show_latency(r.name))
+                task.report(f"Set {name}: {r.describe() if phase != 'spawned' else r.name + ' starting…'} ({done[0]}/{total})")
+
+            t0 = time.perf_counter()
+            results = sched.run(jobs, on_event)
+            elapsed = time.perf_counter() - t0
+            events.emit("launch_set", name=name, profiles=len(results), ready=sum(1 for r in results if r.ready_s is not None),
+                        failed=sum(1 for r in results if r.error), skipped=len(skipped), ms=round(elapsed * 1000.0, 1), source="gui")
+            return summary(results, elapsed) + [f"{s}: skipped (unknown profile or invalid VS Code path)" for s in skipped]
+
+        self.tasks.submit(
+            f"Launch set {name}",
+            work,
+            on_done=lambda lines: InfoDialog(self, f"Launch set {name}", "\n".join(lines)),
+            status=f"Launching set {name}…",
+        )
+
+    def launch_profile(self, p: Profile, folder: str | None = None, reply=None) -> Task:
+        """Spawn VS Code for p with the current (possibly unsaved) settings on a worker.
+        reply(error or None, status message) runs on the Tk thread when done."""
+        vscode = p.vscode_for(norm(self.var_vscode_path.get()))
+        argv = self._launch_argv(p, folder)
+        argv_running = self._launch_argv(p, folder, running=True)
+        timeout = self.cm.get_int("launch_ready_timeout")
+
+        def work(_t: Task) -> tuple[str | None, str]:
+            if not is_executable_path(vscode):
+                return (f"Pinned VS Code not found: {vscode}" if p.vscode else "VS Code path is invalid. Set it on top."), ""
+            p.ensure_folders()
+            self.processes.poll()  # incremental, so cheap; the background tick may be up to 2 s old
+            running = bool(self.processes.pids(p.user_data))
+            with events.timed("launch", profile=p.name, handoff=running, folder=bool(folder), source="gui"):
+                if running:
+                    spawn_vscode(argv_running)
+                    self.metrics.counters.launch(p.name, handoff=True)
+                    return None, f"Handed {p.name} to its running instance"
+                context = launch_context(p)
+                since = time.time()
+                spawn_vscode(argv)
+                self.metrics.counters.launch(p.name)
+            # spawn -> ready on its own thread; a pool worker would sit idle for up to `timeout`
+            self.latency.watch(p, since, context, timeout, lambda st: self.run_on_ui(lambda: self._on_latency(p.name, st)))
+            return None, f"Launched {p.name}, waiting for it to be ready…"
+
+        def done(result: tuple[str | None, str]) -> None:
+            err, message = result
+            self.status.set(message or f"Launch failed: {err}")
+            if reply:
+                reply(err, message)
+
+        return self.tasks.submit(
+            f"Launching {p.name}",
+            work,
+            on_done=done,
+            on_error=lambda e: done((str(e), "")),
+        )
+
+    # --- Single instance (ipc.py) ---
+
+    IPC_POLL_MS = 100
+
+    def attach_ipc(self, server: InstanceServer, resident: bool = False) -> None:
+        """Serve forwarded requests; resident mode hides on close instead of exiting."""
+        self._ipc = server
+        if resident:
+            self.protocol("WM_DELETE_WINDOW", self.withdraw)
+        self.after(self.IPC_POLL_MS, self._poll_ipc)
+
+    def _poll_ipc(self) -> None:
+        while True:
+            try:
+                req = self._ipc.requests.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                reply = self._handle_ipc(req)
+                if reply is not None:
+                    req.answer(reply)
+            except Exception as e:
+                req.answer({"ok": False, "message": str(e)})
+        self.after(self.IPC_POLL_MS, self._poll_ipc)
+
+    def _handle_ipc(self, req: IpcRequest) -> dict | None:
+        """Reply dict, or None when req is answered later (launch runs on a worker)."""
+        msg = req.msg
+        cmd = msg.get("cmd")
+        if cmd == "show":
+            self.show_window()
+            return {"ok": True}
+        if cmd == "launch":
+            p = self.cm.get_profile(str(msg.get("profile") or ""))
+            if not p:
+                return {"ok": False, "message": f"Unknown profile: {msg.get('profile')}"}
+            self.launch_profile(
+                p,
+                msg.get("folder"),
+                reply=lambda err, message: req.answer({"ok": err is None, "message": f"Launch failed: {err}" if err else message}),
+            )
+            return None
+        if cmd == "stop":
+            self.after(50, self.quit)
+            return {"ok": True, "message": "Stopped."}
+        return {"ok": False, "message": f"Unknown command: {cmd}"}
+
+    def show_window(self) -> None:
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+
+
+# --- Global excepthook ---
+
+def _global_excepthook(exc_type: type, exc_value: BaseException, exc_tb) -> None:
+    """Log to the event log and crash.log; show report-bugs modal or fallback."""
+    try:
+        events.crash(exc_type, exc_value, exc_tb, "excepthook")
+    except Exception:
+        pass
+    short = (str(exc_value) or exc_type.__name__).strip() or "Unknown error"
+    try:
+        if _app_ref and _app_ref.winfo_exists():
+            _app_ref.after(0, lambda: ReportBugsDialog(_app_ref, error_message=short))
+        else:
+            root = tk.Tk()
+            root.withdraw()
+            messagebox.showerror(
+                APP_NAME,
+                f"An unexpected error occurred.\n\n{short}\n\n"
+                f"Please report at: {REPORT_BUGS_URL}",
+            )
+            root.destroy()
+    except Exception:
+        pass
+
+
+# --- Entry ---
+
+def run_app(trace: StartupTrace | None = None, budget_ms: float | None = None, resident: bool = False) -> int:
+    sys.excepthook = _global_excepthook
+    server = InstanceServer()
+    owns_instance = server.start()
+    app: App | None = None
+    try:
+        app = App(trace)
+        app.set_startup_budget(budget_ms)
+        if owns_instance:
+            app.attach_ipc(server, resident)
+        if resident:
+            app.withdraw()
+            app.after_idle(app._on_first_map)  # no Map event while hidden; run deferred startup now
+        app.mainloop()
+        return app._exit_code
+    finally:
+        server.close()
+        if app is not None:
+            app.disk_usage.shutdown()
+            app.processes.stop()
+            app.tasks.shutdown()
+            app.config_watch.stop()
+            app.metrics.stop()
+
+def crash_safe_main(trace: StartupTrace | None = None, budget_ms: float | None = None, resident: bool = False) -> int:
+    try:
+        return run_app(trace, budget_ms, resident)
+    except Exception:
+        err = traceback.format_exc()
+        try:
+            events.crash(*sys.exc_info(), "startup")
+        except Exception:
+            pass
+
+        try:
+            root = tk.Tk()
+            root.withdraw()
+            messagebox.showerror(
+                APP_NAME,
+                "App crashed on startup.\n\n"
+                "A crash.log file was created beside the EXE.\n\n"
+                "Error:\n" + err.splitlines()[-1]
+            )
+            root.destroy()
+        except Exception:
+            pass
+        return 1
@@ -0,0 +1,244 @@
+# VSCode MultiData by Adam Natad
+# Persistent index of VS Code installs (Stable / Insiders / portable). Startup only re-stats the
+# indexed executables; the PATH / well-known-location scan runs on Detect, or when the index is
+# empty and the last scan that found nothing is older than EMPTY_RESCAN_S.
+
+from __future__ import annotations
+
+import os
+import json
+import shutil
+import time
+
+from core import app_dir, cache_dir, load_json, norm, os_name, save_json, vscode_candidates
+
+INDEX_VERSION = 1
+EMPTY_RESCAN_S = 24 * 3600  # an empty result is trusted this long before startup scans again
+
+PRODUCT_JSON_DIRS = (
+    os.path.join("resources", "app"),  # Windows / Linux install root
+    "app",                             # macOS: exe lives in Contents/Resources/app/bin
+)
+
+# Executables of an extracted (portable) VS Code folder, Windows and Linux archives
+PORTABLE_EXES = ("Code.exe", "Code - Insiders.exe", "code", "code-insiders")
+
+
+def index_path() -> str:
+    return os.path.join(cache_dir(), "installs.json")
+
+
+def _stamp(exe: str) -> list[int] | None:
+    try:
+        st = os.stat(exe)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def find_product_json(exe: str) -> str:
+    """product.json for an exe or its `code` CLI shim; walks up a few levels from the real path."""
+    d = os.path.dirname(os.path.realpath(exe))
+    for _ in range(4):
+        for sub in PRODUCT_JSON_DIRS:
+            cand = os.path.join(d, sub, "product.json")
+            if os.path.isfile(cand):
+                return cand
+        parent = os.path.dirname(d)
+        if parent == d:
+            break
+        d = parent
+    return ""
+
+
+def insiders_candidates() -> list[str]:
+    """Insiders locations vscode_candidates() (the Stable autodetect list) leaves out."""
+    cands: list[str] = []
+    if os_name() == "Windows":
+        for env in ("ProgramFiles", "ProgramFiles(x86)"):
+            root = os.environ.get(env)
+            if root:
+                cands.append(os.path.join(root, "Microsoft VS Code Insiders", "Code - Insiders.exe"))
+        local = os.environ.get("LOCALAPPDATA")
+        if local:
+            cands.append(os.path.join(local, "Programs", "Microsoft VS Code Insiders", "Code - Insiders.exe"))
+        cands.append(shutil.which("code-insiders.cmd") or shutil.which("code-insiders") or "")
+    elif os_name() == "Darwin":
+        rel = os.path.join("Visual Studio Code - Insiders.app", "Contents", "Resources", "app", "bin", "code")
+        cands += [os.path.join("/Applications", rel), os.path.join(os.path.expanduser("~/Applications"), rel)]
+        cands.append(shutil.which("code-insiders") or "")
+    else:
+        cands += ["/usr/bin/code-insiders", "/usr/local/bin/code-insiders", "/snap/bin/code-insiders"]
+        cands.append(shutil.which("code-insiders") or "")
+    return [c for c in cands if c]
+
+
+def portable_candidates(roots: list[str] | None = None) -> list[str]:
+    """Extracted VS Code folders with a data/ folder (portable mode), one level below each root:
+    by default the launcher's folder, its parent and the home folder (one listdir each)."""
+    if roots is None:
+        here = app_dir()
+        roots = [here, os.path.dirname(here), os.path.expanduser("~")]
+    cands: list[str] = []
+    seen = set()
+    for root in roots:
+        key = os.path.normcase(os.path.abspath(root))
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            entries = [e for e in os.scandir(root) if e.is_dir() and not e.name.startswith(".")]
+        except OSError:
+            continue
+        for e in entries:
+            if os_name() == "Darwin" and e.name.endswith(".app"):
+                if os.path.isdir(os.path.join(root, "code-portable-data")):
+                    cands.append(os.path.join(e.path, "Contents", "Resources", "app", "bin", "code"))
+                continue
+            if not os.path.isdir(os.path.join(e.path, "data")):
+                continue
+            cands += [os.path.join(e.path, exe) for exe in PORTABLE_EXES if os.path.isfile(os.path.join(e.path, exe))]
+    return cands
+
+
+class VSCodeInstall:
+    def __init__(self, exe: str, version: str = "", quality: str = "", name: str = "", portable: bool = False, stamp: list[int] | None = None):
+        self.exe = exe
+        self.version = version
+        self.quality = quality      # "stable" / "insider" / "" (unknown)
+        self.name = name            # product nameShort, e.g. "Code - Insiders"
+        self.portable = portable
+        self.stamp = stamp
+
+    @classmethod
+    def probe(cls, exe: str) -> VSCodeInstall | None:
+        stamp = _stamp(exe)
+        if stamp is None:
+            return None
+        inst = cls(exe, stamp=stamp)
+        product = find_product_json(exe)
+        if product:
+            app_dir_ = os.path.dirname(product)
+            try:
+                with open(product, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            inst.quality = str(data.get("quality") or "")
+            inst.name = str(data.get("nameShort") or "")
+            inst.version = str(data.get("version") or "")
+            if not inst.version:  # older builds keep the version in package.json only
+                try:
+                    with open(os.path.join(app_dir_, "package.json"), "r", encoding="utf-8") as f:
+                        inst.version = str(json.load(f).get("version") or "")
+                except (OSError, ValueError):
+                    pass
+        # portable mode: a "data" folder beside the install root (macOS: code-portable-data beside the .app)
+        root = os.path.dirname(os.path.realpath(exe))
+        inst.portable = os.path.isdir(os.path.join(root, "data"))
+        app_bundle = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(root))))
+        if not inst.portable and app_bundle.endswith(".app"):
+            inst.portable = os.path.isdir(os.path.join(os.path.dirname(app_bundle), "code-portable-data"))
+        if not inst.quality:
+            inst.quality = "insider" if "insider" in os.path.basename(exe).lower() else ""
+        return inst
+
+    def label(self) -> str:
+        kind = "Insiders" if self.quality == "insider" else "Stable" if self.quality == "stable" else "VS Code"
+        if self.portable:
+            kind += " portable"
+        return f"{self.version or '?'} {kind} — {self.exe}"
+
+    def to_json(self) -> dict:
+        return {
+            "exe": self.exe,
+            "version": self.version,
+            "quality": self.quality,
+            "name": self.name,
+            "portable": self.portable,
+            "stamp": self.stamp,
+        }
+
+    @classmethod
+    def from_json(cls, d: dict) -> VSCodeInstall:
+        return cls(d.get("exe", ""), d.get("version", ""), d.get("quality", ""), d.get("name", ""), bool(d.get("portable")), d.get("stamp"))
+
+
+class InstallIndex:
+    def __init__(self, installs: list[VSCodeInstall] | None = None):
+        self.installs = installs or []
+        self.scanned = 0.0  # time of the last full discover(); 0 = never
+
+    @classmethod
+    def load(cls, extra: list[str] | None = None) -> InstallIndex:
+        """Cached index, validated by exe stamp. Changed entries are re-probed, vanished ones dropped;
+        `extra` paths (configured / pinned exes) are added if missing. Rediscovers when empty."""
+        data = load_json(index_path(), {})
+        if isinstance(data, list):  # pre-versioned index: a bare list of installs
+            data = {"installs": data}
+        data = data if isinstance(data, dict) else {}
+        idx = cls()
+        idx.scanned = data.get("scanned", 0) if isinstance(data.get("scanned"), (int, float)) else 0
+        changed = False
+        for d in data.get("installs") or []:
+            inst = VSCodeInstall.from_json(d)
+            stamp = _stamp(inst.exe)
+            if stamp is None:
+                changed = True
+                continue
+            if stamp != inst.stamp:
+                inst = VSCodeInstall.probe(inst.exe) or inst
+                changed = True
+            idx.installs.append(inst)
+        if not idx.installs and time.time() - idx.scanned > EMPTY_RESCAN_S:
+            idx.discover(extra)
+            return idx
+        changed = idx._add(extra or []) or changed
+        if changed:
+            idx.save()
+        return idx
+
+    def discover(self, extra: list[str] | None = None) -> None:
+        """Full scan: well-known Stable / Insiders locations + PATH, portable folders and extra paths.
+        Persists the result, an empty one included (load() then skips the scan for EMPTY_RESCAN_S)."""
+        self.installs = []
+        self._add(vscode_candidates() + insiders_candidates() + portable_candidates() + list(extra or []))
+        self.scanned = time.time()
+        self.save()
+
+    def _add(self, paths: list[str]) -> bool:
+        known = {os.path.normcase(os.path.realpath(i.exe)) for i in self.installs}
+        added = False
+        for p in paths:
+            p = norm(p)
+            if not p or not os.path.isfile(p):
+                continue
+            key = os.path.normcase(os.path.realpath(p))
+            if key in known:
+                continue
+            inst = VSCodeInstall.probe(p)
+            if inst:
+                known.add(key)
+                self.installs.append(inst)
+                added = True
+        return added
+
+    def save(self) -> None:
+        try:
+            save_json(index_path(), {"version": INDEX_VERSION, "scanned": self.scanned,
+                                     "installs": [i.to_json() for i in self.installs]})
+        except OSError:
+            pass
+
+    def default_exe(self) -> str:
+        """Preferred install: Stable over Insiders over unknown, in discovery order."""
+        rank = {"stable": 0, "insider": 1}
+        best = sorted(self.installs, key=lambda i: rank.get(i.quality, 2))
+        return best[0].exe if best else ""
+
+    def find(self, exe: str) -> VSCodeInstall | None:
+        key = os.path.normcase(os.path.realpath(norm(exe)))
+        for i in self.installs:
+            if os.path.normcase(os.path.realpath(i.exe)) == key:
+                return i
+        return None
@@ -0,0 +1,260 @@
+# VSCode MultiData by Adam Natad
+# Extension inventory: which extensions (and versions) each profile has installed, read from the
+# extensions folder without starting VS Code: extensions.json (the install manifest), .obsolete
+# (pending removals) and every extension's package.json. Parsed results are cached in cache/
+# keyed by the folder's mtime plus the manifest files' stat, so a warm run is a few stats per
+# profile; a changed folder only re-parses package.json files whose stat moved. Cold scans run
+# on a thread pool. No tkinter here.
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import Profile, cache_dir, load_json, norm, save_json
+
+SCAN_WORKERS = 8
+CACHE_VERSION = 1
+
+
+def cache_path() -> str:
+    return os.path.join(cache_dir(), "extensions-index.json")
+
+
+def _stat_key(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class ExtensionInfo:
+    """One installed extension; to_json() / from_json() round-trip through the cache."""
+
+    FIELDS = ("id", "version", "dir", "display_name", "publisher", "engine", "main", "browser",
+              "activation_events", "contributes", "dependencies", "pack", "source", "installed", "pre_release")
+
+    def __init__(self, **kw):
+        self.id = kw.get("id", "")                   # publisher.name, lower-cased
+        self.version = kw.get("version", "")
+        self.dir = kw.get("dir", "")                 # folder name under the extensions dir
+        self.display_name = kw.get("display_name", "")
+        self.publisher = kw.get("publisher", "")
+        self.engine = kw.get("engine", "")           # engines.vscode
+        self.main = kw.get("main", "")
+        self.browser = kw.get("browser", "")
+        self.activation_events: list[str] = kw.get("activation_events", [])
+        self.contributes: list[str] = kw.get("contributes", [])   # contribution point names
+        self.dependencies: list[str] = kw.get("dependencies", [])
+        self.pack: list[str] = kw.get("pack", [])
+        self.source = kw.get("source", "")           # gallery / vsix / resource (extensions.json metadata)
+        self.installed = kw.get("installed", 0)      # epoch ms
+        self.pre_release = kw.get("pre_release", False)
+
+    @classmethod
+    def from_package(cls, dirname: str, pkg: dict) -> ExtensionInfo:
+        publisher = str(pkg.get("publisher", ""))
+        name = str(pkg.get("name", ""))
+        display = pkg.get("displayName", "")
+        return cls(
+            id=f"{publisher}.{name}".lower(),
+            version=str(pkg.get("version", "")),
+            dir=dirname,
+            display_name=display if isinstance(display, str) and not display.startswith("%") else name,
+            publisher=publisher,
+            engine=str((pkg.get("engines") or {}).get("vscode", "")),
+            main=str(pkg.get("main", "") or ""),
+            browser=str(pkg.get("browser", "") or ""),
+            activation_events=[str(e) for e in pkg.get("activationEvents") or [] if isinstance(e, str)],
+            contributes=sorted(k for k in (pkg.get("contributes") or {}) if isinstance(k, str)),
+            dependencies=[str(d).lower() for d in pkg.get("extensionDependencies") or []],
+            pack=[str(d).lower() for d in pkg.get("extensionPack") or []],
+        )
+
+    def to_json(self) -> dict:
+        return {k: getattr(self, k) for k in self.FIELDS}
+
+    @classmethod
+    def from_json(cls, d: dict) -> ExtensionInfo:
+        return cls(**{k: d[k] for k in cls.FIELDS if k in d})
+
+    def label(self) -> str:
+        return f"{self.id} {self.version}"
+
+
+class ProfileInventory:
+    def __init__(self, name: str, root: str):
+        self.name = name
+        self.root = root
+        self.extensions: list[ExtensionInfo] = []
+        self.problems: list[str] = []   # manifest entries without a folder, unreadable package.json, ...
+        self.cached = False             # served from the cache without listing the folder
+
+    def by_id(self) -> dict[str, ExtensionInfo]:
+        return {e.id: e for e in self.extensions}
+
+    def to_json(self) -> dict:
+        return {
+            "profile": self.name,
+            "extensions_dir": self.root,
+            "count": len(self.extensions),
+            "extensions": [e.to_json() for e in self.extensions],
+            "problems": self.problems,
+        }
+
+    def describe(self) -> str:
+        line = f"{self.name}: {len(self.extensions)} extensions"
+        if self.problems:
+            line += f", {len(self.problems)} problems"
+        return line
+
+
+# --- Scan ---
+
+def _read_json(path: str):
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_manifest(root: str) -> dict[str, dict] | None:
+    """extensions.json as folder name -> entry; None when there is no manifest (older VS Code)."""
+    entries = _read_json(os.path.join(root, "extensions.json"))
+    if not isinstance(entries, list):
+        return None
+    out = {}
+    for e in entries:
+        if not isinstance(e, dict):
+            continue
+        rel = e.get("relativeLocation")
+        if not rel:
+            loc = e.get("location") or {}
+            rel = os.path.basename(str(loc.get("fsPath") or loc.get("path") or "").rstrip("/\\"))
+        if rel:
+            out[rel] = e
+    return out
+
+
+def scan_root(root: str, old: dict | None) -> tuple[dict, bool]:
+    """(cache entry, served from cache) for one extensions folder. The entry keeps per-folder
+    parse results ("items") keyed by package.json stat for the next partial rescan."""
+    key = [_stat_key(root), _stat_key(os.path.join(root, "extensions.json")), _stat_key(os.path.join(root, ".obsolete"))]
+    if old and old.get("key") == key:
+        return old, True
+    old_items = (old or {}).get("items", {})
+    items: dict[str, dict] = {}
+    problems: list[str] = []
+    try:
+        names = sorted(e.name for e in os.scandir(root) if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        names = []
+    for name in names:
+        pkg_path = os.path.join(root, name, "package.json")
+        k = _stat_key(pkg_path)
+        if k is None:
+            continue  # not an extension (e.g. a half-removed folder)
+        hit = old_items.get(name)
+        if hit and hit.get("k") == k:
+            items[name] = hit
+            continue
+        pkg = _read_json(pkg_path)
+        if not isinstance(pkg, dict):
+            problems.append(f"{name}: unreadable package.json")
+            continue
+        items[name] = {"k": k, "i": ExtensionInfo.from_package(name, pkg).to_json()}
+
+    obsolete = _read_json(os.path.join(root, ".obsolete"))
+    obsolete = set(obsolete) if isinstance(obsolete, dict) else set()
+    manifest = read_manifest(root)
+    installed: list[dict] = []
+    if manifest is None:
+        installed = [items[n]["i"] for n in items if n not in obsolete]
+    else:
+        for rel, entry in manifest.items():
+            if rel in obsolete:
+                continue
+            item = items.get(rel)
+            if item is None:
+                problems.append(f"{rel}: listed in extensions.json but not on disk")
+                continue
+            info = dict(item["i"])
+            meta = entry.get("metadata") or {}
+            info["source"] = str(meta.get("source", ""))
+            info["installed"] = meta.get("installedTimestamp", 0) or 0
+            info["pre_release"] = bool(meta.get("preRelease") or meta.get("isPreReleaseVersion"))
+            installed.append(info)
+        orphans = sorted(set(items) - set(manifest) - obsolete)
+        problems += [f"{n}: on disk but not in extensions.json (ignored by VS Code)" for n in orphans]
+    installed.sort(key=lambda i: i["id"])
+    return {"key": key, "items": items, "installed": installed, "problems": problems}, False
+
+
+class Inventory:
+    """Per-profile inventories from the mtime-keyed cache; scan() refreshes and saves it."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or cache_path()
+        data = load_json(self.path, {})
+        ok = isinstance(data, dict) and data.get("version") == CACHE_VERSION
+        self.roots: dict[str, dict] = data.get("roots", {}) if ok else {}
+        self._lock = threading.Lock()
+        self.elapsed = 0.0
+
+    def scan(
+        self,
+        profiles: list[Profile],
+        on_result: Callable[[ProfileInventory], None] | None = None,
+        refresh: bool = False,
+    ) -> list[ProfileInventory]:
+        """Inventory per profile (input order). Shared extensions folders are read once.
+        refresh=True ignores the cache. on_result fires per profile from worker threads."""
+        t0 = time.perf_counter()
+        roots: dict[str, list[Profile]] = {}
+        for p in profiles:
+            roots.setdefault(os.path.normcase(os.path.abspath(norm(p.extensions))), []).append(p)
+        results: dict[str, ProfileInventory] = {}
+        fresh: dict[str, dict] = {}
+
+        def one(root: str) -> None:
+            entry, cached = scan_root(root, None if refresh else self.roots.get(root))
+            with self._lock:
+                fresh[root] = entry
+            for p in roots[root]:
+                inv = ProfileInventory(p.name, root)
+                inv.extensions = [ExtensionInfo.from_json(i) for i in entry["installed"]]
+                inv.problems = list(entry["problems"])
+                inv.cached = cached
+                with self._lock:
+                    results[p.name] = inv
+                if on_result:
+                    on_result(inv)
+
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="vscodemd-inventory") as pool:
+            list(pool.map(one, roots))
+        with self._lock:
+            changed = any(self.roots.get(r) is not e for r, e in fresh.items())
+            self.roots.update(fresh)
+            data = {"version": CACHE_VERSION, "roots": dict(self.roots)}
+        if changed:
+            try:
+                save_json(self.path, data)
+            except OSError:
+                pass  # cache only
+        self.elapsed = time.perf_counter() - t0
+        return [results[p.name] for p in profiles]
+
+
+def version_matrix(inventories: list[ProfileInventory]) -> dict[str, dict[str, str]]:
+    """extension id -> {profile: version}: where versions differ across profiles."""
+    out: dict[str, dict[str, str]] = {}
+    for inv in inventories:
+        for e in inv.extensions:
+            out.setdefault(e.id, {})[inv.name] = e.version
+    return dict(sorted(out.items()))
@@ -0,0 +1,136 @@
+# VSCode MultiData by Adam Natad
+# Single-instance IPC: the running GUI listens on a named pipe (Windows) / Unix socket, later invocations
+# forward "show" / "launch" / "stop" to it and exit. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import hashlib
+import queue
+import tempfile
+import threading
+from multiprocessing.connection import Client, Listener
+
+from core import app_dir, config_path, os_name
+
+IPC_KEY_FILENAME = "ipc.key"
+REPLY_TIMEOUT = 10.0  # seconds the server waits for the GUI thread to handle a request
+
+
+def ipc_address() -> str:
+    """Per-config address, so separate portable copies don't talk to each other."""
+    tag = hashlib.sha1(os.path.normcase(config_path()).encode("utf-8")).hexdigest()[:12]
+    if os_name() == "Windows":
+        return rf"\\.\pipe\VSCodeMD-{tag}"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"vscodemd-{uid}-{tag}.sock")
+
+def _family() -> str:
+    return "AF_PIPE" if os_name() == "Windows" else "AF_UNIX"
+
+def ipc_authkey() -> bytes:
+    """Shared secret beside the config (created on first use)."""
+    path = os.path.join(app_dir(), IPC_KEY_FILENAME)
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+        if len(key) >= 16:
+            return key
+    except OSError:
+        pass
+    key = os.urandom(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def forward(msg: dict, timeout: float = REPLY_TIMEOUT) -> dict | None:
+    """Send msg to the running instance; None when there is none."""
+    try:
+        conn = Client(ipc_address(), family=_family(), authkey=ipc_authkey())
+    except (OSError, EOFError):
+        return None
+    except Exception:
+        return None
+    try:
+        conn.send(msg)
+        if not conn.poll(timeout + 1.0):
+            return {"ok": False, "message": "Running instance did not answer."}
+        return conn.recv()
+    except (OSError, EOFError):
+        return None
+    finally:
+        conn.close()
+
+
+class IpcRequest:
+    def __init__(self, msg: dict):
+        self.msg = msg
+        self.reply: dict | None = None
+        self.done = threading.Event()
+
+    def answer(self, reply: dict) -> None:
+        self.reply = reply
+        self.done.set()
+
+
+class InstanceServer:
+    """Accepts requests on a background thread; the GUI drains `requests` on its own thread (Tk is not thread-safe)."""
+
+    def __init__(self):
+        self.requests: queue.Queue[IpcRequest] = queue.Queue()
+        self._listener: Listener | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> bool:
+        """Start listening; False when another instance owns the address."""
+        address = ipc_address()
+        try:
+            self._listener = Listener(address, family=_family(), authkey=ipc_authkey())
+        except OSError:
+            if _family() != "AF_UNIX" or not os.path.exists(address) or forward({"cmd": "ping"}, timeout=1.0):
+                return False
+            # stale socket left by a crashed instance
+            try:
+                os.unlink(address)
+                self._listener = Listener(address, family=_family(), authkey=ipc_authkey())
+            except OSError:
+                return False
+        self._thread = threading.Thread(target=self._serve, name="vscodemd-ipc", daemon=True)
+        self._thread.start()
+        return True
+
+    def _serve(self) -> None:
+        while self._listener is not None:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._listener is None:
+                    return
+                continue  # failed handshake / bad authkey
+            try:
+                msg = conn.recv()
+                if not isinstance(msg, dict):
+                    continue
+                if msg.get("cmd") == "ping":
+                    conn.send({"ok": True})
+                    continue
+                req = IpcRequest(msg)
+                self.requests.put(req)
+                if not req.done.wait(REPLY_TIMEOUT):
+                    conn.send({"ok": False, "message": "Timed out waiting for the GUI."})
+                else:
+                    conn.send(req.reply)
+            except Exception:
+                pass
+            finally:
+                conn.close()
+
+    def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                listener.close()
+            except Exception:
+                pass
@@ -0,0 +1,134 @@
+# VSCode MultiData by Adam Natad
+# Launch-to-ready latency: time from spawn until the instance's code.lock / IPC socket appears
+# (readiness.py), kept as a rolling per-profile history in cache/latency.json with p50 / p95.
+# Each sample notes what tends to explain a slow start (cold code cache, extension count).
+# No tkinter here.
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from typing import Callable
+
+import events
+from core import Profile, cache_dir, load_json, save_json
+from readiness import wait_ready
+
+HISTORY_LEN = 50          # samples kept per profile
+SLOW_FACTOR = 1.5         # latest p50 over the older samples' p50: flagged as slower
+
+
+def history_path() -> str:
+    return os.path.join(cache_dir(), "latency.json")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def launch_context(p: Profile) -> dict:
+    """Taken just before spawning: what the instance starts from."""
+    try:
+        exts = sum(1 for e in os.scandir(p.extensions) if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        exts = 0
+    return {
+        "cold": not os.path.isdir(os.path.join(p.user_data, "CachedData")),  # first start, or purged
+        "exts": exts,
+    }
+
+
+class LatencyStats:
+    def __init__(self, name: str, samples: list[dict]):
+        self.name = name
+        ready = [s["s"] for s in samples if s.get("s") is not None]
+        self.count = len(samples)
+        self.timeouts = self.count - len(ready)
+        self.p50 = percentile(ready, 50) if ready else None
+        self.p95 = percentile(ready, 95) if ready else None
+        self.last = samples[-1] if samples else None
+        self.slower = False
+        if len(ready) >= 10:
+            half = len(ready) // 2
+            self.slower = percentile(ready[half:], 50) > SLOW_FACTOR * percentile(ready[:half], 50)
+        warm = [s["s"] for s in samples if s.get("s") is not None and not s.get("cold")]
+        cold = [s["s"] for s in samples if s.get("s") is not None and s.get("cold")]
+        self.warm_p50 = percentile(warm, 50) if warm else None
+        self.cold_p50 = percentile(cold, 50) if cold else None
+
+    def label(self) -> str:
+        """Table cell: "1.2 / 3.4 s"."""
+        if self.p50 is None:
+            return "timeout" if self.timeouts else ""
+        return f"{self.p50:.1f} / {self.p95:.1f} s" + (" ▲" if self.slower else "")
+
+    def describe(self) -> str:
+        if not self.count:
+            return f"{self.name}: no launches measured"
+        if self.p50 is None:
+            return f"{self.name}: {self.timeouts}/{self.count} launches not ready within timeout"
+        line = f"{self.name}: p50 {self.p50:.2f} s, p95 {self.p95:.2f} s over {self.count} launches"
+        if self.timeouts:
+            line += f", {self.timeouts} timeouts"
+        notes = []
+        if self.warm_p50 is not None and self.cold_p50 is not None:
+            notes.append(f"warm {self.warm_p50:.2f} s vs cold cache {self.cold_p50:.2f} s")
+        if self.last is not None and self.last.get("exts"):
+            notes.append(f"{self.last['exts']} extensions")
+        if self.slower:
+            notes.append("recent launches slower than earlier ones")
+        return line + (f" ({'; '.join(notes)})" if notes else "")
+
+
+class LatencyLog:
+    """Per-profile samples {"t": epoch, "s": seconds or None (timeout), "cold", "exts"}.
+    Each record re-reads the file first, so the GUI and CLI can both add to it."""
+
+    def __init__(self, path: str | None = None, load: bool = True):
+        self.path = path or history_path()
+        self._lock = threading.Lock()
+        self.history: dict[str, list[dict]] = {}
+        if load:
+            self.reload()
+
+    def reload(self) -> None:
+        data = load_json(self.path, {})
+        self.history = data if isinstance(data, dict) else {}  # swapped whole: readers never see a partial dict
+
+    def record(self, name: str, seconds: float | None, context: dict | None = None) -> LatencyStats:
+        sample = {"t": round(time.time(), 1), "s": None if seconds is None else round(seconds, 3)}
+        sample.update(context or {})
+        events.emit("launch_ready", profile=name, s=sample["s"], **(context or {}))
+        with self._lock:
+            self.reload()
+            samples = self.history.setdefault(name.lower(), [])
+            samples.append(sample)
+            del samples[:-HISTORY_LEN]
+            try:
+                save_json(self.path, self.history)
+            except OSError:
+                pass  # statistics only
+            return LatencyStats(name, list(samples))
+
+    def stats(self, name: str) -> LatencyStats:
+        return LatencyStats(name, list(self.history.get(name.lower(), [])))
+
+    def measure(self, p: Profile, since: float, context: dict, timeout: float) -> LatencyStats:
+        """Block until p's instance is ready (or timeout) and record it; since = time.time() at spawn."""
+        seconds = wait_ready(p.user_data, since, timeout)
+        return self.record(p.name, seconds, context)
+
+    def watch(self, p: Profile, since: float, context: dict, timeout: float,
+              on_done: Callable[[LatencyStats], None] | None = None) -> None:
+        """measure() on a daemon thread; on_done fires from that thread."""
+        def work() -> None:
+            stats = self.measure(p, since, context, timeout)
+            if on_done:
+                on_done(stats)
+
+        threading.Thread(target=work, name="vscodemd-latency", daemon=True).start()
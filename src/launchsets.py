@@ -0,0 +1,117 @@
+# VSCode MultiData by Adam Natad
+# Batch launch of a named profile set: at most N instances warming up at once, a stagger between
+# spawns, and a slot is released when the instance is ready (readiness.py). No tkinter here.
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from core import Profile, spawn_vscode
+from latency import LatencyLog, launch_context
+from readiness import instance_alive, wait_ready
+
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_STAGGER_MS = 500
+DEFAULT_READY_TIMEOUT = 60
+
+
+class LaunchResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.ok = False
+        self.error = ""
+        self.ready_s: float | None = None   # spawn -> ready; None = not ready within timeout
+        self.already_running = False
+
+    def describe(self) -> str:
+        if self.error:
+            return f"{self.name}: failed ({self.error})"
+        if self.ready_s is None:
+            return f"{self.name}: launched, not ready within timeout"
+        note = " (already running)" if self.already_running else ""
+        return f"{self.name}: ready in {self.ready_s:.1f} s{note}"
+
+
+# on_event(result, phase) with phase "spawned" / "ready" / "failed" / "timeout"; called from worker threads
+EventCallback = Callable[[LaunchResult, str], None]
+
+
+class LaunchScheduler:
+    """Runs (profile, argv) jobs in order; blocking, so the GUI calls run() from a worker thread."""
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, stagger_ms: int = DEFAULT_STAGGER_MS, ready_timeout: float = DEFAULT_READY_TIMEOUT,
+                 latency: LatencyLog | None = None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.stagger = max(0, stagger_ms) / 1000.0
+        self.ready_timeout = ready_timeout
+        self.latency = latency  # fresh (not handed-off) launches are recorded here
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def run(self, jobs: list[tuple[Profile, list[str]]], on_event: EventCallback | None = None) -> list[LaunchResult]:
+        slots = threading.Semaphore(self.max_in_flight)
+        results: list[LaunchResult] = []
+        waiters: list[threading.Thread] = []
+        last_spawn = 0.0
+
+        def emit(r: LaunchResult, phase: str) -> None:
+            if on_event:
+                on_event(r, phase)
+
+        def wait(r: LaunchResult, p: Profile, since: float, was_running: bool, context: dict | None) -> None:
+            try:
+                r.ready_s = wait_ready(p.user_data, since, self.ready_timeout, was_running, self._cancel.is_set)
+                if self.latency is not None and not was_running and not self._cancel.is_set():
+                    self.latency.record(p.name, r.ready_s, context)
+                emit(r, "ready" if r.ready_s is not None else "timeout")
+            finally:
+                slots.release()
+
+        for p, argv in jobs:
+            r = LaunchResult(p.name)
+            results.append(r)
+            acquired = False
+            while not acquired and not self._cancel.is_set():
+                acquired = slots.acquire(timeout=0.2)
+            if not acquired:
+                r.error = "cancelled"
+                emit(r, "failed")
+                continue
+            delay = self.stagger - (time.monotonic() - last_spawn)
+            if delay > 0 and self._cancel.wait(delay):
+                slots.release()
+                r.error = "cancelled"
+                emit(r, "failed")
+                continue
+            try:
+                p.ensure_folders()
+                r.already_running = instance_alive(p.user_data)
+                context = launch_context(p) if self.latency is not None and not r.already_running else None
+                since = time.time()
+                spawn_vscode(argv)
+                last_spawn = time.monotonic()
+                r.ok = True
+            except Exception as e:
+                slots.release()
+                r.error = str(e)
+                emit(r, "failed")
+                continue
+            emit(r, "spawned")
+            t = threading.Thread(target=wait, args=(r, p, since, r.already_running, context), daemon=True)
+            t.start()
+            waiters.append(t)
+
+        for t in waiters:
+            t.join()
+        return results
+
+
+def summary(results: list[LaunchResult], elapsed: float) -> list[str]:
+    ready = sum(1 for r in results if r.ready_s is not None)
+    lines = [r.describe() for r in results]
+    lines.append(f"{ready}/{len(results)} ready in {elapsed:.1f} s")
+    return lines
@@ -0,0 +1,184 @@
+# VSCode MultiData by Adam Natad
+# Prometheus textfile exporter (node_exporter --collector.textfile): profile count, per-profile
+# disk bytes, running processes and RSS, launch counters and launch-to-ready histograms. Built
+# from what the launcher already tracks (config, disk usage scanner, process tracker, latency
+# log); written atomically (temp file + replace) by a daemon thread. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable
+
+from core import Profile
+from latency import LatencyLog
+from processes import rss_bytes
+
+DEFAULT_INTERVAL_S = 15
+READY_BUCKETS = (0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+PREFIX = "vscodemd_"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Snapshot:
+    """Inputs for one render; the collect callable fills it (cheap: no scans, no polls)."""
+
+    def __init__(self, profiles: list[Profile]):
+        self.profiles = profiles
+        self.disk: dict[str, dict[str, tuple[int, int]]] = {}  # DiskUsageScanner.results
+        self.pids: dict[str, list[int]] = {}                    # profile name -> live pids
+        self.latency: LatencyLog | None = None
+
+
+class LaunchCounters:
+    """Process-lifetime counters and histograms (Prometheus counters reset on restart)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.launches: dict[tuple[str, str], int] = {}          # (profile, mode) -> count
+        self.ready: dict[str, list] = {}                        # profile -> [bucket counts, sum, count]
+        self.timeouts: dict[str, int] = {}
+
+    def launch(self, profile: str, handoff: bool = False) -> None:
+        key = (profile, "handoff" if handoff else "new")
+        with self._lock:
+            self.launches[key] = self.launches.get(key, 0) + 1
+
+    def observe_ready(self, profile: str, seconds: float | None) -> None:
+        with self._lock:
+            if seconds is None:
+                self.timeouts[profile] = self.timeouts.get(profile, 0) + 1
+                return
+            h = self.ready.setdefault(profile, [[0] * len(READY_BUCKETS), 0.0, 0])
+            for i, le in enumerate(READY_BUCKETS):
+                if seconds <= le:
+                    h[0][i] += 1
+            h[1] += seconds
+            h[2] += 1
+
+    def copy(self) -> tuple[dict, dict, dict]:
+        with self._lock:
+            ready = {p: [list(h[0]), h[1], h[2]] for p, h in self.ready.items()}
+            return dict(self.launches), ready, dict(self.timeouts)
+
+
+def render(snap: Snapshot, counters: LaunchCounters | None = None) -> str:
+    out: list[str] = []
+
+    def metric(name: str, kind: str, help_: str, samples: list[tuple[dict, float]]) -> None:
+        out.append(f"# HELP {PREFIX}{name} {help_}")
+        out.append(f"# TYPE {PREFIX}{name} {kind}")
+        for labels, value in samples:
+            lbl = ",".join(f'{k}="{_label(str(v))}"' for k, v in labels.items())
+            out.append(f"{PREFIX}{name}{{{lbl}}} {_fmt(value)}" if lbl else f"{PREFIX}{name} {_fmt(value)}")
+
+    profiles = snap.profiles
+    metric("profiles", "gauge", "Configured profiles.", [({}, len(profiles))])
+    metric("profile_disk_bytes", "gauge", "Bytes on disk per profile folder (last completed scan).", [
+        ({"profile": p.name, "kind": kind}, snap.disk[p.name][kind][0])
+        for p in profiles for kind in ("user_data", "extensions")
+        if kind in snap.disk.get(p.name, {})
+    ])
+    running = [p for p in profiles if snap.pids.get(p.name)]
+    metric("running_instances", "gauge", "Profiles with a live VS Code process tree.", [({}, len(running))])
+    metric("profile_processes", "gauge", "VS Code processes per running profile.", [
+        ({"profile": p.name}, len(snap.pids[p.name])) for p in running
+    ])
+    metric("profile_rss_bytes", "gauge", "Resident memory of a profile's VS Code processes.", [
+        ({"profile": p.name}, rss_bytes(snap.pids[p.name])) for p in running
+    ])
+
+    if counters is not None:
+        launches, ready, timeouts = counters.copy()
+        metric("launches_total", "counter", "Launches since the launcher started (mode new or handoff).", [
+            ({"profile": p, "mode": mode}, n) for (p, mode), n in sorted(launches.items())
+        ])
+        metric("launch_ready_timeouts_total", "counter", "Launches not ready within launch_ready_timeout.", [
+            ({"profile": p}, n) for p, n in sorted(timeouts.items())
+        ])
+        out.append(f"# HELP {PREFIX}launch_ready_seconds Spawn to code.lock / IPC socket.")
+        out.append(f"# TYPE {PREFIX}launch_ready_seconds histogram")
+        for p, (buckets, total, count) in sorted(ready.items()):
+            lp = _label(p)
+            for le, n in zip(READY_BUCKETS, buckets):
+                out.append(f'{PREFIX}launch_ready_seconds_bucket{{profile="{lp}",le="{_fmt(le)}"}} {n}')
+            out.append(f'{PREFIX}launch_ready_seconds_bucket{{profile="{lp}",le="+Inf"}} {count}')
+            out.append(f'{PREFIX}launch_ready_seconds_sum{{profile="{lp}"}} {_fmt(float(total))}')
+            out.append(f'{PREFIX}launch_ready_seconds_count{{profile="{lp}"}} {count}')
+
+    if snap.latency is not None:
+        history = snap.latency.history
+        stats = [snap.latency.stats(p.name) for p in profiles if p.name.lower() in history]
+        stats = [s for s in stats if s.p50 is not None]
+        metric("launch_ready_p50_seconds", "gauge", "Median launch-to-ready over the recorded history.", [
+            ({"profile": s.name}, s.p50) for s in stats
+        ])
+        metric("launch_ready_p95_seconds", "gauge", "95th percentile launch-to-ready over the recorded history.", [
+            ({"profile": s.name}, s.p95) for s in stats
+        ])
+    return "\n".join(out) + "\n"
+
+
+def write_textfile(path: str, text: str) -> None:
+    """Atomic: the collector never reads a half-written file (the temp name does not end in .prom)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class MetricsExporter:
+    def __init__(self, collect: Callable[[], Snapshot], counters: LaunchCounters | None = None):
+        self.collect = collect
+        self.counters = counters or LaunchCounters()
+        self.path = ""
+        self.interval = DEFAULT_INTERVAL_S
+        self.last_error = ""
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def write(self) -> float:
+        """Collect, render and write once; seconds taken."""
+        t0 = time.perf_counter()
+        snap = self.collect()
+        body = render(snap, self.counters)
+        took = time.perf_counter() - t0
+        body += (f"# HELP {PREFIX}exporter_seconds Time to collect and render these metrics.\n"
+                 f"# TYPE {PREFIX}exporter_seconds gauge\n{PREFIX}exporter_seconds {took!r}\n")
+        write_textfile(self.path, body)
+        return took
+
+    def configure(self, path: str, interval: float = DEFAULT_INTERVAL_S) -> None:
+        """Empty path disables; the running thread picks up changes on its next tick."""
+        self.path = path
+        self.interval = max(1.0, interval)
+        if path and self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="vscodemd-metrics", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            if self.path:
+                try:
+                    self.write()
+                    self.last_error = ""
+                except OSError as e:
+                    self.last_error = str(e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
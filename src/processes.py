@@ -0,0 +1,390 @@
+# VSCode MultiData by Adam Natad
+# Running-instance tracker: maps live VS Code process trees to profiles by their --user-data-dir.
+# Polls incrementally: each tick lists pids (cheap) and only inspects pids it has not seen before.
+# Linux reads /proc, Windows uses Toolhelp + NtQueryInformationProcess, macOS libproc + sysctl,
+# other POSIX systems fall back to `ps`. rss_bytes() sums resident memory for metrics. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable
+
+USER_DATA_FLAG = "--user-data-dir"
+FULL_RESCAN_S = 30.0  # drop the pid cache now and then so a reused pid is re-inspected
+MAX_TREE_DEPTH = 64
+
+
+def path_key(path: str) -> str:
+    """Comparable form of a user-data path (profile side and process side)."""
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+
+def user_data_arg(argv: list[str]) -> str:
+    """Value of --user-data-dir in argv, or ""."""
+    for i, a in enumerate(argv):
+        if a == USER_DATA_FLAG and i + 1 < len(argv):
+            return argv[i + 1]
+        if a.startswith(USER_DATA_FLAG + "="):
+            return a[len(USER_DATA_FLAG) + 1:]
+    return ""
+
+
+# --- Platform backends: _snapshot() -> {pid: ppid or -1}, _inspect(pid) -> (ppid, argv) | None ---
+
+def _snapshot_linux() -> dict[int, int]:
+    return {int(n): -1 for n in os.listdir("/proc") if n.isdigit()}
+
+def _inspect_linux(pid: int) -> tuple[int, list[str]] | None:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    try:
+        ppid = int(stat[stat.rindex(b")") + 2:].split()[1])  # comm may contain spaces / parens
+    except (ValueError, IndexError):
+        return None
+    argv = [a.decode("utf-8", "replace") for a in raw.split(b"\0") if a]
+    if len(argv) == 1 and " " in argv[0]:
+        argv = argv[0].split(" ")  # Chromium children rewrite argv into one space-joined string
+    return ppid, argv
+
+
+def _win_api():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_void_p),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * 260),
+        ]
+
+    class UNICODE_STRING(ctypes.Structure):
+        _fields_ = [("Length", wintypes.USHORT), ("MaximumLength", wintypes.USHORT), ("Buffer", ctypes.c_void_p)]
+
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    k32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    k32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    k32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    k32.OpenProcess.restype = wintypes.HANDLE
+    k32.CloseHandle.argtypes = [wintypes.HANDLE]
+    ntdll = ctypes.WinDLL("ntdll")
+    ntdll.NtQueryInformationProcess.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.ULONG, ctypes.POINTER(wintypes.ULONG)]
+    shell32 = ctypes.WinDLL("shell32")
+    shell32.CommandLineToArgvW.restype = ctypes.POINTER(wintypes.LPWSTR)
+    shell32.CommandLineToArgvW.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(ctypes.c_int)]
+    k32.LocalFree.argtypes = [ctypes.c_void_p]
+    return ctypes, wintypes, PROCESSENTRY32W, UNICODE_STRING, k32, ntdll, shell32
+
+_win = None
+
+def _snapshot_windows() -> dict[int, int]:
+    global _win
+    if _win is None:
+        _win = _win_api()
+    ctypes, _wt, PROCESSENTRY32W, _us, k32, _nt, _sh = _win
+    TH32CS_SNAPPROCESS = 0x2
+    snap = k32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snap or snap == ctypes.c_void_p(-1).value:
+        return {}
+    out: dict[int, int] = {}
+    try:
+        e = PROCESSENTRY32W()
+        e.dwSize = ctypes.sizeof(e)
+        ok = k32.Process32FirstW(snap, ctypes.byref(e))
+        while ok:
+            out[e.th32ProcessID] = e.th32ParentProcessID
+            ok = k32.Process32NextW(snap, ctypes.byref(e))
+    finally:
+        k32.CloseHandle(snap)
+    return out
+
+def _inspect_windows(pid: int) -> tuple[int, list[str]] | None:
+    global _win
+    if _win is None:
+        _win = _win_api()
+    ctypes, wintypes, _pe, UNICODE_STRING, k32, ntdll, shell32 = _win
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ProcessCommandLineInformation = 60  # Windows 8.1+
+    h = k32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not h:
+        return None
+    try:
+        size = wintypes.ULONG(0)
+        ntdll.NtQueryInformationProcess(h, ProcessCommandLineInformation, None, 0, ctypes.byref(size))
+        if not size.value:
+            return None
+        buf = ctypes.create_string_buffer(size.value)
+        if ntdll.NtQueryInformationProcess(h, ProcessCommandLineInformation, buf, size, ctypes.byref(size)) != 0:
+            return None
+        us = UNICODE_STRING.from_buffer(buf)
+        cmdline = ctypes.wstring_at(us.Buffer, us.Length // 2) if us.Buffer else ""
+    finally:
+        k32.CloseHandle(h)
+    argc = ctypes.c_int(0)
+    parts = shell32.CommandLineToArgvW(cmdline, ctypes.byref(argc)) if cmdline else None
+    if not parts:
+        return -1, []
+    try:
+        argv = [parts[i] for i in range(argc.value)]
+    finally:
+        k32.LocalFree(parts)
+    return -1, argv  # ppid comes from the snapshot
+
+
+_libc = None
+
+def _mac_api():
+    global _libc
+    if _libc is None:
+        import ctypes
+        import ctypes.util
+        _libc = (ctypes, ctypes.CDLL(ctypes.util.find_library("proc") or "libproc.dylib"), ctypes.CDLL(None))
+    return _libc
+
+def _snapshot_macos() -> dict[int, int]:
+    ctypes, libproc, _ = _mac_api()
+    n = libproc.proc_listallpids(None, 0)
+    if n <= 0:
+        return {}
+    buf = (ctypes.c_int * (n + 64))()
+    n = libproc.proc_listallpids(buf, ctypes.sizeof(buf))
+    return {buf[i]: -1 for i in range(max(0, n)) if buf[i] > 0}
+
+def _inspect_macos(pid: int) -> tuple[int, list[str]] | None:
+    ctypes, libproc, libc = _mac_api()
+    PROC_PIDTBSDINFO = 3
+    BSDINFO_SIZE = 136   # struct proc_bsdinfo; pbi_ppid is the 5th uint32
+    info = ctypes.create_string_buffer(BSDINFO_SIZE)
+    if libproc.proc_pidinfo(pid, PROC_PIDTBSDINFO, ctypes.c_uint64(0), info, BSDINFO_SIZE) != BSDINFO_SIZE:
+        return None
+    ppid = int.from_bytes(info.raw[16:20], sys.byteorder)
+    CTL_KERN, KERN_PROCARGS2 = 1, 49
+    mib = (ctypes.c_int * 3)(CTL_KERN, KERN_PROCARGS2, pid)
+    size = ctypes.c_size_t(0)
+    if libc.sysctl(mib, 3, None, ctypes.byref(size), None, 0) != 0 or not size.value:
+        return ppid, []
+    args = ctypes.create_string_buffer(size.value)
+    if libc.sysctl(mib, 3, args, ctypes.byref(size), None, 0) != 0:
+        return ppid, []
+    raw = args.raw[:size.value]
+    argc = int.from_bytes(raw[:4], sys.byteorder)
+    rest = raw[4:].split(b"\0")
+    strings = [s for s in rest[1:] if s]   # rest[0] is the exec path, then NUL padding
+    return ppid, [s.decode("utf-8", "replace") for s in strings[:argc]]
+
+
+_ps_cache: dict[int, tuple[int, list[str]]] = {}
+
+def _snapshot_ps() -> dict[int, int]:
+    """Generic POSIX fallback: one `ps` per tick (no per-pid API), argv kept for _inspect_ps."""
+    try:
+        out = subprocess.run(["ps", "-axww", "-o", "pid=,ppid=,args="], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    _ps_cache.clear()
+    for line in out.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
+            _ps_cache[int(parts[0])] = (int(parts[1]), parts[2].split(" ") if len(parts) > 2 else [])
+    return {pid: ppid for pid, (ppid, _a) in _ps_cache.items()}
+
+def _inspect_ps(pid: int) -> tuple[int, list[str]] | None:
+    return _ps_cache.get(pid)
+
+
+# --- Resident memory: _rss(pids) -> {pid: bytes} for the pids that could be read ---
+
+def _rss_linux(pids: list[int]) -> dict[int, int]:
+    page = os.sysconf("SC_PAGE_SIZE")
+    out = {}
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm", "rb") as f:
+                out[pid] = int(f.read().split()[1]) * page
+        except (OSError, ValueError, IndexError):
+            continue
+    return out
+
+def _rss_windows(pids: list[int]) -> dict[int, int]:
+    global _win
+    if _win is None:
+        _win = _win_api()
+    ctypes, wintypes, _pe, _us, k32, _nt, _sh = _win
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    out = {}
+    for pid in pids:
+        h = k32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not h:
+            continue
+        try:
+            c = PROCESS_MEMORY_COUNTERS()
+            c.cb = ctypes.sizeof(c)
+            if k32.K32GetProcessMemoryInfo(wintypes.HANDLE(h), ctypes.byref(c), c.cb):
+                out[pid] = c.WorkingSetSize
+        finally:
+            k32.CloseHandle(h)
+    return out
+
+def _rss_macos(pids: list[int]) -> dict[int, int]:
+    ctypes, libproc, _ = _mac_api()
+    PROC_PIDTASKINFO = 4
+    TASKINFO_SIZE = 96   # struct proc_taskinfo; pti_resident_size is the 2nd uint64
+    info = ctypes.create_string_buffer(TASKINFO_SIZE)
+    out = {}
+    for pid in pids:
+        if libproc.proc_pidinfo(pid, PROC_PIDTASKINFO, ctypes.c_uint64(0), info, TASKINFO_SIZE) == TASKINFO_SIZE:
+            out[pid] = int.from_bytes(info.raw[8:16], sys.byteorder)
+    return out
+
+def _rss_ps(pids: list[int]) -> dict[int, int]:
+    if not pids:
+        return {}
+    try:
+        out = subprocess.run(["ps", "-o", "pid=,rss=", "-p", ",".join(map(str, pids))],
+                             capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    rss = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+            rss[int(parts[0])] = int(parts[1]) * 1024  # KiB
+    return rss
+
+
+if sys.platform.startswith("linux"):
+    _snapshot, _inspect, _rss = _snapshot_linux, _inspect_linux, _rss_linux
+elif os.name == "nt":
+    _snapshot, _inspect, _rss = _snapshot_windows, _inspect_windows, _rss_windows
+elif sys.platform == "darwin":
+    _snapshot, _inspect, _rss = _snapshot_macos, _inspect_macos, _rss_macos
+else:
+    _snapshot, _inspect, _rss = _snapshot_ps, _inspect_ps, _rss_ps
+
+
+def rss_bytes(pids: list[int]) -> int:
+    """Summed resident memory of pids (processes that exited or can't be read count as 0).
+    Shared pages are counted once per process, as top / Task Manager do."""
+    try:
+        return sum(_rss(list(pids)).values())
+    except OSError:
+        return 0
+
+
+class ProcessTracker:
+    """running maps path_key(user_data) -> pids of the VS Code process tree using it.
+    poll() is blocking (the GUI calls it from start()'s thread; the CLI once)."""
+
+    def __init__(self):
+        self.running: dict[str, list[int]] = {}
+        self._procs: dict[int, tuple[int, str]] = {}  # pid -> (ppid, path_key of its --user-data-dir or "")
+        self._last_full = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def poll(self) -> dict[str, list[int]]:
+        with self._lock:
+            return self._poll()
+
+    def _poll(self) -> dict[str, list[int]]:
+        try:
+            snap = _snapshot()
+        except OSError:
+            return self.running
+        now = time.monotonic()
+        if now - self._last_full >= FULL_RESCAN_S:
+            self._procs = {}
+            self._last_full = now
+        procs = {pid: v for pid, v in self._procs.items() if pid in snap}
+        for pid, ppid in snap.items():
+            if pid in procs:
+                continue
+            info = _inspect(pid)
+            if info is None:
+                procs[pid] = (ppid, "")  # gone or access denied: don't retry every tick
+                continue
+            ud = user_data_arg(info[1])
+            procs[pid] = (ppid if ppid >= 0 else info[0], path_key(ud) if ud else "")
+        self._procs = procs
+
+        memo: dict[int, str] = {}
+
+        def key_of(pid: int) -> str:
+            chain = []
+            key = ""
+            while pid in procs and pid not in memo and len(chain) < MAX_TREE_DEPTH:
+                chain.append(pid)
+                ppid, key = procs[pid]
+                if key or ppid == pid:
+                    break
+                pid = ppid
+            else:
+                key = memo.get(pid, "")
+            for c in chain:
+                memo[c] = key
+            return key
+
+        running: dict[str, list[int]] = {}
+        for pid in procs:
+            k = key_of(pid)
+            if k:
+                running.setdefault(k, []).append(pid)
+        for pids in running.values():
+            pids.sort()
+        self.running = running
+        return running
+
+    def pids(self, user_data: str) -> list[int]:
+        return self.running.get(path_key(user_data), [])
+
+    def start(self, on_change: Callable[[dict[str, list[int]]], None], interval: float = 2.0) -> None:
+        """Poll on a daemon thread; on_change(running) fires (from that thread) when the map changes."""
+        if self._thread:
+            return
+
+        def loop() -> None:
+            last = None
+            while not self._stop.is_set():
+                running = self.poll()
+                if running != last:
+                    last = running
+                    on_change(running)
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name="vscodemd-processes", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,107 @@
+# VSCode MultiData by Adam Natad
+# Cache purge: removes the rebuildable cache dirs (core.USER_DATA_CACHE_DIRS) from profiles'
+# user-data dirs on a worker pool. Profiles with a live instance are refused. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import USER_DATA_CACHE_DIRS, Profile, human_bytes
+from processes import ProcessTracker
+from readiness import instance_alive
+
+PURGE_WORKERS = 4
+
+
+class PurgeResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.bytes = 0
+        self.files = 0
+        self.elapsed = 0.0
+        self.refused = ""   # reason the profile was not touched
+        self.errors: list[str] = []
+
+    def describe(self) -> str:
+        if self.refused:
+            return f"{self.name}: skipped ({self.refused})"
+        line = f"{self.name}: {human_bytes(self.bytes)} in {self.files} files, {self.elapsed:.2f} s"
+        if self.errors:
+            line += f", {len(self.errors)} errors"
+        return line
+
+
+def _purge_dir(root: str, dry_run: bool, r: PurgeResult) -> None:
+    for d, dirs, files in os.walk(root, topdown=False):
+        for name in files:
+            path = os.path.join(d, name)
+            try:
+                size = os.lstat(path).st_size
+                if not dry_run:
+                    os.remove(path)
+            except OSError as e:
+                r.errors.append(f"{path}: {e}")
+                continue
+            r.bytes += size
+            r.files += 1
+        if not dry_run:
+            for name in dirs:
+                try:
+                    os.rmdir(os.path.join(d, name))
+                except OSError:
+                    pass  # not empty: a file above could not be removed
+    if not dry_run:
+        try:
+            os.rmdir(root)
+        except OSError:
+            pass
+
+
+def purge_profile(p: Profile, dry_run: bool = False, running: bool = False) -> PurgeResult:
+    r = PurgeResult(p.name)
+    t0 = time.perf_counter()
+    if running or instance_alive(p.user_data):
+        r.refused = "running"
+        return r
+    for name in sorted(USER_DATA_CACHE_DIRS):
+        path = os.path.join(p.user_data, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            _purge_dir(path, dry_run, r)
+    r.elapsed = time.perf_counter() - t0
+    return r
+
+
+def purge_profiles(
+    profiles: list[Profile],
+    dry_run: bool = False,
+    on_result: Callable[[PurgeResult], None] | None = None,
+    tracker: ProcessTracker | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> list[PurgeResult]:
+    """Purge in parallel; on_result fires per profile from worker threads. Results keep input order.
+    Profiles with a process in `tracker` (polled here; a fresh one when None) are refused, and so
+    are profiles not started yet once cancelled() turns true."""
+    tracker = tracker or ProcessTracker()
+    tracker.poll()
+
+    def one(p: Profile) -> PurgeResult:
+        if cancelled is not None and cancelled():
+            r = PurgeResult(p.name)
+            r.refused = "cancelled"
+        else:
+            r = purge_profile(p, dry_run, bool(tracker.pids(p.user_data)))
+        if on_result:
+            on_result(r)
+        return r
+
+    with ThreadPoolExecutor(max_workers=PURGE_WORKERS, thread_name_prefix="vscodemd-purge") as pool:
+        return list(pool.map(one, profiles))
+
+
+def summary(results: list[PurgeResult], elapsed: float, dry_run: bool = False) -> list[str]:
+    total = sum(r.bytes for r in results)
+    verb = "reclaimable" if dry_run else "reclaimed"
+    return [r.describe() for r in results] + [f"{human_bytes(total)} {verb} in {elapsed:.1f} s"]
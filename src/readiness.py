@@ -0,0 +1,109 @@
+# VSCode MultiData by Adam Natad
+# "Ready" detection for a launched VS Code instance: its main process writes code.lock and (POSIX)
+# a <version>-main.sock IPC socket into the user-data dir. No tkinter here.
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+
+POLL_INTERVAL = 0.1
+LOCK_FILENAME = "code.lock"
+SOCKET_SUFFIX = "-main.sock"
+
+
+def ready_marker(user_data: str) -> tuple[str, float] | None:
+    """(path, mtime) of the newest readiness marker in user_data, or None."""
+    best: tuple[str, float] | None = None
+    try:
+        with os.scandir(user_data) as it:
+            for e in it:
+                if e.name == LOCK_FILENAME or e.name.endswith(SOCKET_SUFFIX):
+                    try:
+                        mtime = e.stat(follow_symlinks=False).st_mtime
+                    except OSError:
+                        continue
+                    if best is None or mtime > best[1]:
+                        best = (e.path, mtime)
+    except OSError:
+        return None
+    return best
+
+
+def pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        h = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not h:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            ok = ctypes.windll.kernel32.GetExitCodeProcess(h, ctypes.byref(code))
+            return bool(ok) and code.value == STILL_ACTIVE
+        finally:
+            ctypes.windll.kernel32.CloseHandle(h)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def instance_alive(user_data: str) -> bool:
+    """True when a VS Code instance is using user_data: its IPC socket accepts a connection (POSIX)
+    or the pid in code.lock is alive. Stale markers left by a crash do not count."""
+    try:
+        names = os.listdir(user_data)
+    except OSError:
+        return False
+    for name in names:
+        path = os.path.join(user_data, name)
+        if name.endswith(SOCKET_SUFFIX) and hasattr(socket, "AF_UNIX"):
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            s.settimeout(0.2)
+            try:
+                s.connect(path)
+                return True
+            except OSError:
+                pass
+            finally:
+                s.close()
+        elif name == LOCK_FILENAME:
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    pid = int(f.read(32).strip() or 0)
+            except (OSError, ValueError):
+                continue
+            if pid_alive(pid):
+                return True
+    return False
+
+
+def is_ready(user_data: str, since: float, was_running: bool = False) -> bool:
+    """since is time.time() at spawn. A pre-existing marker counts when the instance was already
+    running (VS Code hands the request to it and exits)."""
+    marker = ready_marker(user_data)
+    if marker is None:
+        return False
+    return was_running or marker[1] >= since - 1.0  # 1 s slack for coarse filesystem mtimes
+
+
+def wait_ready(user_data: str, since: float, timeout: float, was_running: bool = False, cancelled=None) -> float | None:
+    """Seconds from `since` until ready, or None on timeout / cancel."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if cancelled is not None and cancelled():
+            return None
+        if is_ready(user_data, since, was_running):
+            return max(0.0, time.time() - since)
+        time.sleep(POLL_INTERVAL)
+    return None
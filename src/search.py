@@ -0,0 +1,155 @@
+# VSCode MultiData by Adam Natad
+# Profile search index for the quick-launch box: trigram -> terms -> profiles, where terms are
+# profile names and path components. Generated profiles share most path components, so the term
+# vocabulary stays small even with thousands of profiles. Updated incrementally. No tkinter here.
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import os
+import re
+from collections import Counter
+
+from core import Profile
+
+NAME_WEIGHT = 4.0
+PATH_WEIGHT = 1.0
+FUZZY_MIN_OVERLAP = 0.6  # share of the query's trigrams a term needs when nothing matches as a substring
+
+_SPLIT = re.compile(r"[\\/]+")
+
+
+def trigrams(s: str) -> set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def _profile_terms(p: Profile) -> dict[str, float]:
+    terms: dict[str, float] = {}
+    for path in (p.user_data, p.extensions):
+        for part in _SPLIT.split(path.lower()):
+            if part and part not in terms:
+                terms[part] = PATH_WEIGHT
+    terms[p.name.lower()] = NAME_WEIGHT
+    return terms
+
+
+class ProfileIndex:
+    def __init__(self):
+        self._terms: dict[str, dict[str, float]] = {}    # term -> {profile name: field weight}
+        self._grams: dict[str, set[str]] = {}            # trigram -> terms
+        self._sorted: list[str] = []                     # terms, for prefix lookups
+        self._indexed: dict[str, tuple[str, str, dict[str, float]]] = {}  # name -> (ud, ex, terms)
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def sync(self, profiles: list[Profile]) -> None:
+        """Re-index only profiles that were added, removed or whose paths changed."""
+        names = {p.name for p in profiles}
+        for name in [n for n in self._indexed if n not in names]:
+            self.remove(name)
+        for p in profiles:
+            old = self._indexed.get(p.name)
+            if old is None or old[0] != p.user_data or old[1] != p.extensions:
+                self.add(p)
+
+    def add(self, p: Profile) -> None:
+        if p.name in self._indexed:
+            self.remove(p.name)
+        terms = _profile_terms(p)
+        self._indexed[p.name] = (p.user_data, p.extensions, terms)
+        for term, weight in terms.items():
+            owners = self._terms.get(term)
+            if owners is None:
+                owners = self._terms[term] = {}
+                bisect.insort(self._sorted, term)
+                for g in trigrams(term):
+                    self._grams.setdefault(g, set()).add(term)
+            owners[p.name] = weight
+
+    def remove(self, name: str) -> None:
+        entry = self._indexed.pop(name, None)
+        if entry is None:
+            return
+        for term in entry[2]:
+            owners = self._terms.get(term)
+            if owners is None:
+                continue
+            owners.pop(name, None)
+            if not owners:
+                del self._terms[term]
+                del self._sorted[bisect.bisect_left(self._sorted, term)]
+                for g in trigrams(term):
+                    bucket = self._grams.get(g)
+                    if bucket is not None:
+                        bucket.discard(term)
+                        if not bucket:
+                            del self._grams[g]
+
+    def _match_terms(self, word: str) -> dict[str, float]:
+        """term -> match quality for one query word: exact 3, prefix 2, substring 1.5, fuzzy <= 1
+        (trigram overlap, then letters in order within a profile name)."""
+        lo = bisect.bisect_left(self._sorted, word)
+        hi = bisect.bisect_left(self._sorted, word + "\uffff", lo)
+        out = dict.fromkeys(self._sorted[lo:hi], 2.0)
+        if word in out:
+            out[word] = 3.0
+        grams = trigrams(word)
+        if len(word) == 1:
+            return out  # prefix only
+        if not grams:
+            for t in self._terms:  # 2 characters: no trigram to look up; the vocabulary is small
+                if t not in out and word in t:
+                    out[t] = 1.5
+            return out
+        buckets = sorted((self._grams.get(g, set()) for g in grams), key=len)
+        if buckets[0]:
+            for t in set.intersection(*buckets):
+                if t not in out and word in t:
+                    out[t] = 1.5
+        if not out:
+            counts = Counter(t for b in buckets for t in b)
+            need = FUZZY_MIN_OVERLAP * len(grams)
+            for t, c in counts.items():
+                if c >= need:
+                    out[t] = c / len(grams)
+        if not out:
+            # letters in order within a profile name ("pydv" -> python-dev)
+            pattern = re.compile(".*?".join(map(re.escape, word)))
+            for name in self._indexed:
+                t = name.lower()
+                if t in self._terms and pattern.search(t):
+                    out[t] = 0.5
+        return out
+
+    def query(self, text: str, limit: int = 20) -> list[str]:
+        """Profile names ranked by match; every whitespace-separated word must match."""
+        words = text.lower().split()
+        if not words:
+            return []
+        matches = [self._match_terms(w) for w in dict.fromkeys(words)]
+        # most selective word first; the others only score the profiles it matched
+        matches.sort(key=len)
+        scores: dict[str, float] = {}
+        for term, quality in matches[0].items():
+            for name, weight in self._terms[term].items():
+                s = quality * weight
+                if s > scores.get(name, 0.0):
+                    scores[name] = s
+        for m in matches[1:]:
+            narrowed = {}
+            for name, score in scores.items():
+                best = max((m[t] * w for t, w in self._indexed[name][2].items() if t in m), default=0.0)
+                if best:
+                    narrowed[name] = score + best
+            scores = narrowed
+            if not scores:
+                return []
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], len(kv[0]), kv[0]))
+        return [name for name, _s in ranked]
+
+
+def describe(p: Profile) -> str:
+    """One-line label for a search hit."""
+    return f"{p.name}    {os.path.dirname(p.user_data) or p.user_data}"
@@ -0,0 +1,383 @@
+# VSCode MultiData by Adam Natad
+# Settings propagation: copy User/settings.json, keybindings.json and snippets/ from one profile's
+# user-data to others. Files are compared by SHA-256 (cached by size + mtime in cache/), so only
+# changed ones are written; settings.json can instead be merged key by key, editing the target's
+# JSON-with-comments text in place so its comments and other keys stay. Targets run in parallel.
+# No tkinter here.
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from core import Profile, cache_dir, ensure_dir, load_json, save_json
+from dedup import hash_file
+
+SYNC_WORKERS = 8
+ITEMS = ("settings", "keybindings", "snippets")
+ITEM_PATHS = {
+    "settings": "User/settings.json",
+    "keybindings": "User/keybindings.json",
+    "snippets": "User/snippets",
+}
+
+
+def index_path() -> str:
+    return os.path.join(cache_dir(), "settings-hashes.json")
+
+
+class HashCache:
+    """path -> [size, mtime_ns, sha256]; a file is re-hashed only when its size or mtime moved."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or index_path()
+        data = load_json(self.path, {})
+        self.entries: dict[str, list] = data if isinstance(data, dict) else {}
+        self.hashed = 0
+        self._lock = threading.Lock()
+
+    def digest(self, path: str) -> str | None:
+        """None when the file is missing or unreadable."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            hit = self.entries.get(path)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        try:
+            digest = hash_file(path)
+        except OSError:
+            return None
+        with self._lock:
+            self.entries[path] = [st.st_size, st.st_mtime_ns, digest]
+            self.hashed += 1
+        return digest
+
+    def forget(self, path: str) -> None:
+        with self._lock:
+            self.entries.pop(path, None)
+
+    def save(self) -> None:
+        with self._lock:
+            data = dict(self.entries)
+        try:
+            save_json(self.path, data)
+        except OSError:
+            pass  # cache only
+
+
+# --- JSON with comments ---
+
+class JsoncError(ValueError):
+    pass
+
+
+def _skip(text: str, i: int) -> int:
+    """Past whitespace and // or /* */ comments."""
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in " \t\r\n\ufeff":
+            i += 1
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            i = n if j < 0 else j + 1
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            if j < 0:
+                raise JsoncError("unterminated comment")
+            i = j + 2
+        else:
+            break
+    return i
+
+def _string_end(text: str, i: int) -> int:
+    """text[i] is the opening quote; index just past the closing one."""
+    j = i + 1
+    n = len(text)
+    while j < n:
+        c = text[j]
+        if c == "\\":
+            j += 2
+        elif c == '"':
+            return j + 1
+        else:
+            j += 1
+    raise JsoncError("unterminated string")
+
+def _value_end(text: str, i: int) -> int:
+    """End of the JSON value starting at i (nested objects / arrays, strings and comments aware)."""
+    if i >= len(text):
+        raise JsoncError("value expected")
+    c = text[i]
+    if c == '"':
+        return _string_end(text, i)
+    if c in "{[":
+        depth = 0
+        j = i
+        while j < len(text):
+            c = text[j]
+            if c == '"':
+                j = _string_end(text, j)
+                continue
+            if text.startswith("//", j) or text.startswith("/*", j):
+                j = _skip(text, j)
+                continue
+            if c in "{[":
+                depth += 1
+            elif c in "}]":
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+            j += 1
+        raise JsoncError("unbalanced brackets")
+    j = i
+    while j < len(text) and text[j] not in ",}] \t\r\n/":
+        j += 1
+    if j == i:
+        raise JsoncError(f"unexpected {c!r}")
+    return j
+
+
+class JsoncObject:
+    """Top-level members of a JSONC object as (key, key_start, value_start, value_end)."""
+
+    def __init__(self, text: str):
+        self.text = text
+        i = _skip(text, 0)
+        if i >= len(text) or text[i] != "{":
+            raise JsoncError("settings must be a JSON object")
+        self.open = i
+        self.members: list[tuple[str, int, int, int]] = []
+        i = _skip(text, i + 1)
+        while i < len(text) and text[i] != "}":
+            if text[i] != '"':
+                raise JsoncError(f"key expected at offset {i}")
+            k_end = _string_end(text, i)
+            key = json.loads(text[i:k_end])
+            j = _skip(text, k_end)
+            if j >= len(text) or text[j] != ":":
+                raise JsoncError(f"':' expected after {key!r}")
+            v_start = _skip(text, j + 1)
+            v_end = _value_end(text, v_start)
+            self.members.append((key, i, v_start, v_end))
+            i = _skip(text, v_end)
+            if i < len(text) and text[i] == ",":
+                i = _skip(text, i + 1)
+        if i >= len(text):
+            raise JsoncError("unterminated object")
+        self.close = i
+
+    def values(self) -> dict[str, str]:
+        """key -> raw value text (comments inside the value kept)."""
+        return {k: self.text[vs:ve] for k, _ks, vs, ve in self.members}
+
+    def _indent(self) -> str:
+        if not self.members:
+            return "    "
+        ks = self.members[0][1]
+        line = self.text.rfind("\n", 0, ks) + 1
+        pad = self.text[line:ks]
+        return pad if pad.strip() == "" else "    "
+
+    def with_values(self, updates: dict[str, str]) -> str:
+        """Text with each key set to the raw value text: replaced in place, or appended."""
+        text = self.text
+        spans = {k: (vs, ve) for k, _ks, vs, ve in self.members}
+        edits: list[tuple[int, int, str]] = []
+        for key, raw in updates.items():
+            if key in spans:
+                vs, ve = spans[key]
+                if text[vs:ve] != raw:
+                    edits.append((vs, ve, raw))
+        added = [(k, v) for k, v in updates.items() if k not in spans]
+        if added:
+            indent = self._indent()
+            body = "".join(f",\n{indent}{json.dumps(k)}: {v}" for k, v in added)
+            if self.members:
+                last_end = self.members[-1][3]
+                j = _skip(text, last_end)
+                if text[j] == ",":   # trailing comma already there
+                    edits.append((j + 1, j + 1, body.lstrip(",")))
+                else:
+                    edits.append((last_end, last_end, body))
+            else:
+                edits.append((self.open + 1, self.open + 1, body.lstrip(",") + "\n"))
+        for start, end, new in sorted(edits, reverse=True):
+            text = text[:start] + new + text[end:]
+        return text
+
+
+def merge_jsonc(target_text: str, source_text: str, keys: list[str] | None = None) -> tuple[str, list[str]]:
+    """(new target text, keys changed). keys None = every top-level key of the source; keys the
+    source does not have are left alone in the target."""
+    src = JsoncObject(source_text).values()
+    dst = JsoncObject(target_text if target_text.strip() else "{}")
+    current = dst.values()
+    wanted = {k: src[k] for k in (keys if keys is not None else list(src)) if k in src}
+    changed = [k for k, v in wanted.items() if current.get(k) != v]
+    if not changed:
+        return dst.text, []
+    return dst.with_values({k: wanted[k] for k in changed}), changed
+
+
+# --- Sync ---
+
+class SyncResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.copied: list[str] = []    # rel paths written whole
+        self.merged: list[str] = []    # "settings.json: key" entries
+        self.unchanged = 0
+        self.elapsed = 0.0
+        self.refused = ""
+        self.errors: list[str] = []
+
+    def describe(self) -> str:
+        if self.refused:
+            return f"{self.name}: skipped ({self.refused})"
+        line = f"{self.name}: {len(self.copied)} copied, {len(self.merged)} keys merged, {self.unchanged} unchanged, {self.elapsed * 1000.0:.0f} ms"
+        if self.errors:
+            line += f", {len(self.errors)} errors"
+        return line
+
+    def lines(self) -> list[str]:
+        return [self.describe()] + [f"  {x}" for x in self.copied + self.merged] + [f"  error: {e}" for e in self.errors]
+
+
+def source_files(src: Profile, items: tuple[str, ...] = ITEMS) -> list[str]:
+    """rel paths under the user-data dir ("/"-separated) that exist in src for the chosen items."""
+    out = []
+    for item in items:
+        rel = ITEM_PATHS[item]
+        path = os.path.join(src.user_data, *rel.split("/"))
+        if item == "snippets":
+            try:
+                names = sorted(e.name for e in os.scandir(path) if e.is_file(follow_symlinks=False))
+            except OSError:
+                continue
+            out += [f"{rel}/{n}" for n in names]
+        elif os.path.isfile(path):
+            out.append(rel)
+    return out
+
+
+def _write_text(path: str, text: str) -> None:
+    ensure_dir(os.path.dirname(path))
+    tmp = f"{path}.vscodemd-sync"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp, path)  # VS Code's file watcher sees one change, never a half-written file
+
+def _copy_file(src: str, dst: str) -> None:
+    ensure_dir(os.path.dirname(dst))
+    tmp = f"{dst}.vscodemd-sync"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def sync_profile(
+    src: Profile,
+    dst: Profile,
+    rels: list[str],
+    cache: HashCache,
+    merge: bool = False,
+    keys: list[str] | None = None,
+    dry_run: bool = False,
+) -> SyncResult:
+    """Bring dst's copies of rels in line with src. merge: settings.json gets only the source's
+    (or the given) keys, edited into the target's text; other files are always copied whole."""
+    r = SyncResult(dst.name)
+    t0 = time.perf_counter()
+    if os.path.normcase(os.path.abspath(src.user_data)) == os.path.normcase(os.path.abspath(dst.user_data)):
+        r.refused = "same user data as the source"
+        return r
+    for rel in rels:
+        s_path = os.path.join(src.user_data, *rel.split("/"))
+        d_path = os.path.join(dst.user_data, *rel.split("/"))
+        try:
+            if merge and rel == ITEM_PATHS["settings"]:
+                if cache.digest(s_path) == cache.digest(d_path):
+                    r.unchanged += 1
+                    continue
+                text, changed = merge_jsonc(_read_text(d_path), _read_text(s_path), keys)
+                if not changed:
+                    r.unchanged += 1
+                    continue
+                if not dry_run:
+                    _write_text(d_path, text)
+                    cache.forget(d_path)
+                r.merged += [f"{rel}: {k}" for k in changed]
+                continue
+            s_digest = cache.digest(s_path)
+            if s_digest is None:
+                r.errors.append(f"{rel}: source unreadable")
+                continue
+            if s_digest == cache.digest(d_path):
+                r.unchanged += 1
+                continue
+            if not dry_run:
+                _copy_file(s_path, d_path)
+                cache.forget(d_path)
+            r.copied.append(rel)
+        except (OSError, JsoncError) as e:
+            r.errors.append(f"{rel}: {e}")
+    r.elapsed = time.perf_counter() - t0
+    return r
+
+
+def sync_settings(
+    src: Profile,
+    targets: list[Profile],
+    items: tuple[str, ...] = ITEMS,
+    merge: bool = False,
+    keys: list[str] | None = None,
+    dry_run: bool = False,
+    on_result: Callable[[SyncResult], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> list[SyncResult]:
+    """sync_profile for every target on a worker pool; on_result fires per target from worker
+    threads, results keep input order. VS Code picks up the new files while running."""
+    cache = HashCache()
+    rels = source_files(src, items)
+    for rel in rels:
+        cache.digest(os.path.join(src.user_data, *rel.split("/")))  # once, not once per target
+
+    def one(p: Profile) -> SyncResult:
+        if cancelled is not None and cancelled():
+            r = SyncResult(p.name)
+            r.refused = "cancelled"
+        else:
+            r = sync_profile(src, p, rels, cache, merge, keys, dry_run)
+        if on_result:
+            on_result(r)
+        return r
+
+    with ThreadPoolExecutor(max_workers=SYNC_WORKERS, thread_name_prefix="vscodemd-sync") as pool:
+        results = list(pool.map(one, targets))
+    cache.save()
+    return results
+
+
+def summary(results: list[SyncResult], elapsed: float, dry_run: bool = False) -> list[str]:
+    copied = sum(len(r.copied) for r in results)
+    merged = sum(len(r.merged) for r in results)
+    verb = "would change" if dry_run else "changed"
+    lines: list[str] = []
+    for r in results:
+        lines += r.lines()
+    return lines + [f"{len(results)} profiles: {verb} {copied} files and {merged} keys in {elapsed:.2f} s"]
@@ -0,0 +1,539 @@
+# VSCode MultiData by Adam Natad
+# Incremental profile snapshots: user-data files are stored once by SHA-256 under
+# <base_dir>/.vscodemd/snapshots/chunks and described by one JSON manifest per snapshot. Files up
+# to WHOLE_FILE_MAX are one chunk (hashed at hashlib speed); larger ones (state.vscdb and other
+# databases, rewritten in place) are cut into content-defined chunks by a gear hash, so an edit
+# only stores the chunks around it. That boundary scan is pure Python, roughly 3-5 MB/s per
+# worker, which is why only large files pay for it. Files unchanged since the previous snapshot
+# (size, mtime) are not read again; changed ones are hashed in worker processes. Restore rewrites
+# only the files that differ. Caches and lock files are skipped. No tkinter here.
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+from core import USER_DATA_CACHE_DIRS, Profile, data_dir, ensure_dir, human_bytes, is_instance_lock, load_json, save_json
+from readiness import instance_alive
+
+MIN_CHUNK = 8 * 1024
+MAX_CHUNK = 256 * 1024
+WHOLE_FILE_MAX = 4 * 1024 * 1024  # files up to this size are one chunk: no boundary scan
+BOUNDARY_MASK = 0xFFFE0000        # 15 bits: ~32 KB past MIN_CHUNK on average
+READ_BLOCK = 1024 * 1024
+BATCH_BYTES = 16 * 1024 * 1024    # changed files handed to a worker together (small files dominate)
+BATCH_FILES = 512
+HASH_WORKERS = max(1, min(8, os.cpu_count() or 1))
+RESTORE_WORKERS = 8
+MANIFEST_VERSION = 1
+
+_rnd = random.Random(0x5EED)      # fixed table: chunk boundaries must not change between runs
+GEAR = tuple(_rnd.getrandbits(32) for _ in range(256))
+del _rnd
+
+
+def store_dir(base_dir: str) -> str:
+    return os.path.join(data_dir(base_dir), "snapshots")
+
+def chunk_path(store: str, digest: str) -> str:
+    return os.path.join(store, "chunks", digest[:2], digest)
+
+def manifest_dir(store: str, profile_name: str) -> str:
+    return os.path.join(store, "manifests", re.sub(r"[^\w.-]", "_", profile_name.lower()))
+
+
+# --- Chunking ---
+
+def cut_point(buf, eof: bool) -> int:
+    """Length of the next chunk at the start of buf; 0 = need more data (buf shorter than MAX_CHUNK)."""
+    n = len(buf)
+    if n < MAX_CHUNK and not eof:
+        return 0
+    limit = min(n, MAX_CHUNK)
+    if limit <= MIN_CHUNK:
+        return limit
+    gear = GEAR
+    h = 0
+    for i, b in enumerate(memoryview(buf)[MIN_CHUNK:limit], MIN_CHUNK):
+        h = ((h << 1) + gear[b]) & 0xFFFFFFFF
+        if not h & BOUNDARY_MASK:
+            return i + 1
+    return limit
+
+def iter_chunks(path: str):
+    """Chunks of a file, read READ_BLOCK at a time (a file is never held whole)."""
+    buf = bytearray()
+    eof = False
+    with open(path, "rb") as f:
+        while True:
+            if not eof and len(buf) < MAX_CHUNK:
+                block = f.read(READ_BLOCK)
+                if block:
+                    buf += block
+                    continue
+                eof = True
+            if not buf:
+                return
+            n = cut_point(buf, eof)
+            yield bytes(buf[:n])
+            del buf[:n]
+
+def put_chunk(store: str, digest: str, data: bytes) -> int:
+    """Write a chunk unless the store has it; stored bytes (0 when already present)."""
+    path = chunk_path(store, digest)
+    if os.path.exists(path):
+        return 0
+    ensure_dir(os.path.dirname(path))
+    packed = zlib.compress(data, 1)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(packed)
+    os.replace(tmp, path)  # a concurrent writer of the same digest wrote the same bytes
+    return len(packed)
+
+def read_chunk(store: str, digest: str) -> bytes:
+    with open(chunk_path(store, digest), "rb") as f:
+        data = zlib.decompress(f.read())
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise OSError(f"chunk {digest[:12]} is corrupt")
+    return data
+
+def whole_file(path: str):
+    """A file up to WHOLE_FILE_MAX as its only chunk (nothing for an empty file)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data:
+        yield data
+
+def chunk_file(path: str, store: str | None) -> tuple[list[str], int, int]:
+    """(chunk digests, new chunks, new stored bytes); store=None only hashes."""
+    digests = []
+    new = new_bytes = 0
+    chunks = whole_file(path) if os.path.getsize(path) <= WHOLE_FILE_MAX else iter_chunks(path)
+    for data in chunks:
+        digest = hashlib.sha256(data).hexdigest()
+        digests.append(digest)
+        if store is not None:
+            written = put_chunk(store, digest, data)
+            if written:
+                new += 1
+                new_bytes += written
+    return digests, new, new_bytes
+
+def _chunk_batch(store: str | None, paths: list[str]) -> list[tuple]:
+    """Worker: (digests, new, new_bytes) or an error string per path, in order."""
+    out = []
+    for path in paths:
+        try:
+            out.append(chunk_file(path, store))
+        except OSError as e:
+            out.append(str(e))
+    return out
+
+def worker_pool(workers: int = HASH_WORKERS) -> Executor:
+    """Worker processes (spawned: the GUI has threads running); threads where that is unavailable."""
+    try:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    except (OSError, NotImplementedError, ImportError):
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vscodemd-worker")
+
+def _batches(jobs: list[tuple[str, int]]) -> list[list[str]]:
+    out: list[list[str]] = []
+    cur: list[str] = []
+    size = 0
+    for path, n in jobs:
+        cur.append(path)
+        size += n
+        if size >= BATCH_BYTES or len(cur) >= BATCH_FILES:
+            out.append(cur)
+            cur, size = [], 0
+    if cur:
+        out.append(cur)
+    return out
+
+def _chunk_many(store: str | None, jobs: list[tuple[str, int]], on_file: Callable[[int], None] | None = None,
+                cancelled: Callable[[], bool] | None = None) -> list:
+    """chunk_file over (path, size) jobs on the worker pool; results in job order (None if cancelled)."""
+    results: list = []
+    if not jobs:
+        return results
+    with worker_pool() as pool:
+        futures = [pool.submit(_chunk_batch, store, batch) for batch in _batches(jobs)]
+        for fut in futures:
+            if cancelled is not None and cancelled():
+                for f in futures:
+                    f.cancel()
+                return results + [None] * (len(jobs) - len(results))
+            batch = fut.result()
+            results += batch
+            if on_file:
+                on_file(len(batch))
+    return results
+
+
+# --- Tree walk ---
+
+def scan_user_data(root: str) -> dict[str, os.stat_result]:
+    """rel path ("/"-separated) -> stat for files to keep: top-level cache dirs, instance locks
+    and symlinks are left out."""
+    out: dict[str, os.stat_result] = {}
+    stack = [(root, "")]
+    while stack:
+        d, rel = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if not rel and e.name in USER_DATA_CACHE_DIRS:
+                            continue
+                        stack.append((e.path, f"{rel}{e.name}/"))
+                    elif e.is_file(follow_symlinks=False) and not is_instance_lock(e.name):
+                        out[rel + e.name] = os.stat(e.path, follow_symlinks=False)
+                except OSError:
+                    continue
+    return out
+
+
+# --- Manifests ---
+
+class SnapshotInfo:
+    def __init__(self, path: str, doc: dict):
+        self.path = path
+        self.id = doc.get("id", "")
+        self.profile = doc.get("profile", "")
+        self.created = doc.get("created", 0.0)
+        self.files: dict[str, list] = doc.get("files", {})   # rel -> [size, mtime_ns, mode, [digests]]
+        self.bytes = doc.get("bytes", 0)
+        self.new_bytes = doc.get("new_bytes", 0)
+        self.live = doc.get("live", False)
+
+    def describe(self) -> str:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created))
+        line = f"{self.id}  {stamp}  {len(self.files)} files, {human_bytes(self.bytes)} (+{human_bytes(self.new_bytes)} stored)"
+        return line + ("  [taken while running]" if self.live else "")
+
+
+def list_snapshots(base_dir: str, profile_name: str) -> list[SnapshotInfo]:
+    """Oldest first."""
+    d = manifest_dir(store_dir(base_dir), profile_name)
+    try:
+        names = sorted(n for n in os.listdir(d) if n.endswith(".json"))
+    except OSError:
+        return []
+    out = []
+    for n in names:
+        doc = load_json(os.path.join(d, n), None)
+        if isinstance(doc, dict) and doc.get("version") == MANIFEST_VERSION:
+            out.append(SnapshotInfo(os.path.join(d, n), doc))
+    return out
+
+def find_snapshot(base_dir: str, profile_name: str, snap_id: str | None = None) -> SnapshotInfo | None:
+    """snap_id None: the latest; otherwise an exact id or a unique prefix."""
+    snaps = list_snapshots(base_dir, profile_name)
+    if not snap_id:
+        return snaps[-1] if snaps else None
+    hits = [s for s in snaps if s.id == snap_id] or [s for s in snaps if s.id.startswith(snap_id)]
+    return hits[0] if len(hits) == 1 else None
+
+def _new_id(d: str) -> str:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    snap_id, n = stamp, 1
+    while os.path.exists(os.path.join(d, f"{snap_id}.json")):
+        n += 1
+        snap_id = f"{stamp}-{n}"
+    return snap_id
+
+
+# --- Snapshot ---
+
+class SnapshotReport:
+    def __init__(self, name: str):
+        self.name = name
+        self.id = ""
+        self.files = 0
+        self.bytes = 0
+        self.unchanged = 0     # reused from the previous manifest without reading
+        self.chunked = 0
+        self.new_chunks = 0
+        self.new_bytes = 0     # compressed bytes added to the store
+        self.live = False
+        self.cancelled = False
+        self.elapsed = 0.0
+        self.errors: list[str] = []
+
+    def lines(self) -> list[str]:
+        rate = self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+        out = [
+            f"{self.name}: snapshot {self.id or '(not written)'}",
+            f"{self.files} files, {human_bytes(self.bytes)} in {self.elapsed:.1f} s ({human_bytes(rate)}/s)",
+            f"unchanged {self.unchanged}, chunked {self.chunked}, new chunks {self.new_chunks} ({human_bytes(self.new_bytes)} stored)",
+        ]
+        if self.live:
+            out.append("taken while VS Code was running: open databases may be mid-write")
+        if self.cancelled:
+            out.append("cancelled: no snapshot written (chunks already stored are reused next time)")
+        return out + [f"error: {e}" for e in self.errors[:20]]
+
+
+def snapshot_profile(
+    p: Profile,
+    base_dir: str,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> SnapshotReport:
+    """Snapshot p's user-data into the store. on_progress(files_done, files_to_chunk) is called
+    from this thread. Raises ValueError when there is no user-data dir."""
+    if not os.path.isdir(p.user_data):
+        raise ValueError(f"User data folder not found: {p.user_data}")
+    report = SnapshotReport(p.name)
+    t0 = time.perf_counter()
+    store = store_dir(base_dir)
+    mdir = manifest_dir(store, p.name)
+    report.live = instance_alive(p.user_data)
+    prev = find_snapshot(base_dir, p.name)
+    prev_files = prev.files if prev else {}
+
+    tree = scan_user_data(p.user_data)
+    files: dict[str, list] = {}
+    jobs: list[tuple[str, int]] = []
+    rels: list[str] = []
+    for rel, st in tree.items():
+        old = prev_files.get(rel)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns:
+            files[rel] = old
+            report.unchanged += 1
+        else:
+            rels.append(rel)
+            jobs.append((os.path.join(p.user_data, *rel.split("/")), st.st_size))
+
+    done = [0]
+
+    def on_file(n: int) -> None:
+        done[0] += n
+        if on_progress:
+            on_progress(done[0], len(jobs))
+
+    for rel, result in zip(rels, _chunk_many(store, jobs, on_file, cancelled)):
+        if result is None:
+            report.cancelled = True
+            continue
+        if isinstance(result, str):
+            report.errors.append(f"{rel}: {result}")
+            continue
+        st = tree[rel]
+        digests, new, new_bytes = result
+        files[rel] = [st.st_size, st.st_mtime_ns, st.st_mode & 0o777, digests]
+        report.chunked += 1
+        report.new_chunks += new
+        report.new_bytes += new_bytes
+
+    report.files = len(files)
+    report.bytes = sum(v[0] for v in files.values())
+    report.elapsed = time.perf_counter() - t0
+    if report.cancelled:
+        return report
+    ensure_dir(mdir)
+    report.id = _new_id(mdir)
+    save_json(os.path.join(mdir, f"{report.id}.json"), {
+        "version": MANIFEST_VERSION,
+        "id": report.id,
+        "profile": p.name,
+        "created": time.time(),
+        "user_data": p.user_data,
+        "live": report.live,
+        "bytes": report.bytes,
+        "new_bytes": report.new_bytes,
+        "files": files,
+    })
+    return report
+
+
+# --- Restore ---
+
+class RestoreReport:
+    def __init__(self, name: str, snap_id: str):
+        self.name = name
+        self.id = snap_id
+        self.checked = 0
+        self.unchanged = 0
+        self.written = 0
+        self.bytes = 0
+        self.removed = 0       # files not in the snapshot
+        self.refused = ""
+        self.dry_run = False
+        self.cancelled = False
+        self.elapsed = 0.0
+        self.errors: list[str] = []
+
+    def lines(self) -> list[str]:
+        if self.refused:
+            return [f"{self.name}: not restored ({self.refused})"]
+        verb = "would write" if self.dry_run else "wrote"
+        out = [
+            f"{self.name}: restore {self.id}{' (dry run)' if self.dry_run else ''}",
+            f"{self.checked} files checked, {self.unchanged} unchanged, {verb} {self.written} ({human_bytes(self.bytes)}) in {self.elapsed:.1f} s",
+            f"{'would remove' if self.dry_run else 'removed'} {self.removed} files not in the snapshot",
+        ]
+        if self.cancelled:
+            out.append("cancelled: the profile is partly restored")
+        return out + [f"error: {e}" for e in self.errors[:20]]
+
+
+def _write_file(store: str, path: str, entry: list) -> None:
+    """Stream the chunks into a temp file beside path, then replace it (no half-written files)."""
+    size, mtime_ns, mode, digests = entry
+    ensure_dir(os.path.dirname(path))
+    tmp = f"{path}.vscodemd-restore"
+    try:
+        with open(tmp, "wb") as f:
+            for digest in digests:
+                f.write(read_chunk(store, digest))
+        if os.name != "nt":
+            os.chmod(tmp, mode)
+        os.utime(tmp, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def restore_profile(
+    p: Profile,
+    base_dir: str,
+    snap_id: str | None = None,
+    keep_extra: bool = False,
+    dry_run: bool = False,
+    running: bool = False,
+    on_progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> RestoreReport:
+    """Bring p's user-data back to a snapshot (latest when snap_id is None). Files whose size and
+    mtime match are left alone; same-size files with another mtime are hashed and compared, and
+    only real differences are rewritten. Files the snapshot does not have are removed unless
+    keep_extra. Refused while the profile runs. Raises ValueError for an unknown snapshot."""
+    snap = find_snapshot(base_dir, p.name, snap_id)
+    if snap is None:
+        raise ValueError(f"No snapshot {snap_id} for {p.name}" if snap_id else f"No snapshots for {p.name}")
+    report = RestoreReport(p.name, snap.id)
+    report.dry_run = dry_run
+    if running or instance_alive(p.user_data):
+        report.refused = "running"
+        return report
+    t0 = time.perf_counter()
+    store = store_dir(base_dir)
+    current = scan_user_data(p.user_data) if os.path.isdir(p.user_data) else {}
+    report.checked = len(snap.files)
+
+    def local(rel: str) -> str:
+        return os.path.join(p.user_data, *rel.split("/"))
+
+    to_write: list[str] = []
+    to_compare: list[str] = []
+    for rel, entry in snap.files.items():
+        st = current.get(rel)
+        if st is None or st.st_size != entry[0]:
+            to_write.append(rel)
+        elif st.st_mtime_ns == entry[1]:
+            report.unchanged += 1
+        else:
+            to_compare.append(rel)
+
+    hashed = _chunk_many(None, [(local(rel), current[rel].st_size) for rel in to_compare], cancelled=cancelled)
+    for rel, result in zip(to_compare, hashed):
+        entry = snap.files[rel]
+        if isinstance(result, tuple) and result[0] == entry[3]:
+            report.unchanged += 1
+            if not dry_run:
+                try:
+                    os.utime(local(rel), ns=(entry[1], entry[1]))  # next restore skips it on stat alone
+                except OSError:
+                    pass
+        else:
+            to_write.append(rel)
+
+    extra = [] if keep_extra else [rel for rel in current if rel not in snap.files]
+    report.removed = len(extra)
+    report.written = len(to_write)
+    report.bytes = sum(snap.files[rel][0] for rel in to_write)
+    if dry_run:
+        report.elapsed = time.perf_counter() - t0
+        return report
+
+    lock = threading.Lock()
+    done = [0]
+
+    def one(rel: str) -> None:
+        if cancelled is not None and cancelled():
+            report.cancelled = True
+            return
+        try:
+            _write_file(store, local(rel), snap.files[rel])
+        except OSError as e:
+            with lock:
+                report.errors.append(f"{rel}: {e}")
+                report.written -= 1
+                report.bytes -= snap.files[rel][0]
+            return
+        with lock:
+            done[0] += 1
+            n = done[0]
+        if on_progress:
+            on_progress(n, len(to_write))
+
+    with ThreadPoolExecutor(max_workers=RESTORE_WORKERS, thread_name_prefix="vscodemd-restore") as pool:
+        list(pool.map(one, to_write))
+    if report.cancelled:
+        report.written = done[0]
+    else:
+        for rel in extra:
+            try:
+                os.remove(local(rel))
+            except OSError as e:
+                report.errors.append(f"{rel}: {e}")
+                report.removed -= 1
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+# --- Delete + sweep ---
+
+def delete_snapshot(base_dir: str, snap: SnapshotInfo) -> tuple[int, int]:
+    """Remove a manifest, then every chunk no remaining manifest uses. (chunks, bytes) freed.
+    Do not run while another snapshot is being taken: its chunks are not referenced yet."""
+    os.remove(snap.path)
+    store = store_dir(base_dir)
+    live: set[str] = set()
+    root = os.path.join(store, "manifests")
+    for d, _dirs, names in os.walk(root):
+        for n in names:
+            doc = load_json(os.path.join(d, n), None) if n.endswith(".json") else None
+            if isinstance(doc, dict):
+                for entry in doc.get("files", {}).values():
+                    live.update(entry[3])
+    freed = freed_bytes = 0
+    for d, _dirs, names in os.walk(os.path.join(store, "chunks")):
+        for n in names:
+            if n in live:
+                continue
+            path = os.path.join(d, n)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            freed += 1
+            freed_bytes += size
+    return freed, freed_bytes
@@ -0,0 +1,129 @@
+# VSCode MultiData by Adam Natad
+# Background tasks for the GUI: a thread pool whose results, errors and progress are handed back
+# through a `post` callable (App.run_on_ui, drained by after()), with cooperative cancellation.
+# No tkinter here.
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+import events
+
+TASK_WORKERS = 4
+
+
+class Task:
+    """Handle passed to the task function: report progress, check / hook cancellation."""
+
+    def __init__(self, runner: TaskRunner, name: str):
+        self.runner = runner
+        self.name = name
+        self.future: Future | None = None
+        self._cancel = threading.Event()
+        self._cancel_hooks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancel.is_set():
+                return
+            self._cancel.set()
+            hooks = list(self._cancel_hooks)
+        if self.future is not None:
+            self.future.cancel()  # not started yet: never runs
+        for hook in hooks:
+            hook()
+
+    def on_cancel(self, hook: Callable[[], None]) -> None:
+        """hook() runs (from the cancelling thread) when the task is cancelled, e.g. scheduler.cancel."""
+        with self._lock:
+            if not self._cancel.is_set():
+                self._cancel_hooks.append(hook)
+                return
+        hook()
+
+    def report(self, message: str) -> None:
+        """Progress text for the status bar; safe from any thread."""
+        self.runner._post(lambda: self.runner._status(message))
+
+
+class TaskRunner:
+    """submit(name, fn) runs fn(task) on the pool; on_done(result) / on_error(exc) run via post.
+    Nothing is posted for a task that was cancelled."""
+
+    def __init__(
+        self,
+        post: Callable[[Callable[[], None]], None],
+        on_status: Callable[[str], None] | None = None,
+        on_active: Callable[[int], None] | None = None,
+        workers: int = TASK_WORKERS,
+    ):
+        self._post = post
+        self._on_status = on_status
+        self._on_active = on_active
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vscodemd-task")
+        self._lock = threading.Lock()
+        self.active: set[Task] = set()
+
+    def _status(self, message: str) -> None:
+        if self._on_status:
+            self._on_status(message)
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[[Task], Any],
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+        status: str | None = None,
+    ) -> Task:
+        """status: text shown while the task runs (default "<name>…")."""
+        task = Task(self, name)
+        with self._lock:
+            self.active.add(task)
+            count = len(self.active)
+        self._status(status if status is not None else f"{name}…")
+        if self._on_active:
+            self._on_active(count)
+        task.future = self._pool.submit(self._run, task, fn, on_done, on_error)
+        task.future.add_done_callback(lambda _f: self._finished(task))
+        return task
+
+    def _run(self, task: Task, fn, on_done, on_error) -> None:
+        if task.cancelled:
+            return
+        try:
+            result = fn(task)
+        except BaseException as e:
+            events.error("task_error", e, task=task.name, cancelled=task.cancelled)
+            if not task.cancelled:
+                err = e
+                self._post(lambda: on_error(err) if on_error else self._status(f"{task.name} failed: {err}"))
+            return
+        if not task.cancelled and on_done:
+            self._post(lambda: on_done(result))
+
+    def _finished(self, task: Task) -> None:
+        with self._lock:
+            self.active.discard(task)
+            count = len(self.active)
+        if self._on_active:
+            self._post(lambda: self._on_active(count))
+        if task.cancelled:
+            self._post(lambda: self._status(f"{task.name}: cancelled"))
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            tasks = list(self.active)
+        for t in tasks:
+            t.cancel()
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)